@@ -0,0 +1,54 @@
+/**
+ * @param { import("knex").Knex } knex
+ * @returns { Promise<void> }
+ */
+exports.up = async function(knex) {
+  // Create processed_messages table (idempotency store for redelivered messages)
+  await knex.schema.createTable('processed_messages', (table) => {
+    table.bigInteger('chat_id').notNullable();
+    table.bigInteger('message_id').notNullable();
+    // NULL when the message was handled without replying (e.g. ignored)
+    table.text('response_text');
+    table.timestamp('processed_at', { useTz: true }).defaultTo(knex.fn.now()).notNullable();
+
+    table.primary(['chat_id', 'message_id']);
+  });
+
+  // Create index on processed_at for pruning old entries
+  await knex.schema.table('processed_messages', (table) => {
+    table.index('processed_at', 'idx_processed_messages_processed_at');
+  });
+
+  // Enable RLS
+  await knex.raw('ALTER TABLE processed_messages ENABLE ROW LEVEL SECURITY');
+
+  // Create RLS policies
+  await knex.raw(`
+    CREATE POLICY "Bot can view processed messages" ON processed_messages
+      FOR SELECT USING (true)
+  `);
+
+  await knex.raw(`
+    CREATE POLICY "Bot can insert processed messages" ON processed_messages
+      FOR INSERT WITH CHECK (true)
+  `);
+
+  await knex.raw(`
+    CREATE POLICY "Bot can delete processed messages" ON processed_messages
+      FOR DELETE USING (true)
+  `);
+};
+
+/**
+ * @param { import("knex").Knex } knex
+ * @returns { Promise<void> }
+ */
+exports.down = async function(knex) {
+  // Drop RLS policies
+  await knex.raw('DROP POLICY IF EXISTS "Bot can delete processed messages" ON processed_messages');
+  await knex.raw('DROP POLICY IF EXISTS "Bot can insert processed messages" ON processed_messages');
+  await knex.raw('DROP POLICY IF EXISTS "Bot can view processed messages" ON processed_messages');
+
+  // Drop table (which will also drop indexes)
+  await knex.schema.dropTableIfExists('processed_messages');
+};
@@ -0,0 +1,20 @@
+/**
+ * @param { import("knex").Knex } knex
+ * @returns { Promise<void> }
+ */
+exports.up = async function(knex) {
+  // Id of the streamed response, so a replay edits the same Telegram message
+  await knex.schema.table('processed_messages', (table) => {
+    table.text('response_id');
+  });
+};
+
+/**
+ * @param { import("knex").Knex } knex
+ * @returns { Promise<void> }
+ */
+exports.down = async function(knex) {
+  await knex.schema.table('processed_messages', (table) => {
+    table.dropColumn('response_id');
+  });
+};
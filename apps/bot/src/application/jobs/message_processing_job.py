@@ -8,8 +8,16 @@ from typing import Any
 
 from application.services.message_processor import MessageProcessorService
 from domain.entities.message import IncomingMessage
-from domain.interfaces.job_factory import JobFactory, JobOptions, TaskHandlerArgs
-from infrastructure.utils.queue_utils import create_error_result, create_success_result
+from domain.interfaces.job_factory import JobFactory, JobOptions, TaskHandlerArgs, TaskHandlerResult
+from infrastructure.utils.circuit_breaker import CircuitOpenError
+from infrastructure.utils.queue_utils import (
+    create_delayed_result,
+    create_error_result,
+    create_success_result,
+)
+
+# Must match the connector's declaration of the queue, or the broker rejects it
+MAX_MESSAGE_PRIORITY = 10
 
 
 class MessageProcessingJob:
@@ -19,6 +27,8 @@ class MessageProcessingJob:
         self,
         job_factory: JobFactory,
         message_processor_service: MessageProcessorService,
+        queue_name: str = "telegram_received_messages_prioritized",
+        batching_enabled: bool = False,
     ):
         self.job_factory = job_factory
         self.message_processor_service = message_processor_service
@@ -27,9 +37,22 @@ class MessageProcessingJob:
         # Create the job with handler
         self.job = self.job_factory.create_job(
             JobOptions(
-                name="telegram_received_messages",
+                name=queue_name,
                 handler=self._handle_message,
+                # Messages arriving together share one user lookup, but each one
+                # waits for the batch window and its batch's slowest user
+                batch_handler=self._handle_messages if batching_enabled else None,
+                batch_max_size=10,
+                batch_window_ms=20,
                 poll_interval_in_millis=200,
+                # Keep each user's messages in order (e.g. add then query)
+                partition_key=lambda data: data["telegramUserId"],
+                # Cheap messages take the fast lane instead of waiting behind agent runs;
+                # the connector publishes with a priority, the resolver covers older messages
+                max_priority=MAX_MESSAGE_PRIORITY,
+                priority=lambda data: self.message_processor_service.resolve_priority(
+                    data["messageText"]
+                ),
             )
         )
 
@@ -37,14 +60,7 @@ class MessageProcessingJob:
         """Handle incoming message processing."""
         try:
             # Parse the message data
-            data = args.data
-            message = IncomingMessage(
-                telegram_user_id=data["telegramUserId"],
-                chat_id=data["chatId"],
-                message_text=data["messageText"],
-                timestamp=datetime.fromisoformat(data["timestamp"].replace("Z", "")),
-                message_id=data["messageId"],
-            )
+            message = self._parse_message(args.data)
 
             # Process the message
             await self.message_processor_service.process_message(message)
@@ -53,10 +69,56 @@ class MessageProcessingJob:
                 f"Message processed for chat {message.chat_id}"
             )
 
+        except CircuitOpenError as e:
+            return self._delayed_result(e)
         except Exception as e:
             self.logger.error(f"Error processing message: {e}", exc_info=True)
             return create_error_result(f"Failed to process message: {str(e)}")
 
+    async def _handle_messages(self, args_batch: list[TaskHandlerArgs]) -> list[TaskHandlerResult]:
+        """Handle a batch of incoming messages, returning one result per message."""
+        results: list[TaskHandlerResult | None] = [None] * len(args_batch)
+        messages: list[IncomingMessage] = []
+        message_indexes: list[int] = []
+
+        for index, args in enumerate(args_batch):
+            try:
+                messages.append(self._parse_message(args.data))
+                message_indexes.append(index)
+            except Exception as e:
+                self.logger.error(f"Error parsing message: {e}", exc_info=True)
+                results[index] = create_error_result(f"Failed to process message: {str(e)}")
+
+        if messages:
+            errors = await self.message_processor_service.process_messages(messages)
+            for index, message, error in zip(message_indexes, messages, errors):
+                if error is None:
+                    results[index] = create_success_result(
+                        f"Message processed for chat {message.chat_id}"
+                    )
+                elif isinstance(error, CircuitOpenError):
+                    results[index] = self._delayed_result(error)
+                else:
+                    results[index] = create_error_result(f"Failed to process message: {str(error)}")
+
+        return results
+
+    def _delayed_result(self, error: CircuitOpenError) -> TaskHandlerResult:
+        """Park a message until the LLM circuit may have closed, without using up a retry."""
+        return create_delayed_result(
+            str(error), int(error.retry_after_in_seconds * 1000)
+        )
+
+    def _parse_message(self, data: Any) -> IncomingMessage:
+        """Build an IncomingMessage from the queue payload."""
+        return IncomingMessage(
+            telegram_user_id=data["telegramUserId"],
+            chat_id=data["chatId"],
+            message_text=data["messageText"],
+            timestamp=datetime.fromisoformat(data["timestamp"].replace("Z", "")),
+            message_id=data["messageId"],
+        )
+
     async def schedule_message_processing(
         self,
         chat_id: int,
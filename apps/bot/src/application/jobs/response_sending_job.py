@@ -5,6 +5,7 @@ Response sending job for sending bot responses back to the connector service.
 import logging
 
 from domain.interfaces.job_factory import JobFactory, JobOptions
+from infrastructure.metrics.job_metrics import RESPONSES_SCHEDULED
 
 
 class ResponseSendingJob:
@@ -16,13 +17,30 @@ class ResponseSendingJob:
 
         # Create the job with handler
         self.job = self.job_factory.create_job(
-            JobOptions(name="telegram_bot_responses")
+            # The connector consumes this queue
+            JobOptions(name="telegram_bot_responses", external_consumer=True)
         )
 
     async def schedule_response_sending(
-        self, chat_id: int, text: str, reply_to_message_id: int = None
+        self,
+        chat_id: int,
+        text: str,
+        reply_to_message_id: int = None,
+        response_id: str = None,
+        sequence: int = None,
+        final: bool = True,
     ) -> None:
-        """Schedule response sending."""
-        await self.job.schedule_task(
-            {"chatId": chat_id, "text": text, "replyToMessageId": reply_to_message_id}
-        )
+        """
+        Schedule response sending.
+
+        Responses with a `response_id` are streamed: the connector sends the
+        first one as a new Telegram message and edits it with every later one
+        of a higher `sequence`, until the `final` one.
+        """
+        data = {"chatId": chat_id, "text": text, "replyToMessageId": reply_to_message_id}
+        if response_id is not None:
+            data.update({"responseId": response_id, "sequence": sequence, "final": final})
+
+        await self.job.schedule_task(data)
+        RESPONSES_SCHEDULED.inc()
+
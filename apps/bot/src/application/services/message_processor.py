@@ -2,13 +2,18 @@
 Message processor service - main use case for processing incoming messages with tools.
 """
 
+import asyncio
 import logging
+import time
 
 from application.jobs.response_sending_job import ResponseSendingJob
 from application.services.user_service import UserService
-from domain.entities.message import IncomingMessage
+from domain.entities.message import IncomingMessage, ProcessedMessage
+from domain.entities.user import User
 from domain.interfaces.expense_parser import IExpenseParser
+from domain.interfaces.job_factory import PRIORITY_HIGH, PRIORITY_NORMAL
 from domain.interfaces.message_classifier import IMessageClassifier
+from domain.interfaces.processed_message_repository import IProcessedMessageRepository
 
 
 class MessageProcessorService:
@@ -20,19 +25,63 @@ class MessageProcessorService:
         expense_parser: IExpenseParser,
         message_classifier: IMessageClassifier,
         response_sending_job: ResponseSendingJob,
+        processed_message_repository: IProcessedMessageRepository | None = None,
+        routing_mode: str = "classify",
+        stream_responses: bool = False,
     ):
         self.user_service = user_service
         self.expense_parser = expense_parser
         self.message_classifier = message_classifier
         self.response_sending_job = response_sending_job
+        self.processed_message_repository = processed_message_repository
+        self.routing_mode = routing_mode
+        self.stream_responses = stream_responses
         self.logger = logging.getLogger(__name__)
 
-    async def process_message(self, message: IncomingMessage) -> None:
+    async def process_messages(self, messages: list[IncomingMessage]) -> list[Exception | None]:
+        """
+        Process a batch of messages, looking all their users up at once.
+
+        Messages of the same user run one after another in order; different
+        users run concurrently.
+
+        Args:
+            messages: The incoming messages to process
+
+        Returns:
+            One entry per message: None if it was processed, else the error it raised
+        """
+        users = await self.user_service.find_users(
+            [message.telegram_user_id for message in messages]
+        )
+
+        indexes_by_user: dict[int, list[int]] = {}
+        for index, message in enumerate(messages):
+            indexes_by_user.setdefault(message.telegram_user_id, []).append(index)
+
+        errors: list[Exception | None] = [None] * len(messages)
+
+        async def process_user_messages(indexes: list[int]) -> None:
+            for index in indexes:
+                message = messages[index]
+                try:
+                    await self.process_message(message, users.get(message.telegram_user_id))
+                except Exception as e:
+                    self.logger.error("Error processing message %s: %s", message.message_id, e)
+                    errors[index] = e
+
+        await asyncio.gather(
+            *(process_user_messages(indexes) for indexes in indexes_by_user.values())
+        )
+        return errors
+
+    async def process_message(self, message: IncomingMessage, user: User | None = None) -> None:
         """
         Process an incoming message using LLM with tools.
 
         Args:
             message: The incoming message to process
+            user: The sender, if already looked up; unknown senders go through registration
         """
         self.logger.info(
             "Processing message from user %s: %s",
@@ -40,10 +89,31 @@ class MessageProcessorService:
             message.message_text
         )
 
+        # Redelivered message: replay the stored outcome instead of recomputing it
+        processed_message = await self._find_processed(message)
+        if processed_message is not None:
+            self.logger.info(
+                "Message %s in chat %s was already processed, replaying stored response",
+                message.message_id,
+                message.chat_id
+            )
+            if processed_message.response_text:
+                # A streamed response is finished by editing the message the stream opened
+                response_id = processed_message.response_id
+                await self._send_response(
+                    message,
+                    processed_message.response_text,
+                    response_id,
+                    time.time_ns() // 1_000_000 if response_id else None,
+                )
+            return
+
         # Get or register user
-        user, welcome_message = await self.user_service.get_or_register_user(
-            message.telegram_user_id, message.message_text
-        )
+        welcome_message = None
+        if user is None:
+            user, welcome_message = await self.user_service.get_or_register_user(
+                message.telegram_user_id, message.message_text
+            )
         
         if not user:
             # User not authorized and registration failed
@@ -51,13 +121,18 @@ class MessageProcessorService:
             
         # If this is a new user registration, send welcome message and return
         if welcome_message:
+            await self._mark_processed(message, welcome_message)
             await self._send_response(message, welcome_message)
             return
 
         # Check if message is expense-related before processing
-        is_expense_related = await self.message_classifier.is_expense_related(
-            message.message_text
-        )
+        if self.routing_mode == "combined":
+            # Only the rules run here; the agent decides on the rest itself
+            is_expense_related = self.message_classifier.quick_classify(message.message_text) is not False
+        else:
+            is_expense_related = await self.message_classifier.is_expense_related(
+                message.message_text
+            )
         
         if not is_expense_related:
             self.logger.info(
@@ -65,21 +140,116 @@ class MessageProcessorService:
                 message.telegram_user_id,
                 message.message_text[:50]
             )
+            await self._mark_processed(message, None)
             return
 
+        # Stream the answer as it is generated: the connector edits one Telegram message
+        response_id = None
+        on_partial_response = None
+        last_sequence = 0
+
+        def next_sequence() -> int:
+            # Clock-based, so a redelivered message's stream supersedes the earlier attempt's
+            nonlocal last_sequence
+            last_sequence = max(last_sequence + 1, time.time_ns() // 1_000_000)
+            return last_sequence
+
+        if self.stream_responses:
+            # Stable across redeliveries, so a retried stream reuses the same Telegram message
+            response_id = f"{message.chat_id}:{message.message_id}"
+
+            async def on_partial_response(text: str) -> None:
+                await self._send_response(message, text, response_id, next_sequence(), final=False)
+
         # Process expense-related message using LLM with tools
         result = await self.expense_parser.process_message(
-            message.message_text, user.id
+            message.message_text, user.id, on_partial_response
         )
         
-        if not result.success:
+        if not result.should_respond:
+            self.logger.info(
+                "Agent ignored non-expense message from user %s: %s",
+                message.telegram_user_id,
+                message.message_text[:50]
+            )
+            await self._mark_processed(message, None)
+            return
+
+        if result.success:
+            await self._mark_processed(message, result.response_text, response_id)
+        else:
+            # Not recorded, so a redelivery gets a fresh attempt
             self.logger.error("Failed to process message: %s", result.response_text)
         
         # Send the response from the LLM
-        await self._send_response(message, result.response_text)
+        await self._send_response(
+            message, result.response_text, response_id, next_sequence() if response_id else None
+        )
+
+    def resolve_priority(self, message_text: str) -> int:
+        """
+        Cheaply predict whether a message will skip the LLM agent.
+
+        Registration attempts and messages the classifier rules reject are
+        answered (or dropped) in milliseconds, so they get high priority.
+        """
+        if self.user_service.is_registration_attempt(message_text):
+            return PRIORITY_HIGH
+
+        if self.message_classifier.quick_classify(message_text) is False:
+            return PRIORITY_HIGH
+
+        return PRIORITY_NORMAL
+
+    async def _find_processed(self, message: IncomingMessage) -> ProcessedMessage | None:
+        """Look up a previous outcome; a store failure never blocks processing."""
+        if self.processed_message_repository is None:
+            return None
+
+        try:
+            return await self.processed_message_repository.find(
+                message.chat_id, message.message_id
+            )
+        except Exception as e:
+            self.logger.warning("Idempotency lookup failed, processing anyway: %s", e)
+            return None
 
-    async def _send_response(self, message: IncomingMessage, text: str) -> None:
-        """Send a response back to Telegram."""
+    async def _mark_processed(
+        self,
+        message: IncomingMessage,
+        response_text: str | None,
+        response_id: str | None = None,
+    ) -> None:
+        """Record the outcome before responding, so a crash after it only replays the response."""
+        if self.processed_message_repository is None:
+            return
+
+        try:
+            await self.processed_message_repository.save(
+                ProcessedMessage(
+                    chat_id=message.chat_id,
+                    message_id=message.message_id,
+                    response_text=response_text,
+                    response_id=response_id,
+                )
+            )
+        except Exception as e:
+            self.logger.warning("Failed to record processed message: %s", e)
+
+    async def _send_response(
+        self,
+        message: IncomingMessage,
+        text: str,
+        response_id: str | None = None,
+        sequence: int | None = None,
+        final: bool = True,
+    ) -> None:
+        """Send a response back to Telegram, or one part of a streamed response."""
         await self.response_sending_job.schedule_response_sending(
-            chat_id=message.chat_id, text=text, reply_to_message_id=message.message_id
+            chat_id=message.chat_id,
+            text=text,
+            reply_to_message_id=message.message_id,
+            response_id=response_id,
+            sequence=sequence,
+            final=final,
         )
@@ -20,6 +20,13 @@ class UserService:
         self.registration_password = registration_password
         self.logger = logging.getLogger(__name__)
 
+    async def find_users(self, telegram_user_ids: list[int]) -> dict[int, User]:
+        """Find existing users by Telegram user ID with one lookup, keyed by that ID."""
+        users = await self.user_repository.find_by_telegram_ids(
+            [str(telegram_user_id) for telegram_user_id in set(telegram_user_ids)]
+        )
+        return {int(user.telegram_id): user for user in users}
+
     async def get_or_register_user(self, telegram_user_id: int, message_text: str) -> tuple[User | None, str | None]:
         """
         Get existing user or register new user if password matches.
@@ -44,7 +51,7 @@ class UserService:
             return user, None
             
         # User doesn't exist - check if message matches registration password
-        if message_text.strip() == self.registration_password:
+        if self.is_registration_attempt(message_text):
             self.logger.info(
                 "Registering new user with telegram_id: %s",
                 telegram_user_id
@@ -64,6 +71,10 @@ class UserService:
             )
             return None, None
 
+    def is_registration_attempt(self, message_text: str) -> bool:
+        """Check whether a message is the registration password."""
+        return message_text.strip() == self.registration_password
+
     def _get_welcome_message(self) -> str:
         """Get welcome message for new users."""
         return """Welcome to your personal Expense Tracking Bot! 🎉
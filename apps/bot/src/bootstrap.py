@@ -0,0 +1,294 @@
+"""
+Service wiring for the Bot Service.
+
+Builds the repositories, jobs and services used by a consumer process, so the
+same wiring is shared by the single-process app and supervised worker processes.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import httpx
+import openai
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+from application.jobs.message_processing_job import MessageProcessingJob
+from application.jobs.response_sending_job import ResponseSendingJob
+from application.services.message_processor import MessageProcessorService
+from application.services.user_service import UserService
+from application.services.worker_processor import WorkerProcessorService
+from config.settings import settings
+from domain.interfaces.expense_parser import IExpenseParser
+from domain.interfaces.expense_repository import IExpenseRepository
+from domain.interfaces.job_factory import JobFactory
+from infrastructure.providers.rabbitmq_provider import RabbitMQProvider
+from infrastructure.repositories.cache_invalidating_expense_repository import CacheInvalidatingExpenseRepository
+from infrastructure.repositories.cached_processed_message_repository import CachedProcessedMessageRepository
+from infrastructure.repositories.expense_repository import PostgreSQLExpenseRepository
+from infrastructure.repositories.fixed_expense_categories_repository import FixedExpenseCategoriesRepository
+from infrastructure.repositories.processed_message_repository import PostgreSQLProcessedMessageRepository
+from infrastructure.repositories.user_repository import PostgreSQLUserRepository
+from infrastructure.services.expense_tool_factory import ExpenseToolFactory
+from infrastructure.services.hedged_chat_model import HedgedChatModel
+from infrastructure.services.hybrid_message_classifier import HybridMessageClassifier
+from infrastructure.services.in_memory_job_factory import InMemoryJobFactory
+from infrastructure.services.openai_expense_parser import OpenAIExpenseParser
+from infrastructure.services.rabbitmq_job_factory import RabbitMQJobFactory
+from infrastructure.services.rule_based_expense_parser import RuleBasedExpenseParser
+from infrastructure.services.scripted_chat_model import ScriptedChatModel
+from infrastructure.utils.circuit_breaker import CircuitBreaker
+from infrastructure.utils.expense_query_cache import ExpenseQueryCache
+from infrastructure.utils.openai_rate_limiter import OpenAIRateLimiter, RateLimitedTransport
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean OpenAI itself is unavailable; client errors (4xx) don't count
+OPENAI_OUTAGE_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+@dataclass
+class BotServices:
+    """Long-lived services owned by one consumer process."""
+
+    user_repository: PostgreSQLUserRepository
+    expense_repository: PostgreSQLExpenseRepository
+    processed_message_repository: PostgreSQLProcessedMessageRepository
+    job_factory: JobFactory
+    message_processor_service: MessageProcessorService
+    worker_processor_service: WorkerProcessorService
+    openai_http_client: httpx.AsyncClient | None = None
+
+
+def create_job_factory() -> JobFactory:
+    """Create the job factory selected by JOB_BACKEND."""
+    if settings.job_backend == "memory":
+        return InMemoryJobFactory(batch_size=settings.job_batch_size)
+    return RabbitMQJobFactory(
+        batch_size=settings.job_batch_size,
+        publish_channel_count=settings.rabbitmq_publish_channels,
+    )
+
+
+def create_openai_http_client() -> httpx.AsyncClient | None:
+    """Create the HTTP client shared by all OpenAI chat models, rate limited if configured."""
+    if settings.openai_requests_per_minute <= 0 or settings.openai_tokens_per_minute <= 0:
+        return None
+
+    # Each worker process gets an equal share of the quota
+    rate_limiter = OpenAIRateLimiter(
+        requests_per_minute=settings.openai_requests_per_minute,
+        tokens_per_minute=settings.openai_tokens_per_minute,
+        share=1 / max(1, settings.bot_worker_processes),
+    )
+    return httpx.AsyncClient(transport=RateLimitedTransport(rate_limiter))
+
+
+def create_chat_model(
+    model: str,
+    temperature: float,
+    max_tokens: int | None = None,
+    timeout_in_seconds: float | None = None,
+    fallback_models: list[str] | None = None,
+    http_client: httpx.AsyncClient | None = None,
+) -> Runnable:
+    """Create a chat model of the backend selected by LLM_BACKEND, with hedging and fallbacks."""
+    if settings.llm_backend == "fake":
+        return hedge_chat_model(
+            ScriptedChatModel(
+                latency_ms=settings.fake_llm_latency_ms,
+                latency_sigma=settings.fake_llm_latency_sigma,
+                error_rate=settings.fake_llm_error_rate,
+                seed=settings.fake_llm_seed,
+            )
+        )
+
+    def create_openai_model(name: str) -> BaseChatModel:
+        return ChatOpenAI(
+            api_key=settings.openai_api_key,
+            model=name,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout_in_seconds,
+            # With fallbacks the next model is the retry
+            max_retries=0 if fallback_models else 2,
+            # Report token usage on streamed runs too
+            stream_usage=True,
+            http_async_client=http_client,
+        )
+
+    llm = hedge_chat_model(create_openai_model(model))
+    if not fallback_models:
+        return llm
+    return llm.with_fallbacks(
+        [hedge_chat_model(create_openai_model(name)) for name in fallback_models],
+        exceptions_to_handle=OPENAI_OUTAGE_ERRORS,
+    )
+
+
+def hedge_chat_model(llm: BaseChatModel) -> BaseChatModel:
+    """Wrap a chat model in hedged requests if OPENAI_HEDGE_PERCENTILE is set."""
+    if settings.openai_hedge_percentile <= 0:
+        return llm
+    return HedgedChatModel(model=llm, hedge_percentile=settings.openai_hedge_percentile)
+
+
+def parse_model_list(models: str) -> list[str]:
+    """Parse a comma-separated model list."""
+    return [model.strip() for model in models.split(",") if model.strip()]
+
+
+def create_services() -> BotServices:
+    """Wire up repositories, jobs and services."""
+    # Initialize repositories
+    user_repository = PostgreSQLUserRepository(settings.database_url)
+    expense_repository = PostgreSQLExpenseRepository(settings.database_url)
+    categories_repository = FixedExpenseCategoriesRepository()
+    processed_message_repository = PostgreSQLProcessedMessageRepository(
+        settings.database_url,
+        retention_in_seconds=settings.idempotency_retention_hours * 60 * 60,
+    )
+
+    # Cache expense reads; every write goes through a repository that invalidates it.
+    # Invalidation only reaches this process, so other workers' writes would go unseen
+    query_cache = None
+    tracked_expense_repository: IExpenseRepository = expense_repository
+    if settings.expense_query_cache_ttl_seconds > 0 and settings.bot_worker_processes > 1:
+        logger.info("Expense query cache disabled: it is per process and BOT_WORKER_PROCESSES > 1")
+    elif settings.expense_query_cache_ttl_seconds > 0:
+        query_cache = ExpenseQueryCache(
+            ttl_in_seconds=settings.expense_query_cache_ttl_seconds,
+            max_size=settings.expense_query_cache_size,
+        )
+        tracked_expense_repository = CacheInvalidatingExpenseRepository(expense_repository, query_cache)
+
+    # Initialize tool factory (tools are shared; the user comes from each agent run)
+    tool_factory = ExpenseToolFactory(
+        expense_repository=tracked_expense_repository,
+        categories_repository=categories_repository,
+        include_ignore_tool=settings.message_routing_mode == "combined",
+        query_cache=query_cache
+    )
+
+    # One rate-limited client for every OpenAI caller, so they share the quota
+    openai_http_client = create_openai_http_client()
+
+    # One breaker for every OpenAI caller, so they all back off together
+    openai_circuit_breaker = CircuitBreaker(
+        "openai",
+        failure_threshold=settings.openai_circuit_failure_threshold,
+        recovery_timeout_in_seconds=settings.openai_circuit_recovery_seconds,
+        failure_types=OPENAI_OUTAGE_ERRORS,
+    )
+
+    # Initialize OpenAI expense parser with tool factory
+    openai_expense_parser = OpenAIExpenseParser(
+        llm=create_chat_model(
+            model=settings.openai_model,
+            temperature=settings.openai_temperature,
+            max_tokens=settings.openai_max_tokens,
+            timeout_in_seconds=settings.openai_request_timeout_seconds,
+            fallback_models=parse_model_list(settings.openai_fallback_models),
+            http_client=openai_http_client,
+        ),
+        tool_factory=tool_factory,
+        circuit_breaker=openai_circuit_breaker,
+        answer_cache=query_cache,
+        stream_interval_in_seconds=settings.response_stream_interval_seconds,
+        max_iterations=settings.openai_agent_max_iterations,
+        max_tokens_per_message=settings.openai_max_tokens_per_message or None,
+    )
+
+    # Terse entries are recorded directly, everything else goes to the agent
+    expense_parser: IExpenseParser = openai_expense_parser
+    if settings.expense_fast_path_enabled:
+        expense_parser = RuleBasedExpenseParser(
+            expense_repository=tracked_expense_repository,
+            fallback_parser=openai_expense_parser
+        )
+
+    # Initialize message classifier
+    message_classifier = HybridMessageClassifier(
+        # Deterministic, and the answer is a single YES or NO
+        llm=create_chat_model(
+            model=settings.openai_classifier_model,
+            temperature=0.0,
+            max_tokens=5,
+            timeout_in_seconds=settings.openai_classifier_timeout_seconds,
+            fallback_models=parse_model_list(settings.openai_classifier_fallback_models),
+            http_client=openai_http_client,
+        ),
+        circuit_breaker=openai_circuit_breaker
+    )
+
+    # Initialize job factory
+    job_factory = create_job_factory()
+
+    # Initialize jobs first
+    response_sending_job = ResponseSendingJob(job_factory)
+
+    # Initialize user service
+    user_service = UserService(
+        user_repository=user_repository,
+        registration_password=settings.registration_password,
+    )
+
+    # Initialize message processor service with user service
+    message_processor_service = MessageProcessorService(
+        user_service=user_service,
+        expense_parser=expense_parser,
+        message_classifier=message_classifier,
+        response_sending_job=response_sending_job,
+        routing_mode=settings.message_routing_mode,
+        stream_responses=settings.response_streaming_enabled,
+        processed_message_repository=CachedProcessedMessageRepository(
+            processed_message_repository, max_size=settings.idempotency_cache_size
+        ),
+    )
+
+    # Initialize message processing job
+    message_processing_job = MessageProcessingJob(
+        job_factory,
+        message_processor_service,
+        queue_name=settings.telegram_message_queue,
+        batching_enabled=settings.message_batching_enabled,
+    )
+
+    # Initialize worker processor service
+    worker_processor_service = WorkerProcessorService(
+        jobs=[message_processing_job.job]
+    )
+
+    return BotServices(
+        user_repository=user_repository,
+        expense_repository=expense_repository,
+        processed_message_repository=processed_message_repository,
+        job_factory=job_factory,
+        message_processor_service=message_processor_service,
+        worker_processor_service=worker_processor_service,
+        openai_http_client=openai_http_client,
+    )
+
+
+async def start_services(services: BotServices) -> None:
+    """Build the agent, then start all job workers."""
+    await services.message_processor_service.expense_parser.warm_up()
+    await services.worker_processor_service.start_workers()
+
+
+async def stop_services(services: BotServices) -> None:
+    """Stop workers and release connections and pools."""
+    await services.worker_processor_service.stop_workers()
+    await services.job_factory.close()
+    await RabbitMQProvider.close_connection()
+    await services.user_repository.close()
+    await services.expense_repository.close()
+    await services.processed_message_repository.close()
+    if services.openai_http_client is not None:
+        await services.openai_http_client.aclose()
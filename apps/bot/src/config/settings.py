@@ -13,9 +13,57 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    # Agent model; the classifier only answers YES or NO, so it gets a small, fast one
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4")
+    openai_classifier_model: str = os.getenv("OPENAI_CLASSIFIER_MODEL", "gpt-4o-mini")
+    # Comma-separated models tried in order when the one before times out or is unavailable
+    openai_fallback_models: str = os.getenv("OPENAI_FALLBACK_MODELS", "")
+    openai_classifier_fallback_models: str = os.getenv("OPENAI_CLASSIFIER_FALLBACK_MODELS", "")
+    # Seconds before a single LLM call counts as timed out
+    openai_request_timeout_seconds: float = float(os.getenv("OPENAI_REQUEST_TIMEOUT_SECONDS", "30"))
+    openai_classifier_timeout_seconds: float = float(os.getenv("OPENAI_CLASSIFIER_TIMEOUT_SECONDS", "5"))
+    # Send a backup request when a call runs longer than this percentile of recent latencies (0 disables)
+    openai_hedge_percentile: float = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "0"))
     openai_max_tokens: int = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
-    openai_temperature: float = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
+    openai_temperature: float = float(os.getenv("OPENAI_TEMPERATURE", "0.1"))
+    # Agent steps (LLM calls) allowed per message before the agent gives up
+    openai_agent_max_iterations: int = int(os.getenv("OPENAI_AGENT_MAX_ITERATIONS", "5"))
+    # Prompt plus completion tokens the agent may use for one message; once used up,
+    # no further agent step starts and the user is asked to simplify (0 disables)
+    openai_max_tokens_per_message: int = int(os.getenv("OPENAI_MAX_TOKENS_PER_MESSAGE", "16000"))
+    # Consecutive OpenAI outage errors before LLM calls fail fast, and for how long
+    openai_circuit_failure_threshold: int = int(os.getenv("OPENAI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    openai_circuit_recovery_seconds: float = float(os.getenv("OPENAI_CIRCUIT_RECOVERY_SECONDS", "30"))
+    # OpenAI quota until the API's rate-limit headers report the real one (0 disables
+    # client-side rate limiting); worker processes each use an equal share
+    openai_requests_per_minute: int = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+    openai_tokens_per_minute: int = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "30000"))
+    # Record terse "<item> <amount> [category]" entries without the LLM agent
+    expense_fast_path_enabled: bool = os.getenv("EXPENSE_FAST_PATH_ENABLED", "true").lower() == "true"
+    # 'classify' asks the classifier LLM before running the agent; 'combined' skips
+    # that call and lets the agent ignore non-expense messages itself
+    message_routing_mode: str = os.getenv("MESSAGE_ROUTING_MODE", "combined")
+    # Hand incoming messages to the processor in micro-batches sharing one user lookup;
+    # off by default since every message then waits for the batch window
+    message_batching_enabled: bool = os.getenv("MESSAGE_BATCHING_ENABLED", "false").lower() == "true"
+    # Stream agent answers to Telegram as edits of one message (needs a streaming-aware connector)
+    response_streaming_enabled: bool = os.getenv("RESPONSE_STREAMING_ENABLED", "false").lower() == "true"
+    response_stream_interval_seconds: float = float(os.getenv("RESPONSE_STREAM_INTERVAL_SECONDS", "1.0"))
+
+    # Expense Query Cache Configuration
+    # Seconds cached read-tool results and read-only answers stay valid (0 disables);
+    # writes invalidate them at once. Per process, so off when BOT_WORKER_PROCESSES > 1
+    expense_query_cache_ttl_seconds: float = float(os.getenv("EXPENSE_QUERY_CACHE_TTL_SECONDS", "60"))
+    expense_query_cache_size: int = int(os.getenv("EXPENSE_QUERY_CACHE_SIZE", "10000"))
+
+    # LLM Backend Configuration
+    # 'openai' or 'fake' (scripted answers without network calls, for load tests and benchmarks)
+    llm_backend: str = os.getenv("LLM_BACKEND", "openai")
+    # Fake backend: median latency per call, spread (log-normal sigma), error share and RNG seed
+    fake_llm_latency_ms: float = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+    fake_llm_latency_sigma: float = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5"))
+    fake_llm_error_rate: float = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    fake_llm_seed: int = int(os.getenv("FAKE_LLM_SEED", "42"))
 
     # Database Configuration
     database_url: str = ""
@@ -32,6 +80,8 @@ class Settings(BaseSettings):
     rabbitmq_user: str = os.getenv("RABBITMQ_USER", "expensio_user")
     rabbitmq_password: str = os.getenv("RABBITMQ_PASSWORD", "expensio_password")
     rabbitmq_vhost: str = os.getenv("RABBITMQ_VHOST", "/")
+    # Publish-only channels shared by all jobs (consumers get their own)
+    rabbitmq_publish_channels: int = int(os.getenv("RABBITMQ_PUBLISH_CHANNELS", "2"))
 
     # Application Configuration
     port: int = int(os.getenv("BOT_SERVICE_PORT", "3002"))
@@ -40,13 +90,43 @@ class Settings(BaseSettings):
 
     # Queue Configuration
     queue_poll_interval: int = int(os.getenv("QUEUE_POLL_INTERVAL", "200"))
-    telegram_message_queue: str = os.getenv("TELEGRAM_MESSAGE_QUEUE", "telegram_received_messages")
+    # Declared with x-max-priority; see "Message priorities" in the README before renaming
+    telegram_message_queue: str = os.getenv("TELEGRAM_MESSAGE_QUEUE", "telegram_received_messages_prioritized")
     bot_response_queue: str = os.getenv("BOT_RESPONSE_QUEUE", "telegram_bot_responses")
     queue_visibility_timeout: int = int(os.getenv("QUEUE_VISIBILITY_TIMEOUT", "30"))
     queue_max_retries: int = int(os.getenv("QUEUE_MAX_RETRIES", "3"))
+    # 'broker' parks retries in TTL queues on RabbitMQ, 'memory' sleeps in-process
+    queue_retry_mode: str = os.getenv("QUEUE_RETRY_MODE", "broker")
+    # 'json', 'orjson' or 'msgpack'; queues the connector consumes always get
+    # JSON (orjson if installed), since the connector only reads JSON
+    queue_message_codec: str = os.getenv("QUEUE_MESSAGE_CODEC", "json")
+    # Longest delay for parked messages (e.g. while the LLM circuit is open)
+    queue_max_park_delay_ms: int = int(os.getenv("QUEUE_MAX_PARK_DELAY_MS", "30000"))
 
     # Job Factory Configuration
+    # 'rabbitmq' or 'memory' (in-process queues, for local runs and benchmarks)
+    job_backend: str = os.getenv("JOB_BACKEND", "rabbitmq")
+    # Max handlers in flight per job (also used as the consumer prefetch count)
     job_batch_size: int = int(os.getenv("BOT_SERVICE_JOB_BATCH_SIZE", "10"))
+    # Tune concurrency and prefetch from handler latency/errors within these bounds
+    # (off by default: `concurrency` stays fixed at BOT_SERVICE_JOB_BATCH_SIZE)
+    job_adaptive_concurrency: bool = os.getenv("JOB_ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+    job_min_concurrency: int = int(os.getenv("JOB_MIN_CONCURRENCY", "1"))
+    job_max_concurrency: int = int(os.getenv("JOB_MAX_CONCURRENCY", "50"))
+    # Seconds in-flight handlers get to finish on shutdown before they are requeued
+    job_drain_timeout_seconds: float = float(os.getenv("JOB_DRAIN_TIMEOUT_SECONDS", "25"))
+
+    # Idempotency Configuration
+    # Processed-message outcomes kept in memory in front of the processed_messages table
+    idempotency_cache_size: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    # Hours outcomes are kept; must exceed how long a message can still be redelivered
+    idempotency_retention_hours: float = float(os.getenv("IDEMPOTENCY_RETENTION_HOURS", "24"))
+
+    # Worker Process Configuration
+    # More than 1 runs consumers in supervised child processes
+    bot_worker_processes: int = int(os.getenv("BOT_WORKER_PROCESSES", "1"))
+    bot_worker_heartbeat_interval: float = float(os.getenv("BOT_WORKER_HEARTBEAT_INTERVAL", "5"))
+    bot_worker_heartbeat_timeout: float = float(os.getenv("BOT_WORKER_HEARTBEAT_TIMEOUT", "30"))
 
     # Telegram Configuration
     telegram_bot_token: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -81,12 +161,13 @@ class Settings(BaseSettings):
     def validate_required_settings(self) -> None:
         """Validate that all required settings are present."""
         required_fields = [
-            ("openai_api_key", "OPENAI_API_KEY"),
             ("database_url", "DATABASE_URL"),
             ("rabbitmq_url", "RABBITMQ_URL"),
             ("telegram_bot_token", "TELEGRAM_BOT_TOKEN"),
             ("telegram_webhook_secret", "TELEGRAM_WEBHOOK_SECRET"),
         ]
+        if self.llm_backend != "fake":
+            required_fields.append(("openai_api_key", "OPENAI_API_KEY"))
 
         missing_fields = []
         for field_name, env_var in required_fields:
@@ -35,6 +35,18 @@ class IncomingMessage:
             raise ValueError("Chat ID is required")
 
 
+@dataclass
+class ProcessedMessage:
+    """Outcome of a message that has already been handled, used to deduplicate redeliveries."""
+
+    chat_id: int
+    message_id: int
+    response_text: str | None = None
+    # Set when the response was streamed; a replay edits that message instead of sending a new one
+    response_id: str | None = None
+    processed_at: datetime | None = None
+
+
 @dataclass
 class ParsedExpense:
     """Represents a parsed expense from a message."""
@@ -93,3 +105,5 @@ class ProcessingResult:
     success: bool
     response_text: str
     summary_data: Optional[ExpenseSummary] = None
+    # False when the message turned out not to need a reply (e.g. small talk)
+    should_respond: bool = True
@@ -3,9 +3,13 @@ Expense parser interface for LLM integration with tools.
 """
 
 from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
 
 from domain.entities.message import ProcessingResult
 
+# Receives the answer generated so far, each time with more text
+PartialResponseCallback = Callable[[str], Awaitable[None]]
+
 
 class IExpenseParser(ABC):
     """Interface for processing messages using LLM with tools."""
@@ -14,7 +18,8 @@ class IExpenseParser(ABC):
     async def process_message(
         self, 
         message_text: str, 
-        user_id: int
+        user_id: int,
+        on_partial_response: PartialResponseCallback | None = None
     ) -> ProcessingResult:
         """
         Process a message using LLM with tools.
@@ -28,8 +33,14 @@ class IExpenseParser(ABC):
         Args:
             message_text: The raw message text from user
             user_id: The ID of the user sending the message
+            on_partial_response: Called with the partial answer while it is
+                generated; parsers that don't stream never call it
             
         Returns:
             ProcessingResult containing the outcome and response text
         """
         pass
+
+    async def warm_up(self) -> None:
+        """Prepare anything expensive (e.g. prompts, agents) before the first message."""
+        pass
@@ -7,6 +7,10 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any
 
+# Message priorities; messages at PRIORITY_HIGH or above take the consumer fast lane
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 5
+
 
 @dataclass
 class TaskHandlerArgs:
@@ -19,8 +23,10 @@ class TaskHandlerArgs:
 class TaskHandlerResult:
     """Result returned by task handlers."""
 
-    status: str  # 'success' | 'error' | 'cancelled'
+    status: str  # 'success' | 'error' | 'cancelled' | 'delayed'
     result_message: str = None
+    # For 'delayed': park the message this long without using up a retry attempt
+    retry_after_ms: int | None = None
 
 
 class JobOptions:
@@ -32,19 +38,54 @@ class JobOptions:
         handler=None,
         poll_interval_in_millis: int = 1000,
         visibility_timeout_in_seconds: int = 5,
+        concurrency: int | None = None,
+        partition_key=None,
+        codec: str | None = None,
+        external_consumer: bool = False,
+        max_priority: int | None = None,
+        priority=None,
+        fast_lane_concurrency: int = 2,
+        batch_handler=None,
+        batch_max_size: int = 10,
+        batch_window_ms: int = 20,
     ):
         self.name = name
         self.handler = handler
         self.poll_interval_in_millis = poll_interval_in_millis
         self.visibility_timeout_in_seconds = visibility_timeout_in_seconds
+        # Max handlers in flight for this job; None uses the factory default
+        self.concurrency = concurrency
+        # Optional callable(data) -> key; messages sharing a key are processed
+        # one at a time in delivery order, different keys run in parallel
+        self.partition_key = partition_key
+        # Wire codec name for published messages; None uses the factory default
+        self.codec = codec
+        # Set when something other than the bot (the connector) consumes the
+        # queue: it only reads JSON, so non-JSON codecs are refused for it
+        self.external_consumer = external_consumer
+        # Highest priority the queue honours (x-max-priority); None disables priorities
+        self.max_priority = max_priority
+        # Optional callable(data) -> int resolving the priority of a delivered
+        # message that was published without one
+        self.priority = priority
+        # Handler slots reserved for high-priority messages, on top of `concurrency`
+        self.fast_lane_concurrency = fast_lane_concurrency
+        # Optional async callable(list[TaskHandlerArgs]) -> list[TaskHandlerResult],
+        # used instead of `handler`. It receives up to `batch_max_size` messages
+        # collected within `batch_window_ms` and returns one result per message,
+        # in order; each message is then acked or retried on its own. With a
+        # `partition_key`, a batch holds the next message of several keys
+        self.batch_handler = batch_handler
+        self.batch_max_size = batch_max_size
+        self.batch_window_ms = batch_window_ms
 
 
 class Job(ABC):
     """Interface for job operations."""
 
     @abstractmethod
-    async def schedule_task(self, data: Any) -> None:
-        """Schedule a task with the given data."""
+    async def schedule_task(self, data: Any, priority: int | None = None) -> None:
+        """Schedule a task with the given data and optional priority."""
         pass
 
     @abstractmethod
@@ -22,3 +22,16 @@ class IMessageClassifier(ABC):
             True if the message is expense-related, False otherwise
         """
         pass
+
+    @abstractmethod
+    def quick_classify(self, message_text: str) -> bool | None:
+        """
+        Classify a message with cheap local rules only, without any LLM call.
+
+        Args:
+            message_text: The raw message text from user
+
+        Returns:
+            True or False when the rules are conclusive, None otherwise
+        """
+        pass
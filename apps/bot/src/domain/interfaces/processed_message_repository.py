@@ -0,0 +1,21 @@
+"""
+Processed message repository interface (idempotency store).
+"""
+
+from abc import ABC, abstractmethod
+
+from domain.entities.message import ProcessedMessage
+
+
+class IProcessedMessageRepository(ABC):
+    """Interface for remembering which messages have already been handled."""
+
+    @abstractmethod
+    async def find(self, chat_id: int, message_id: int) -> ProcessedMessage | None:
+        """Find the stored outcome of a message."""
+        pass
+
+    @abstractmethod
+    async def save(self, processed_message: ProcessedMessage) -> None:
+        """Store the outcome of a message; the first stored outcome wins."""
+        pass
@@ -1,5 +1,5 @@
 """
-Tool factory interface for creating contextualized expense tools.
+Tool factory interface for creating expense tools.
 """
 
 from abc import ABC, abstractmethod
@@ -9,16 +9,16 @@ from domain.interfaces.expense_tool import IExpenseTool
 
 
 class IToolFactory(ABC):
-    """Interface for creating expense tools with user context."""
+    """Interface for creating expense tools."""
 
     @abstractmethod
-    def create_tools_for_user(self, user_id: int) -> List[IExpenseTool]:
-        """Create a list of expense tools contextualized for a specific user.
-        
-        Args:
-            user_id: The ID of the user for whom to create the tools
-            
+    def create_tools(self) -> List[IExpenseTool]:
+        """Create the expense tools, shared by all users.
+
+        The user a tool acts for comes from the context of each agent run,
+        not from the tool itself.
+
         Returns:
-            List of expense tools ready to use for the specified user
+            List of expense tools ready to use
         """
         pass
@@ -15,6 +15,11 @@ class IUserRepository(ABC):
         """Find user by Telegram ID."""
         pass
 
+    @abstractmethod
+    async def find_by_telegram_ids(self, telegram_ids: list[str]) -> list[User]:
+        """Find all users with the given Telegram IDs."""
+        pass
+
     @abstractmethod
     async def create(self, user: User) -> User:
         """Create a new user."""
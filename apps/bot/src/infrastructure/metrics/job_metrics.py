@@ -0,0 +1,108 @@
+"""
+Prometheus metrics for the job pipeline.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Handler latencies range from a few ms (rule-rejected messages) to tens of seconds (agent runs)
+HANDLER_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30, 60)
+PUBLISH_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+JOB_MESSAGES_CONSUMED = Counter(
+    "bot_job_messages_consumed_total",
+    "Messages delivered to a job worker",
+    ["job"],
+)
+JOB_RESULTS = Counter(
+    "bot_job_results_total",
+    "Handler outcomes by status (success, error, cancelled, delayed)",
+    ["job", "status"],
+)
+JOB_RETRIES = Counter(
+    "bot_job_retries_total",
+    "Messages scheduled for retry",
+    ["job"],
+)
+JOB_DELAYED = Counter(
+    "bot_job_delayed_total",
+    "Messages parked for later without using up a retry attempt",
+    ["job"],
+)
+JOB_DEAD_LETTERED = Counter(
+    "bot_job_dead_lettered_total",
+    "Messages sent to the dead letter queue",
+    ["job"],
+)
+JOB_HANDLER_LATENCY = Histogram(
+    "bot_job_handler_duration_seconds",
+    "Time spent in the job handler",
+    ["job"],
+    buckets=HANDLER_LATENCY_BUCKETS,
+)
+JOB_BATCH_SIZE = Histogram(
+    "bot_job_batch_size",
+    "Messages per batch handler call",
+    ["job"],
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+JOB_IN_FLIGHT = Gauge(
+    "bot_job_in_flight",
+    "Handlers currently running",
+    ["job"],
+    multiprocess_mode="livesum",
+)
+JOB_CONCURRENCY_LIMIT = Gauge(
+    "bot_job_concurrency_limit",
+    "Current max handlers in flight (and prefetch count)",
+    ["job"],
+    multiprocess_mode="livesum",
+)
+JOB_MESSAGES_PUBLISHED = Counter(
+    "bot_job_messages_published_total",
+    "Messages published by a job",
+    ["job"],
+)
+JOB_PUBLISH_LATENCY = Histogram(
+    "bot_job_publish_duration_seconds",
+    "Time to publish (and confirm) a message or batch",
+    ["job"],
+    buckets=PUBLISH_LATENCY_BUCKETS,
+)
+RESPONSES_SCHEDULED = Counter(
+    "bot_responses_scheduled_total",
+    "Bot responses scheduled for sending to Telegram",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (multi-process worker mode), the
+    values written by every worker process are aggregated.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of a worker process that exited."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
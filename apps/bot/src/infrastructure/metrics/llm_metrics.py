@@ -0,0 +1,83 @@
+"""
+Prometheus metrics for LLM calls.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Single LLM calls take from ~100ms (classifier) to tens of seconds (long answers)
+LLM_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+TOOL_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+MESSAGE_TOKEN_BUCKETS = (10, 50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+AGENT_ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "bot_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+    multiprocess_mode="max",
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "bot_circuit_breaker_rejected_total",
+    "Calls rejected because the circuit was open",
+    ["breaker"],
+)
+EXPENSE_FAST_PATH = Counter(
+    "bot_expense_fast_path_total",
+    "Messages recorded by the rule-based parser (hit) or passed to the LLM agent "
+    "(miss: no terse entry; uncertain: ambiguous category)",
+    ["outcome"],
+)
+EXPENSE_QUERY_CACHE = Counter(
+    "bot_expense_query_cache_total",
+    "Expense query cache lookups by kind (tool result or agent answer) and outcome",
+    ["kind", "outcome"],
+)
+LLM_TOKENS = Counter(
+    "bot_llm_tokens_total",
+    "Tokens used by LLM calls, by component (agent, classifier) and kind "
+    "(prompt, completion, cached_prompt: the part of prompt served from the provider's cache)",
+    ["component", "kind"],
+)
+LLM_CALL_LATENCY = Histogram(
+    "bot_llm_call_latency_seconds",
+    "Latency of single LLM calls (one agent step or one classification)",
+    ["component"],
+    buckets=LLM_LATENCY_BUCKETS,
+)
+LLM_TOOL_LATENCY = Histogram(
+    "bot_llm_tool_latency_seconds",
+    "Latency of tool calls made by the agent",
+    ["tool", "status"],
+    buckets=TOOL_LATENCY_BUCKETS,
+)
+LLM_MESSAGE_TOKENS = Histogram(
+    "bot_llm_message_tokens",
+    "Total tokens (prompt + completion) one message cost, by component",
+    ["component"],
+    buckets=MESSAGE_TOKEN_BUCKETS,
+)
+LLM_MESSAGE_CALLS = Histogram(
+    "bot_llm_message_calls",
+    "LLM calls one message needed, by component (agent iterations for the agent)",
+    ["component"],
+    buckets=AGENT_ITERATION_BUCKETS,
+)
+OPENAI_RATE_LIMIT_WAIT = Histogram(
+    "bot_openai_rate_limit_wait_seconds",
+    "Time OpenAI requests waited for client-side rate limit quota",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+OPENAI_RATE_LIMITED = Counter(
+    "bot_openai_rate_limited_total",
+    "OpenAI responses with status 429",
+)
+LLM_TOKEN_BUDGET_EXCEEDED = Counter(
+    "bot_llm_token_budget_exceeded_total",
+    "Messages whose LLM run was stopped for using up its token budget, by component",
+    ["component"],
+)
+LLM_HEDGED_REQUESTS = Counter(
+    "bot_llm_hedged_requests_total",
+    "Hedged LLM calls by which request answered first (primary or hedge)",
+    ["winner"],
+)
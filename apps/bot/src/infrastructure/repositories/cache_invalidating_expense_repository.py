@@ -0,0 +1,72 @@
+"""
+Expense repository decorator that invalidates cached expense queries on writes.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from domain.entities.expense import Expense
+from domain.interfaces.expense_repository import IExpenseRepository
+from infrastructure.utils.expense_query_cache import ExpenseQueryCache
+
+
+class CacheInvalidatingExpenseRepository(IExpenseRepository):
+    """Delegates to another repository and bumps the user's cache version on every write."""
+
+    def __init__(self, repository: IExpenseRepository, query_cache: ExpenseQueryCache):
+        self.repository = repository
+        self.query_cache = query_cache
+
+    async def create(self, expense: Expense) -> Expense:
+        """Create a new expense."""
+        try:
+            return await self.repository.create(expense)
+        finally:
+            # Even a failed write may have reached the database
+            self.query_cache.invalidate(expense.user_id)
+
+    async def find_by_id(self, expense_id: int) -> Expense | None:
+        """Find expense by ID."""
+        return await self.repository.find_by_id(expense_id)
+
+    async def find_by_user_id(self, user_id: int, limit: int = 100) -> list[Expense]:
+        """Find expenses by user ID."""
+        return await self.repository.find_by_user_id(user_id, limit)
+
+    async def find_by_user_id_and_date_range(
+        self,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 100
+    ) -> list[Expense]:
+        """Find expenses by user ID within a date range."""
+        return await self.repository.find_by_user_id_and_date_range(
+            user_id, start_date, end_date, limit
+        )
+
+    async def get_summary_by_category(
+        self,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> dict[str, Decimal]:
+        """Get expense summary grouped by category within date range."""
+        return await self.repository.get_summary_by_category(user_id, start_date, end_date)
+
+    async def update(self, expense: Expense) -> Expense:
+        """Update an existing expense."""
+        try:
+            return await self.repository.update(expense)
+        finally:
+            self.query_cache.invalidate(expense.user_id)
+
+    async def delete(self, expense_id: int) -> bool:
+        """Delete an expense by ID."""
+        # The ID alone doesn't say whose cache to invalidate
+        expense = await self.repository.find_by_id(expense_id)
+        try:
+            return await self.repository.delete(expense_id)
+        finally:
+            if expense is not None:
+                self.query_cache.invalidate(expense.user_id)
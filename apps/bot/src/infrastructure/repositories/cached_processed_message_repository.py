@@ -0,0 +1,43 @@
+"""
+In-process LRU front for the processed message repository.
+"""
+
+from collections import OrderedDict
+
+from domain.entities.message import ProcessedMessage
+from domain.interfaces.processed_message_repository import IProcessedMessageRepository
+
+
+class CachedProcessedMessageRepository(IProcessedMessageRepository):
+    """Keeps the most recent outcomes in memory so most redeliveries skip the database."""
+
+    def __init__(self, repository: IProcessedMessageRepository, max_size: int = 10000):
+        self.repository = repository
+        self.max_size = max(1, max_size)
+        self._cache: OrderedDict[tuple[int, int], ProcessedMessage] = OrderedDict()
+
+    async def find(self, chat_id: int, message_id: int) -> ProcessedMessage | None:
+        """Find the stored outcome of a message, checking memory first."""
+        key = (chat_id, message_id)
+        processed_message = self._cache.get(key)
+        if processed_message is not None:
+            self._cache.move_to_end(key)
+            return processed_message
+
+        # Misses aren't cached: another process may store the message later
+        processed_message = await self.repository.find(chat_id, message_id)
+        if processed_message is not None:
+            self._remember(processed_message)
+        return processed_message
+
+    async def save(self, processed_message: ProcessedMessage) -> None:
+        """Store the outcome of a message in the database and in memory."""
+        await self.repository.save(processed_message)
+        self._remember(processed_message)
+
+    def _remember(self, processed_message: ProcessedMessage) -> None:
+        key = (processed_message.chat_id, processed_message.message_id)
+        self._cache[key] = processed_message
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
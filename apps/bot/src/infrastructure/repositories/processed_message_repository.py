@@ -0,0 +1,130 @@
+"""
+PostgreSQL processed message repository implementation.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+from domain.entities.message import ProcessedMessage
+from domain.interfaces.processed_message_repository import IProcessedMessageRepository
+
+
+class PostgreSQLProcessedMessageRepository(IProcessedMessageRepository):
+    """PostgreSQL implementation of processed message repository.
+
+    Outcomes are only needed while a message can still be redelivered, so rows
+    older than the retention are deleted, at most once per prune interval, as
+    part of storing new outcomes.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        retention_in_seconds: float = 24 * 60 * 60,
+        prune_interval_in_seconds: float = 60 * 60,
+    ):
+        self.database_url = database_url
+        self.retention_in_seconds = retention_in_seconds
+        self.prune_interval_in_seconds = prune_interval_in_seconds
+        self.logger = logging.getLogger(__name__)
+        self._pool = None
+        self._last_pruned_at: float | None = None
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Get or create database connection pool."""
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(self.database_url)
+        return self._pool
+
+    async def find(self, chat_id: int, message_id: int) -> ProcessedMessage | None:
+        """Find the stored outcome of a message."""
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT chat_id, message_id, response_text, response_id, processed_at
+                    FROM processed_messages
+                    WHERE chat_id = $1 AND message_id = $2
+                    """,
+                    chat_id,
+                    message_id,
+                )
+
+                if row:
+                    return ProcessedMessage(
+                        chat_id=row["chat_id"],
+                        message_id=row["message_id"],
+                        response_text=row["response_text"],
+                        response_id=row["response_id"],
+                        processed_at=row["processed_at"],
+                    )
+                return None
+
+        except Exception as e:
+            self.logger.error(
+                f"Error finding processed message {chat_id}/{message_id}: {e}", exc_info=True
+            )
+            raise
+
+    async def save(self, processed_message: ProcessedMessage) -> None:
+        """Store the outcome of a message; the first stored outcome wins."""
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO processed_messages (chat_id, message_id, response_text, response_id)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (chat_id, message_id) DO NOTHING
+                    """,
+                    processed_message.chat_id,
+                    processed_message.message_id,
+                    processed_message.response_text,
+                    processed_message.response_id,
+                )
+
+        except Exception as e:
+            self.logger.error(
+                f"Error saving processed message {processed_message.chat_id}/{processed_message.message_id}: {e}",
+                exc_info=True,
+            )
+            raise
+
+        await self._prune_if_due()
+
+    async def delete_older_than(self, processed_before: datetime) -> int:
+        """Delete outcomes stored before the given time; returns how many were deleted."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            result = await conn.execute(
+                "DELETE FROM processed_messages WHERE processed_at < $1",
+                processed_before,
+            )
+        # asyncpg returns the command tag, e.g. "DELETE 42"
+        return int(result.split()[-1])
+
+    async def _prune_if_due(self) -> None:
+        """Drop outcomes past the retention; a failure only delays the next attempt."""
+        now = time.monotonic()
+        if self._last_pruned_at is not None and now - self._last_pruned_at < self.prune_interval_in_seconds:
+            return
+        self._last_pruned_at = now
+
+        try:
+            deleted = await self.delete_older_than(
+                datetime.now(timezone.utc) - timedelta(seconds=self.retention_in_seconds)
+            )
+            if deleted:
+                self.logger.info(f"Pruned {deleted} processed messages")
+        except Exception as e:
+            self.logger.warning(f"Error pruning processed messages: {e}")
+
+    async def close(self) -> None:
+        """Close database connections."""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
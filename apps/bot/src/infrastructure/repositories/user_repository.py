@@ -44,6 +44,27 @@ class PostgreSQLUserRepository(IUserRepository):
             )
             raise
 
+    async def find_by_telegram_ids(self, telegram_ids: list[str]) -> list[User]:
+        """Find all users with the given Telegram IDs in a single query."""
+        if not telegram_ids:
+            return []
+
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT id, telegram_id FROM users WHERE telegram_id = ANY($1::text[])",
+                    telegram_ids,
+                )
+
+                return [User(id=row["id"], telegram_id=row["telegram_id"]) for row in rows]
+
+        except Exception as e:
+            self.logger.error(
+                f"Error finding {len(telegram_ids)} users by telegram_id: {e}", exc_info=True
+            )
+            raise
+
     async def create(self, user: User) -> User:
         """Create a new user."""
         try:
@@ -11,47 +11,60 @@ from domain.interfaces.tool_factory import IToolFactory
 from infrastructure.tools.add_expense_tool import AddExpenseTool
 from infrastructure.tools.get_expenses_by_category_tool import GetExpensesByCategoryTool
 from infrastructure.tools.get_recent_expenses_tool import GetRecentExpensesTool
+from infrastructure.tools.ignore_message_tool import IgnoreMessageTool
+from infrastructure.utils.expense_query_cache import ExpenseQueryCache
 
 
 class ExpenseToolFactory(IToolFactory):
-    """Factory for creating expense tools with proper user context."""
+    """Factory for creating the expense tools."""
 
     def __init__(
         self,
         expense_repository: IExpenseRepository,
         categories_repository: IExpenseCategoriesRepository,
+        include_ignore_tool: bool = False,
+        query_cache: ExpenseQueryCache | None = None,
     ):
         """Initialize the tool factory with required repositories.
         
         Args:
             expense_repository: Repository for expense data operations
             categories_repository: Repository for expense categories
+            include_ignore_tool: Add the ignore_message tool, so the agent
+                itself can drop non-expense messages
+            query_cache: Cache for the read tools' results; writes must go
+                through a repository that invalidates it
         """
         self.expense_repository = expense_repository
         self.categories_repository = categories_repository
+        self.include_ignore_tool = include_ignore_tool
+        self.query_cache = query_cache
+
+    def create_tools(self) -> List[IExpenseTool]:
+        """Create the expense tools.
+
+        The tools hold no user state; they act for the user of the current
+        agent run (see infrastructure.tools.tool_context), so one set can be
+        shared by every message.
 
-    def create_tools_for_user(self, user_id: int) -> List[IExpenseTool]:
-        """Create contextualized tools for a specific user.
-        
-        Args:
-            user_id: The ID of the user for whom to create the tools
-            
         Returns:
-            List of expense tools configured for the specified user
+            List of expense tools
         """
-        return [
+        tools: List[IExpenseTool] = [
             AddExpenseTool(
                 expense_repository=self.expense_repository,
-                categories_repository=self.categories_repository,
-                user_id=user_id
+                categories_repository=self.categories_repository
             ),
             GetRecentExpensesTool(
                 expense_repository=self.expense_repository,
-                user_id=user_id
+                query_cache=self.query_cache
             ),
             GetExpensesByCategoryTool(
                 expense_repository=self.expense_repository,
                 categories_repository=self.categories_repository,
-                user_id=user_id
+                query_cache=self.query_cache
             ),
         ]
+        if self.include_ignore_tool:
+            tools.append(IgnoreMessageTool())
+        return tools
@@ -0,0 +1,194 @@
+"""
+Chat model wrapper that hedges slow calls with a second, identical request.
+
+When a call runs longer than a percentile of recently observed latencies, a
+second request is sent and whichever answers first wins; the other one is
+cancelled. Chat completions have no side effects (tools run only after the
+model has answered), so sending one twice is safe. The hedge costs at most
+(1 - percentile) extra requests and cuts the tail latency caused by a slow
+upstream replica.
+
+Streamed calls are hedged up to their first chunk: the request that starts
+answering first is streamed to the end and the other one is cancelled.
+"""
+
+import asyncio
+import logging
+import math
+from collections import deque
+from typing import Any, AsyncIterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, BaseMessageChunk
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from infrastructure.metrics.llm_metrics import LLM_HEDGED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+class HedgedChatModel(BaseChatModel):
+    """Sends a backup request when the first one is slower than usual."""
+
+    model: BaseChatModel
+    # Hedge once a call runs longer than this percentile of recent latencies
+    hedge_percentile: float = 0.95
+    # Never hedge sooner than this, nor before enough latencies were seen
+    min_hedge_delay_in_seconds: float = 0.5
+    initial_hedge_delay_in_seconds: float = 10.0
+    window_size: int = 200
+    min_samples: int = 20
+
+    # Full-call latencies, and time to first chunk of streamed calls
+    _latencies: deque = PrivateAttr()
+    _first_chunk_latencies: deque = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._latencies = deque(maxlen=self.window_size)
+        self._first_chunk_latencies = deque(maxlen=self.window_size)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"hedged-{self.model._llm_type}"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Only async calls are hedged
+        result = self.model.generate([messages], stop=stop, **kwargs)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        primary = asyncio.create_task(self._agenerate_once(messages, stop, **kwargs))
+        tasks = {primary}
+        hedged = False
+
+        try:
+            hedge_delay = self.hedge_delay()
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                logger.info("LLM call slower than %.2fs, sending a hedged request", hedge_delay)
+                tasks.add(asyncio.create_task(self._agenerate_once(messages, stop, **kwargs)))
+                hedged = True
+
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if hedged:
+                        LLM_HEDGED_REQUESTS.labels(winner="primary" if task is primary else "hedge").inc()
+                    self._latencies.append(loop.time() - started_at)
+                    return task.result()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        primary = self._astream_once(messages, stop, **kwargs)
+        # Task awaiting the first chunk of each request -> that request's stream
+        first_chunks = {asyncio.create_task(_first_chunk(primary)): primary}
+        hedged = False
+        winner = None
+
+        try:
+            hedge_delay = self.hedge_delay(self._first_chunk_latencies)
+            done, _ = await asyncio.wait(first_chunks, timeout=hedge_delay)
+            if not done:
+                logger.info("LLM stream slower than %.2fs to start, sending a hedged request", hedge_delay)
+                hedge = self._astream_once(messages, stop, **kwargs)
+                first_chunks[asyncio.create_task(_first_chunk(hedge))] = hedge
+                hedged = True
+
+            error: BaseException | None = None
+            first_chunk: BaseMessageChunk | None = None
+            pending = set(first_chunks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    winner = first_chunks[task]
+                    first_chunk = task.result()
+                    break
+            if winner is None:
+                raise error
+
+            if hedged:
+                LLM_HEDGED_REQUESTS.labels(winner="primary" if winner is primary else "hedge").inc()
+            self._first_chunk_latencies.append(loop.time() - started_at)
+            for task in pending:
+                task.cancel()
+
+            # None: the winner finished without any chunk
+            if first_chunk is not None:
+                yield ChatGenerationChunk(message=first_chunk)
+                async for chunk in winner:
+                    yield ChatGenerationChunk(message=chunk)
+        finally:
+            for task in first_chunks:
+                task.cancel()
+            for stream in first_chunks.values():
+                # Closed once the cancellations above have run, ending the requests
+                asyncio.ensure_future(stream.aclose())
+
+    def _astream_once(
+        self, messages: list[BaseMessage], stop: list[str] | None, **kwargs: Any
+    ) -> AsyncIterator[BaseMessageChunk]:
+        """One streamed request through the wrapped model, with its own callbacks only.
+
+        This model's run already reports the call to the caller's handlers (e.g.
+        usage tracking), so the wrapped model must not inherit them as well.
+        """
+        return self.model.astream(messages, {"callbacks": []}, stop=stop, **kwargs)
+
+    async def _agenerate_once(
+        self, messages: list[BaseMessage], stop: list[str] | None, **kwargs: Any
+    ) -> ChatResult:
+        """One request through the wrapped model, with its own callbacks, cache and limits."""
+        result = await self.model.agenerate([messages], stop=stop, **kwargs)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
+
+    def hedge_delay(self, latencies: deque | None = None) -> float:
+        """Seconds to wait for the first request (or its first chunk) before sending the hedge."""
+        latencies = self._latencies if latencies is None else latencies
+        if len(latencies) < self.min_samples:
+            return self.initial_hedge_delay_in_seconds
+
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, math.ceil(self.hedge_percentile * len(ordered)) - 1)
+        return max(self.min_hedge_delay_in_seconds, ordered[index])
+
+
+async def _first_chunk(stream: AsyncIterator[BaseMessageChunk]) -> BaseMessageChunk | None:
+    """Wait for the first chunk of a stream; None if it ends without one."""
+    try:
+        return await anext(stream)
+    except StopAsyncIteration:
+        return None
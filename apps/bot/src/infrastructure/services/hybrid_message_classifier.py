@@ -4,12 +4,14 @@ Hybrid message classifier that combines rule-based filtering with lightweight LL
 
 import logging
 import re
-from typing import Set
+from typing import Optional, Set
 
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
 from domain.interfaces.message_classifier import IMessageClassifier
+from infrastructure.utils.circuit_breaker import CircuitBreaker
+from infrastructure.utils.llm_usage import LLMUsageTracker
 
 
 class HybridMessageClassifier(IMessageClassifier):
@@ -18,12 +20,14 @@ class HybridMessageClassifier(IMessageClassifier):
     and lightweight LLM for borderline messages.
     """
 
-    def __init__(self, openai_api_key: str, model: str = "gpt-3.5-turbo"):
-        self.llm = ChatOpenAI(
-            api_key=openai_api_key,
-            model=model,
-            temperature=0.0,  # Deterministic for classification
-        )
+    def __init__(
+        self,
+        llm: Runnable,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        # Should be deterministic (temperature 0) with room for a YES or NO only
+        self.llm = llm
+        self.circuit_breaker = circuit_breaker or CircuitBreaker("openai")
         self.logger = logging.getLogger(__name__)
         
         # Rule-based patterns for obvious expense messages  
@@ -36,11 +40,25 @@ class HybridMessageClassifier(IMessageClassifier):
             r'\b(coffee|lunch|dinner|gas|groceries|uber|taxi|shopping)\b.*\$?\d+',
             # Transaction language
             r'\b(receipt|transaction|bill|invoice)\b',
+            # Terse entries: a few words, an amount and maybe a category ("burrito 9 food")
+            r'^[a-z][a-z\'\-]*(\s+[a-z][a-z\'\-]*){0,2}\s+\$?\d+(\.\d{1,2})?(\s+[a-z/]+)?$',
         }
         
+        # Rule-based patterns for obvious non-expense messages; they must
+        # match the whole message so "thanks, lunch was 12" is not caught
+        self.non_expense_patterns = {
+            # Greetings, thanks and acknowledgements
+            r'^(hi|hello|hey|hola|yo|good (morning|afternoon|evening|night)|bye|goodbye|'
+            r'thanks?( you)?|thx|ty|ok(ay)?|cool|nice|great|lol)[\s!.?]*$',
+            # No letters or digits at all (emoji, stickers, punctuation)
+            r'^[^\w]+$',
+        }
+
         # Compile regex patterns
         self.compiled_expense = [re.compile(pattern, re.IGNORECASE) 
                                for pattern in self.expense_patterns]
+        self.compiled_non_expense = [re.compile(pattern, re.IGNORECASE)
+                                   for pattern in self.non_expense_patterns]
 
     async def is_expense_related(self, message_text: str) -> bool:
         """
@@ -56,12 +74,12 @@ class HybridMessageClassifier(IMessageClassifier):
         # First, check rule-based patterns for obvious cases
         rule_result = self._classify_with_rules(message_text)
         
-        if rule_result is True:
+        if rule_result is not None:
             self.logger.info(
                 "Rule-based classification: %s -> %s", 
                 message_text[:50], rule_result
             )
-            return True
+            return rule_result
             
         # For borderline cases, use lightweight LLM classification
         try:
@@ -73,10 +91,18 @@ class HybridMessageClassifier(IMessageClassifier):
             return llm_result
         except Exception as e:
             self.logger.error("LLM classification failed: %s", e)
-            # Default to processing the message if classification fails
+            # Default to processing the message if classification fails; while
+            # the circuit is open the parser then fails fast and the message is parked
             return True
 
-    def _classify_with_rules(self, message_text: str) -> bool:
+    def quick_classify(self, message_text: str) -> Optional[bool]:
+        """Classify using the rule-based patterns only."""
+        message_text = message_text.strip()
+        if not message_text:
+            return False
+        return self._classify_with_rules(message_text)
+
+    def _classify_with_rules(self, message_text: str) -> Optional[bool]:
         """
         Use rule-based patterns to classify obvious cases.
         Returns None if patterns are inconclusive.
@@ -85,8 +111,12 @@ class HybridMessageClassifier(IMessageClassifier):
         for pattern in self.compiled_expense:
             if pattern.search(message_text):
                 return True
+
+        for pattern in self.compiled_non_expense:
+            if pattern.match(message_text):
+                return False
                 
-        return False
+        return None
 
     async def _classify_with_llm(self, message_text: str) -> bool:
         """Use lightweight LLM to classify borderline messages."""
@@ -113,7 +143,13 @@ Respond with only "YES" if the message is expense-related, or "NO" if it's not."
         ])
         
         chain = prompt | self.llm
-        result = await chain.ainvoke({"message": message_text})
+        usage = LLMUsageTracker("classifier")
+        try:
+            result = await self.circuit_breaker.call(
+                chain.ainvoke, {"message": message_text}, config={"callbacks": [usage]}
+            )
+        finally:
+            self.logger.info("Classifier usage: %s", usage.finish())
         
         response = result.content.strip().upper()
         return response == "YES"
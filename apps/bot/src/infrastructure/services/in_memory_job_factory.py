@@ -0,0 +1,355 @@
+"""
+In-memory job factory implementation for the bot service.
+
+Runs jobs on asyncio queues inside the current process, with the same
+concurrency, ordering, retry and DLQ semantics as the RabbitMQ factory.
+Used for broker-free local runs and benchmarks.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+import string
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from domain.interfaces.job_factory import (
+    PRIORITY_NORMAL,
+    Job,
+    JobFactory,
+    JobOptions,
+    TaskHandlerArgs,
+    TaskHandlerResult,
+)
+from infrastructure.metrics.job_metrics import (
+    JOB_BATCH_SIZE,
+    JOB_DEAD_LETTERED,
+    JOB_DELAYED,
+    JOB_HANDLER_LATENCY,
+    JOB_IN_FLIGHT,
+    JOB_MESSAGES_CONSUMED,
+    JOB_RESULTS,
+    JOB_RETRIES,
+)
+from infrastructure.utils.queue_utils import (
+    apply_full_jitter,
+    calculate_retry_delay_ms,
+)
+
+
+@dataclass
+class InMemoryMessage:
+    """In-memory message envelope."""
+
+    msg_id: str
+    data: Any
+    attempts: int = 0
+    max_retries: int = 3
+    priority: int = PRIORITY_NORMAL
+
+
+class InMemoryJobFactory(JobFactory):
+    """Job factory that keeps all queues in process memory."""
+
+    def __init__(self, batch_size: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = batch_size
+        self.max_retries = settings.queue_max_retries
+        self._jobs: Dict[str, "InMemoryJob"] = {}
+        # Messages that exhausted their retries, per job name
+        self.dead_letters: Dict[str, list[InMemoryMessage]] = {}
+
+        self.logger.info("In-memory job factory initialized")
+
+    def create_job(self, options: JobOptions) -> Job:
+        """Create a job with the given options."""
+        self.logger.info(f"InMemoryJobFactory - Creating job '{options.name}'")
+
+        job = InMemoryJob(job_factory=self, options=options)
+        self._jobs[options.name] = job
+        return job
+
+    def _generate_message_id(self) -> str:
+        """Generate a unique message ID."""
+        timestamp = str(int(time.time() * 1000))
+        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=9))
+        return f"{timestamp}-{random_suffix}"
+
+    async def join(self) -> None:
+        """Wait until every scheduled task (including retries) has been handled.
+
+        Jobs consumed outside the bot (e.g. responses for the connector) are
+        skipped: nothing here handles them, so their messages stay queued.
+        """
+        for job in self._jobs.values():
+            if job.has_consumer:
+                await job.join()
+
+    async def close(self) -> None:
+        """Stop all workers."""
+        self.logger.info("Shutting down in-memory workers")
+        for job in self._jobs.values():
+            await job.turn_off()
+
+
+class InMemoryJob(Job):
+    """In-memory job implementation."""
+
+    def __init__(self, job_factory: InMemoryJobFactory, options: JobOptions):
+        self.job_factory = job_factory
+        self.options = options
+        self.logger = logging.getLogger(__name__)
+        self.concurrency = max(1, options.concurrency or job_factory.batch_size)
+
+        # Messages, or for keyed jobs the keys whose next message may start, drained
+        # higher priorities first and FIFO within a priority. Keyed jobs keep each
+        # key's messages in its own FIFO queue, so a key runs one message at a time
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._key_queues: Dict[Any, deque] = {}
+        self._sequence = itertools.count()
+        self._worker_tasks: list[asyncio.Task] = []
+        self._pending_retries: set[asyncio.Task] = set()
+
+    async def schedule_task(self, data: Any, priority: Optional[int] = None) -> None:
+        """Schedule a task with the given data and optional priority."""
+        self._enqueue(self._build_message(data, priority))
+        self.logger.debug(f"InMemoryJobFactory - Scheduled task for job '{self.options.name}'")
+
+    async def turn_on(self) -> None:
+        """Start the job workers."""
+        if self._worker_tasks:
+            return
+
+        if not self.has_consumer:
+            self.logger.info(f"InMemoryJobFactory - No handler for job '{self.options.name}'")
+            return
+
+        self.logger.info(
+            f"InMemoryJobFactory - Turning on worker for job '{self.options.name}' (concurrency: {self.concurrency})"
+        )
+        self._worker_tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+
+    async def turn_off(self) -> None:
+        """Stop the job workers."""
+        self.logger.info(f"InMemoryJobFactory - Turning off worker for job '{self.options.name}'")
+
+        for task in [*self._worker_tasks, *self._pending_retries]:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, *self._pending_retries, return_exceptions=True)
+
+        self._worker_tasks = []
+        self._pending_retries.clear()
+
+    @property
+    def has_consumer(self) -> bool:
+        """Whether this process handles the job's messages."""
+        return bool(self.options.handler or self.options.batch_handler)
+
+    async def join(self) -> None:
+        """Wait until all queued and retrying messages have been handled."""
+        while True:
+            await self._queue.join()
+            if not self._pending_retries:
+                return
+            await asyncio.gather(*self._pending_retries, return_exceptions=True)
+
+    def _build_message(self, data: Any, priority: Optional[int] = None) -> InMemoryMessage:
+        if priority is None:
+            priority = self._resolve_priority(data)
+        return InMemoryMessage(
+            msg_id=self.job_factory._generate_message_id(),
+            data=data,
+            attempts=0,
+            max_retries=self.job_factory.max_retries,
+            priority=priority,
+        )
+
+    def _resolve_priority(self, data: Any) -> int:
+        """Priority from the job's resolver, or normal priority."""
+        if self.options.priority is None:
+            return PRIORITY_NORMAL
+        try:
+            return self.options.priority(data)
+        except Exception as error:
+            self.logger.warning(
+                f"InMemoryJobFactory - Could not resolve priority for job '{self.options.name}': {error}"
+            )
+            return PRIORITY_NORMAL
+
+    def _enqueue(self, message: InMemoryMessage) -> None:
+        """Queue a message, behind the unfinished messages of its key for keyed jobs."""
+        if not self.options.partition_key:
+            self._put(message.priority, message)
+            return
+
+        try:
+            key = self.options.partition_key(message.data)
+        except Exception:
+            key = None
+        queue = self._key_queues.get(key)
+        if queue is None:
+            # Nothing of this key is queued or running: it can start right away
+            self._key_queues[key] = deque([message])
+            self._put(message.priority, key)
+        else:
+            queue.append(message)
+
+    def _put(self, priority: int, entry: Any) -> None:
+        # The sequence number keeps FIFO order among entries of equal priority
+        self._queue.put_nowait((-priority, next(self._sequence), entry))
+
+    async def _worker_loop(self) -> None:
+        """Process queued messages one at a time (or one batch at a time)."""
+        while True:
+            batch: list[InMemoryMessage] = []
+            keys: list[Any] = []
+            self._take(await self._queue.get(), batch, keys)
+            try:
+                if self.options.batch_handler:
+                    await self._collect_batch(batch, keys)
+                await self._process_messages(batch)
+            finally:
+                for key in keys:
+                    self._finish_key(key)
+                for _ in range(len(keys) if self.options.partition_key else len(batch)):
+                    self._queue.task_done()
+
+    def _take(self, item: tuple, batch: list[InMemoryMessage], keys: list[Any]) -> None:
+        """Add a queued entry's message to `batch`; a key adds its next message."""
+        _, _, entry = item
+        if self.options.partition_key:
+            keys.append(entry)
+            entry = self._key_queues[entry].popleft()
+        batch.append(entry)
+
+    def _finish_key(self, key: Any) -> None:
+        """Queue a key again once its message finished, or forget it if it has no more."""
+        queue = self._key_queues[key]
+        if queue:
+            self._put(queue[0].priority, key)
+        else:
+            del self._key_queues[key]
+
+    async def _collect_batch(self, batch: list[InMemoryMessage], keys: list[Any]) -> None:
+        """Add queued messages to `batch` until it is full or the batch window closes.
+
+        Keyed jobs add the next message of each ready key, so a batch mixes
+        keys while every key still runs one message at a time.
+        """
+        deadline = time.monotonic() + self.options.batch_window_ms / 1000
+        while len(batch) < self.options.batch_max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return
+            self._take(item, batch, keys)
+
+    async def _process_messages(self, batch: list[InMemoryMessage]) -> None:
+        """Run the handler (or batch handler) and resolve each message's outcome."""
+        started_at = time.monotonic()
+        JOB_MESSAGES_CONSUMED.labels(job=self.options.name).inc(len(batch))
+        JOB_IN_FLIGHT.labels(job=self.options.name).inc(len(batch))
+        try:
+            for message in batch:
+                self.logger.debug(
+                    f"InMemoryJobFactory - Processing job '{self.options.name}' with id {message.msg_id}"
+                )
+
+            results = await self._run_handler(batch)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self.logger.error(f"InMemoryJobFactory - Error processing job '{self.options.name}': {error}")
+            results = [None] * len(batch)
+        finally:
+            JOB_IN_FLIGHT.labels(job=self.options.name).dec(len(batch))
+
+        latency = time.monotonic() - started_at
+        for message, result in zip(batch, results):
+            status = self._resolve_result(message, result)
+            JOB_HANDLER_LATENCY.labels(job=self.options.name).observe(latency)
+            JOB_RESULTS.labels(job=self.options.name, status=status).inc()
+
+    async def _run_handler(self, batch: list[InMemoryMessage]) -> list[TaskHandlerResult]:
+        """Call the job's handler, or its batch handler, returning one result per message."""
+        if not self.options.batch_handler:
+            return [await self.options.handler(TaskHandlerArgs(data=batch[0].data))]
+
+        JOB_BATCH_SIZE.labels(job=self.options.name).observe(len(batch))
+        results = await self.options.batch_handler(
+            [TaskHandlerArgs(data=message.data) for message in batch]
+        )
+        if len(results) != len(batch):
+            raise ValueError(f"Batch handler returned {len(results)} results for {len(batch)} messages")
+        return results
+
+    def _resolve_result(self, message: InMemoryMessage, result: TaskHandlerResult | None) -> str:
+        """Retry or complete a message from its handler result; None means the handler raised."""
+        # Handle result based on status
+        if result is None or result.status == "error":
+            if result is not None:
+                self.logger.error(
+                    f"InMemoryJobFactory - Job failed '{self.options.name}' with id {message.msg_id}: {result.result_message}"
+                )
+            self._handle_failed_message(message)
+            return "error"
+
+        if result.status == "cancelled":
+            self.logger.info(
+                f"InMemoryJobFactory - Job cancelled '{self.options.name}' with id {message.msg_id}"
+            )
+            return "cancelled"
+
+        if result.status == "delayed":
+            # Parked, e.g. while an upstream is down: doesn't use up an attempt
+            delay = (result.retry_after_ms or 0) / 1000
+            self._schedule_retry(message, delay)
+            JOB_DELAYED.labels(job=self.options.name).inc()
+            self.logger.info(
+                f"InMemoryJobFactory - Job delayed '{self.options.name}' with id {message.msg_id} for {delay}s: {result.result_message}"
+            )
+            return "delayed"
+
+        self.logger.debug(
+            f"InMemoryJobFactory - Job completed '{self.options.name}' with id {message.msg_id}"
+        )
+        return "success"
+
+    def _handle_failed_message(self, message: InMemoryMessage) -> None:
+        """Handle a failed message with retry logic."""
+        message.attempts += 1
+
+        if message.attempts >= message.max_retries:
+            self.job_factory.dead_letters.setdefault(self.options.name, []).append(message)
+            JOB_DEAD_LETTERED.labels(job=self.options.name).inc()
+            self.logger.warning(
+                f"Message sent to DLQ after {message.attempts} attempts: {message.msg_id}"
+            )
+            return
+
+        delay = apply_full_jitter(calculate_retry_delay_ms(message.attempts)) / 1000
+        self._schedule_retry(message, delay)
+        JOB_RETRIES.labels(job=self.options.name).inc()
+
+        self.logger.info(
+            f"Message will be retried in {delay}s (attempt {message.attempts}/{message.max_retries}): {message.msg_id}"
+        )
+
+    def _schedule_retry(self, message: InMemoryMessage, delay: float) -> None:
+        """Re-enqueue a message after `delay` seconds, tracked so join() waits for it."""
+        retry_task = asyncio.create_task(self._retry_message(message, delay))
+        self._pending_retries.add(retry_task)
+        retry_task.add_done_callback(self._pending_retries.discard)
+
+    async def _retry_message(self, message: InMemoryMessage, delay: float) -> None:
+        """Re-enqueue a message after a delay."""
+        await asyncio.sleep(delay)
+        self._enqueue(message)
@@ -1,16 +1,56 @@
 """
 OpenAI expense parser implementation using LangChain with dependency injection.
+
+The chat model is injected, so the agent runs against OpenAI or against the
+scripted model used for offline load tests alike.
 """
 
+import asyncio
 import logging
+import re
+import time
+from typing import Any
 
 from langchain.agents import AgentExecutor, create_openai_functions_agent
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable
 
 from domain.entities.message import ProcessingResult
-from domain.interfaces.expense_parser import IExpenseParser
+from domain.interfaces.expense_parser import IExpenseParser, PartialResponseCallback
 from domain.interfaces.tool_factory import IToolFactory
+from infrastructure.tools.get_expenses_by_category_tool import GET_EXPENSES_BY_CATEGORY_TOOL_NAME
+from infrastructure.tools.get_recent_expenses_tool import GET_RECENT_EXPENSES_TOOL_NAME
+from infrastructure.tools.ignore_message_tool import IGNORE_MESSAGE_TOOL_NAME, IGNORED_MESSAGE_OUTPUT
+from infrastructure.tools.tool_context import user_context
+from infrastructure.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from infrastructure.utils.expense_query_cache import ExpenseQueryCache
+from infrastructure.utils.llm_usage import LLMUsageTracker, TokenBudgetExceededError
+
+# Tools that only read expenses; answers built from nothing else can be cached
+READ_ONLY_TOOLS = {GET_RECENT_EXPENSES_TOOL_NAME, GET_EXPENSES_BY_CATEGORY_TOOL_NAME}
+
+# Questions relative to the current date; a cached answer to "how much today"
+# would be wrong after midnight, so these are never answered from the cache
+_RELATIVE_DATE_PATTERN = re.compile(
+    r"\b(today|tonight|yesterday|now|current|this|last|past|recent|recently|ago|"
+    r"days?|weeks?|weekend|months?|years?|morning|afternoon|evening)\b",
+    re.IGNORECASE,
+)
+
+SYSTEM_PROMPT_TEMPLATE = """You are a helpful expense tracking assistant. 
+
+Available expense categories: {categories}
+
+Be conversational and friendly. When expenses are added successfully, acknowledge them positively. 
+When providing summaries, format them clearly with totals and categories.
+
+Use the available tools to help users track and query their expenses. The tools have detailed 
+descriptions that will guide you on when to use each one."""
+
+IGNORE_MESSAGE_INSTRUCTIONS = f"""
+
+If the message is not about expenses at all, call {IGNORE_MESSAGE_TOOL_NAME} instead of replying."""
 
 
 class OpenAIExpenseParser(IExpenseParser):
@@ -18,72 +58,195 @@ class OpenAIExpenseParser(IExpenseParser):
 
     def __init__(
         self, 
-        openai_api_key: str, 
+        llm: Runnable, 
         tool_factory: IToolFactory,
-        model: str = "gpt-3.5-turbo"
+        circuit_breaker: CircuitBreaker | None = None,
+        answer_cache: ExpenseQueryCache | None = None,
+        stream_interval_in_seconds: float = 1.0,
+        max_iterations: int = 5,
+        max_tokens_per_message: int | None = None
     ):
-        self.llm = ChatOpenAI(
-            api_key=openai_api_key,
-            model=model,
-            temperature=0.1,
-        )
+        self.llm = llm
+        self.max_iterations = max_iterations
+        # No further agent step starts once a message used this many tokens
+        self.max_tokens_per_message = max_tokens_per_message
         self.tool_factory = tool_factory
+        self.circuit_breaker = circuit_breaker or CircuitBreaker("openai")
+        self.answer_cache = answer_cache
+        # Telegram throttles message edits, so partial answers go out at most this often
+        self.stream_interval_in_seconds = stream_interval_in_seconds
         self.logger = logging.getLogger(__name__)
+        self._agent_executor: AgentExecutor | None = None
+        self._agent_lock = asyncio.Lock()
 
-    async def process_message(self, message_text: str, user_id: int) -> ProcessingResult:
+    async def process_message(
+        self,
+        message_text: str,
+        user_id: int,
+        on_partial_response: PartialResponseCallback | None = None
+    ) -> ProcessingResult:
         """Process a message using LLM with tools."""
         try:
             self.logger.info("Processing message for user %s: %s", user_id, message_text)
             
-            # Create tools contextualized for this specific user
-            user_tools = self.tool_factory.create_tools_for_user(user_id)
-            
-            # Get available categories for system prompt (from the first tool that has categories)
-            categories = []
-            for tool in user_tools:
-                if hasattr(tool, 'categories_repository') and hasattr(tool.categories_repository, 'get_all_categories'):
-                    categories = await tool.categories_repository.get_all_categories()
-                    break
-            
-            # Get LangChain tools from our tool implementations
-            langchain_tools = [tool.get_langchain_tool() for tool in user_tools]
-            
-            # Create the system prompt
-            system_prompt = f"""You are a helpful expense tracking assistant. 
-
-Available expense categories: {', '.join(categories)}
+            # Repeated read-only questions are answered without the agent
+            answer_cache = self.answer_cache
+            if _RELATIVE_DATE_PATTERN.search(message_text):
+                answer_cache = None
+            answer_key = ("answer", " ".join(message_text.lower().split()))
+            if answer_cache is not None:
+                answer_version = answer_cache.version(user_id)
+                cached_answer = answer_cache.get(user_id, answer_key, kind="answer")
+                if cached_answer is not None:
+                    return ProcessingResult(
+                        success=True,
+                        response_text=cached_answer,
+                        summary_data=None,
+                    )
 
-Be conversational and friendly. When expenses are added successfully, acknowledge them positively. 
-When providing summaries, format them clearly with totals and categories.
-
-Use the available tools to help users track and query their expenses. The tools have detailed 
-descriptions that will guide you on when to use each one."""
+            agent_executor = await self._get_agent_executor()
 
-            # Create prompt template
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_prompt),
-                ("human", "{input}"),
-                MessagesPlaceholder(variable_name="agent_scratchpad"),
-            ])
-            
-            # Create agent
-            agent = create_openai_functions_agent(self.llm, langchain_tools, prompt)
-            agent_executor = AgentExecutor(agent=agent, tools=langchain_tools, verbose=True)
-            
-            # Execute the agent
-            result = await agent_executor.ainvoke({"input": message_text})
+            # Execute the agent on behalf of the user (fails fast while OpenAI is known to be down)
+            usage = LLMUsageTracker("agent", token_budget=self.max_tokens_per_message)
+            try:
+                with user_context(user_id):
+                    result = await self.circuit_breaker.call(
+                        self._run_agent, agent_executor, message_text, on_partial_response, usage
+                    )
+            finally:
+                self.logger.info("Agent usage for user %s: %s", user_id, usage.finish())
             response_text = result["output"]
+
+            if response_text == IGNORED_MESSAGE_OUTPUT:
+                return ProcessingResult(
+                    success=True,
+                    response_text="",
+                    summary_data=None,
+                    should_respond=False,
+                )
             
+            if answer_cache is not None and self._is_read_only(result["intermediate_steps"]):
+                answer_cache.set(user_id, answer_key, response_text, answer_version)
+
             return ProcessingResult(
                 success=True,
                 response_text=response_text,
                 summary_data=None,
             )
             
+        except CircuitOpenError:
+            # Let the job park the message instead of answering with an error
+            raise
+        except TokenBudgetExceededError as e:
+            self.logger.warning("Stopped agent for user %s: %s", user_id, e)
+            return ProcessingResult(
+                success=False,
+                response_text="Sorry, that request needs more work than I can do for one message. Please try a simpler or more specific one.",
+                summary_data=None,
+            )
         except Exception as e:
             self.logger.error("Error processing message: %s", e, exc_info=True)
             return ProcessingResult(
                 success=False,
                 response_text="Sorry, I encountered an error processing your message. Please try again.",
                 summary_data=None,
-            )
\ No newline at end of file
+            )
+
+    async def warm_up(self) -> None:
+        """Build the agent and its prompt prefix before the first message arrives."""
+        await self._get_agent_executor()
+
+    async def _run_agent(
+        self,
+        agent_executor: AgentExecutor,
+        message_text: str,
+        on_partial_response: PartialResponseCallback | None,
+        usage: LLMUsageTracker
+    ) -> dict[str, Any]:
+        """Run the agent, streaming the answer's text to `on_partial_response` if given."""
+        config = {"callbacks": [usage]}
+        if on_partial_response is None:
+            return await agent_executor.ainvoke({"input": message_text}, config=config)
+
+        result = None
+        answer_text = ""
+        last_sent_at = 0.0
+        async for event in agent_executor.astream_events(
+            {"input": message_text}, config=config, version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_start":
+                # Each agent step is a new generation; only the last one is the answer
+                answer_text = ""
+            elif kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if not content:
+                    # Function-call chunks carry no text
+                    continue
+                answer_text += content
+                now = time.monotonic()
+                if now - last_sent_at >= self.stream_interval_in_seconds:
+                    last_sent_at = now
+                    await on_partial_response(answer_text)
+            elif kind == "on_chain_end" and not event["parent_ids"]:
+                result = event["data"]["output"]
+
+        if result is None:
+            raise RuntimeError("Agent stream ended without a result")
+        return result
+
+    async def _get_agent_executor(self) -> AgentExecutor:
+        """Build the agent on first use; it is shared by all messages and users."""
+        if self._agent_executor is not None:
+            return self._agent_executor
+
+        async with self._agent_lock:
+            if self._agent_executor is None:
+                self._agent_executor = await self._build_agent_executor()
+        return self._agent_executor
+
+    async def _build_agent_executor(self) -> AgentExecutor:
+        """Create the tools, system prompt and agent."""
+        tools = self.tool_factory.create_tools()
+
+        # Get available categories for system prompt (from the first tool that has categories)
+        categories = []
+        for tool in tools:
+            if hasattr(tool, 'categories_repository') and hasattr(tool.categories_repository, 'get_all_categories'):
+                categories = await tool.categories_repository.get_all_categories()
+                break
+
+        # Get LangChain tools from our tool implementations
+        langchain_tools = [tool.get_langchain_tool() for tool in tools]
+
+        # Built once and sent first on every call: OpenAI caches the longest prompt prefix
+        # it has seen (tool schemas, then this), so it must stay byte-for-byte identical
+        system_prompt = SYSTEM_PROMPT_TEMPLATE.format(categories=", ".join(categories))
+        if any(tool.name == IGNORE_MESSAGE_TOOL_NAME for tool in langchain_tools):
+            system_prompt += IGNORE_MESSAGE_INSTRUCTIONS
+
+        # Create prompt template; everything per message comes after the system prompt.
+        # A SystemMessage is sent verbatim, never parsed as a template
+        prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=system_prompt),
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
+
+        # Create agent
+        agent = create_openai_functions_agent(self.llm, langchain_tools, prompt)
+        self.logger.info("Built expense agent with %d tools", len(langchain_tools))
+        return AgentExecutor(
+            agent=agent,
+            tools=langchain_tools,
+            verbose=True,
+            return_intermediate_steps=True,
+            max_iterations=self.max_iterations,
+        )
+
+    @staticmethod
+    def _is_read_only(intermediate_steps: list) -> bool:
+        """Whether the agent answered from read-only tool calls alone."""
+        return bool(intermediate_steps) and all(
+            action.tool in READ_ONLY_TOOLS for action, _ in intermediate_steps
+        )
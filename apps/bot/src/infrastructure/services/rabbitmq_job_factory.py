@@ -4,24 +4,53 @@ Mirrors the TypeScript implementation for consistency.
 """
 
 import asyncio
-import json
 import logging
 import math
 import time
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
 
 import aio_pika
-from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractQueue
+from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractExchange, AbstractQueue
 
 from config.settings import settings
 from domain.interfaces.job_factory import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
     Job,
     JobFactory,
     JobOptions,
     TaskHandlerArgs,
     TaskHandlerResult,
 )
+from infrastructure.metrics.job_metrics import (
+    JOB_BATCH_SIZE,
+    JOB_CONCURRENCY_LIMIT,
+    JOB_DEAD_LETTERED,
+    JOB_DELAYED,
+    JOB_HANDLER_LATENCY,
+    JOB_IN_FLIGHT,
+    JOB_MESSAGES_CONSUMED,
+    JOB_MESSAGES_PUBLISHED,
+    JOB_PUBLISH_LATENCY,
+    JOB_RESULTS,
+    JOB_RETRIES,
+)
 from infrastructure.providers.rabbitmq_provider import RabbitMQProvider
+from infrastructure.utils.adaptive_concurrency import (
+    AdaptiveConcurrencyController,
+    ConcurrencyLimiter,
+)
+from infrastructure.utils.message_codecs import (
+    MessageCodec,
+    fastest_json_codec,
+    get_decoder_for_content_type,
+    get_message_codec,
+)
+from infrastructure.utils.queue_utils import (
+    apply_full_jitter,
+    calculate_retry_delay_ms,
+)
 
 
 class RabbitMQMessage:
@@ -54,18 +83,54 @@ class RabbitMQMessage:
 class RabbitMQJobFactory(JobFactory):
     """RabbitMQ job factory that uses RabbitMQ for all queue operations."""
 
-    def __init__(self, batch_size: int = 10):
+    def __init__(self, batch_size: int = 10, publish_channel_count: int = 2):
         self.logger = logging.getLogger(__name__)
         self.batch_size = batch_size
+        # Consumer channels, one per queue
         self._channels: Dict[str, AbstractChannel] = {}
         self._workers: Dict[str, bool] = {}
-        self._worker_tasks: Dict[str, asyncio.Task] = {}
+        self._jobs: Dict[str, "RabbitMQJob"] = {}
+
+        # Topology is declared once per queue on a dedicated channel
+        self._topology_channel: Optional[AbstractChannel] = None
+        self._topology_lock = asyncio.Lock()
+        self._declared_queues: set[str] = set()
+
+        # Publish-only channels, kept apart from consumer flow control
+        self._publish_channels: list[Optional[AbstractChannel]] = [None] * max(1, publish_channel_count)
+        self._publish_exchanges: Dict[tuple[int, str], AbstractExchange] = {}
+        self._publish_lock = asyncio.Lock()
+        self._next_publish_channel = 0
         
         # RabbitMQ configuration
         self.exchange_name = "telegram_exchange"
         self.dlx_exchange_name = "telegram_dlx_exchange"
+        self.retry_exchange_name = "telegram_retry_exchange"
         self.max_retries = settings.queue_max_retries
-        self.prefetch_count = 10
+        self.retry_mode = settings.queue_retry_mode
+        self.codec_name = settings.queue_message_codec
+        # Fail at startup, not on the first publish, if the codec name is wrong
+        get_message_codec(self.codec_name)
+        # TTL queues at fractions of each backoff step; expired messages
+        # dead-letter back to the main exchange, so pending retries live on
+        # the broker. Jittered delays round up to the nearest of these, and
+        # the longest one is used for parked (delayed) messages
+        self.retry_jitter_steps = 4
+        self.retry_delays_ms = sorted(
+            {
+                math.ceil(calculate_retry_delay_ms(attempt) * step / self.retry_jitter_steps)
+                for attempt in range(1, max(self.max_retries, 2))
+                for step in range(1, self.retry_jitter_steps + 1)
+            }
+            | {settings.queue_max_park_delay_ms}
+        )
+        # Prefetch matches the default handler concurrency so the broker never
+        # hands a worker more unacked messages than it can process at once
+        self.prefetch_count = batch_size
+        self.adaptive_concurrency = settings.job_adaptive_concurrency
+        self.min_concurrency = settings.job_min_concurrency
+        self.max_concurrency = settings.job_max_concurrency
+        self.drain_timeout_in_seconds = settings.job_drain_timeout_seconds
 
         self.logger.info("RabbitMQ job factory initialized")
 
@@ -73,13 +138,22 @@ class RabbitMQJobFactory(JobFactory):
         """Create a job with the given options."""
         self.logger.info(f"RabbitMQJobFactory - Creating job '{options.name}'")
 
-        return RabbitMQJob(
+        job = RabbitMQJob(
             job_factory=self,
             options=options,
         )
+        self._jobs[options.name] = job
+        return job
+
+    async def _get_consumer_channel(
+        self,
+        queue_name: str,
+        prefetch_count: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> AbstractChannel:
+        """Get or create the consumer channel for the given queue."""
+        await self._ensure_topology(queue_name, max_priority)
 
-    async def _get_channel(self, queue_name: str) -> AbstractChannel:
-        """Get or create a channel for the given queue."""
         if queue_name in self._channels:
             channel = self._channels[queue_name]
             if not channel.is_closed:
@@ -87,44 +161,134 @@ class RabbitMQJobFactory(JobFactory):
 
         connection = await RabbitMQProvider.get_connection()
         channel = await connection.channel()
-        
+
+        # Set QoS
+        await channel.set_qos(prefetch_count=prefetch_count or self.prefetch_count)
+
+        self._channels[queue_name] = channel
+        self.logger.info(f"Created consumer channel for queue: {queue_name}")
+
+        return channel
+
+    async def _get_publish_exchange(self, exchange_name: str) -> AbstractExchange:
+        """Get an exchange handle on the next publish channel of the pool."""
+        index = self._next_publish_channel
+        self._next_publish_channel = (index + 1) % len(self._publish_channels)
+
+        channel = self._publish_channels[index]
+        if channel is None or channel.is_closed:
+            async with self._publish_lock:
+                channel = self._publish_channels[index]
+                if channel is None or channel.is_closed:
+                    connection = await RabbitMQProvider.get_connection()
+                    channel = await connection.channel(publisher_confirms=True)
+                    self._publish_channels[index] = channel
+                    # Handles bound to the previous channel are no longer usable
+                    for key in [key for key in self._publish_exchanges if key[0] == index]:
+                        del self._publish_exchanges[key]
+                    self.logger.info(f"Created publish channel {index}")
+
+        exchange = self._publish_exchanges.get((index, exchange_name))
+        if exchange is None:
+            # Topology is already declared, so skip the passive declare round-trip
+            exchange = await channel.get_exchange(exchange_name, ensure=False)
+            self._publish_exchanges[(index, exchange_name)] = exchange
+
+        return exchange
+
+    async def _ensure_topology(self, queue_name: str, max_priority: Optional[int] = None) -> None:
+        """Declare exchanges, the queue, its DLQ and retry queues once."""
+        if queue_name in self._declared_queues:
+            return
+
+        async with self._topology_lock:
+            if queue_name in self._declared_queues:
+                return
+
+            channel = await self._get_topology_channel()
+
+            # Declare main queue with DLX configuration
+            arguments = {
+                "x-dead-letter-exchange": self.dlx_exchange_name,
+                "x-dead-letter-routing-key": f"{queue_name}.dlq"
+            }
+            if max_priority:
+                # Must match every other declaration of the queue (e.g. the connector's)
+                arguments["x-max-priority"] = max_priority
+            main_queue = await channel.declare_queue(
+                queue_name,
+                durable=True,
+                arguments=arguments
+            )
+
+            # Declare dead letter queue
+            dlq_name = f"{queue_name}.dlq"
+            dlq = await channel.declare_queue(dlq_name, durable=True)
+
+            # Bind queues to exchanges
+            await main_queue.bind(self.exchange_name, routing_key=queue_name)
+            await dlq.bind(self.dlx_exchange_name, routing_key=dlq_name)
+
+            if self.retry_mode == "broker":
+                await self._declare_retry_queues(channel, queue_name)
+
+            self._declared_queues.add(queue_name)
+            self.logger.info(f"Declared topology for queue: {queue_name}")
+
+    async def _get_topology_channel(self) -> AbstractChannel:
+        """Get or create the channel used for declarations, declaring the exchanges on creation."""
+        if self._topology_channel is not None and not self._topology_channel.is_closed:
+            return self._topology_channel
+
+        connection = await RabbitMQProvider.get_connection()
+        channel = await connection.channel()
+
         # Declare exchanges
-        main_exchange = await channel.declare_exchange(
+        await channel.declare_exchange(
             self.exchange_name, 
             aio_pika.ExchangeType.DIRECT, 
             durable=True
         )
-        dlx_exchange = await channel.declare_exchange(
+        await channel.declare_exchange(
             self.dlx_exchange_name, 
             aio_pika.ExchangeType.DIRECT, 
             durable=True
         )
+        if self.retry_mode == "broker":
+            await channel.declare_exchange(
+                self.retry_exchange_name,
+                aio_pika.ExchangeType.DIRECT,
+                durable=True
+            )
 
-        # Declare main queue with DLX configuration
-        main_queue = await channel.declare_queue(
-            queue_name,
-            durable=True,
-            arguments={
-                "x-dead-letter-exchange": self.dlx_exchange_name,
-                "x-dead-letter-routing-key": f"{queue_name}.dlq"
-            }
-        )
-
-        # Declare dead letter queue
-        dlq_name = f"{queue_name}.dlq"
-        dlq = await channel.declare_queue(dlq_name, durable=True)
+        self._topology_channel = channel
+        return channel
 
-        # Bind queues to exchanges
-        await main_queue.bind(main_exchange, routing_key=queue_name)
-        await dlq.bind(dlx_exchange, routing_key=dlq_name)
+    async def _declare_retry_queues(self, channel: AbstractChannel, queue_name: str) -> None:
+        """Declare the delayed-retry queues that feed back into `queue_name`."""
+        for delay_ms in self.retry_delays_ms:
+            retry_queue_name = self._retry_queue_name(queue_name, delay_ms)
+            retry_queue = await channel.declare_queue(
+                retry_queue_name,
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay_ms,
+                    "x-dead-letter-exchange": self.exchange_name,
+                    "x-dead-letter-routing-key": queue_name
+                }
+            )
+            await retry_queue.bind(self.retry_exchange_name, routing_key=retry_queue_name)
 
-        # Set QoS
-        await channel.set_qos(prefetch_count=self.prefetch_count)
+    def _retry_queue_name(self, queue_name: str, delay_ms: int) -> str:
+        """Name of the retry queue holding messages for `delay_ms`."""
+        return f"{queue_name}.retry.{delay_ms}"
 
-        self._channels[queue_name] = channel
-        self.logger.info(f"Created and configured channel for queue: {queue_name}")
-
-        return channel
+    def _retry_delay_tier(self, delay_ms: int) -> int:
+        """Smallest declared retry delay covering `delay_ms`."""
+        for tier in self.retry_delays_ms:
+            if tier >= delay_ms:
+                return tier
+        return self.retry_delays_ms[-1]
 
     def _generate_message_id(self) -> str:
         """Generate a unique message ID."""
@@ -138,31 +302,33 @@ class RabbitMQJobFactory(JobFactory):
         """Clean up all resources."""
         self.logger.info("Shutting down RabbitMQ channels and workers")
         
-        # Stop all workers
-        for queue_name in list(self._workers.keys()):
-            self._workers[queue_name] = False
-            
-        # Cancel all worker tasks
-        for task in self._worker_tasks.values():
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        # Drain all workers while channels are still open, so in-flight
+        # handlers can ack and publish their responses
+        await asyncio.gather(
+            *(job.turn_off() for job in self._jobs.values()), return_exceptions=True
+        )
 
         # Close all channels
-        for queue_name, channel in self._channels.items():
+        channels = {
+            **{f"queue {queue_name}": channel for queue_name, channel in self._channels.items()},
+            **{f"publish {index}": channel for index, channel in enumerate(self._publish_channels) if channel},
+        }
+        if self._topology_channel:
+            channels["topology"] = self._topology_channel
+
+        for name, channel in channels.items():
             try:
                 if not channel.is_closed:
                     await channel.close()
-                    self.logger.info(f"Closed channel for queue: {queue_name}")
+                    self.logger.info(f"Closed {name} channel")
             except Exception as error:
-                self.logger.warning(f"Error closing channel for queue {queue_name}: {error}")
+                self.logger.warning(f"Error closing {name} channel: {error}")
         
         self._channels.clear()
+        self._publish_channels = [None] * len(self._publish_channels)
+        self._publish_exchanges.clear()
+        self._topology_channel = None
         self._workers.clear()
-        self._worker_tasks.clear()
 
 
 class RabbitMQJob(Job):
@@ -172,29 +338,52 @@ class RabbitMQJob(Job):
         self.job_factory = job_factory
         self.options = options
         self.logger = logging.getLogger(__name__)
-
-    async def schedule_task(self, data: Any) -> None:
-        """Schedule a task with the given data."""
-        try:
-            channel = await self.job_factory._get_channel(self.options.name)
-            
-            message = RabbitMQMessage(
-                msg_id=self.job_factory._generate_message_id(),
-                data=data,
-                attempts=0,
-                max_retries=self.job_factory.max_retries
-            )
-
-            message_body = aio_pika.Message(
-                json.dumps(message.to_dict()).encode(),
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+        self.concurrency = max(1, options.concurrency or job_factory.batch_size)
+        self.codec = self._resolve_codec(options, job_factory.codec_name)
+        # Handler tasks; shutdown waits for these to finish
+        self._in_flight: set[asyncio.Task] = set()
+        self._pending_retries: set[asyncio.Task] = set()
+        self._channel: Optional[AbstractChannel] = None
+        self._queue: Optional[AbstractQueue] = None
+        self._consumer_tag: Optional[str] = None
+        # Serializes consumer swaps (prefetch changes) with cancelling the consumer
+        self._consumer_lock = asyncio.Lock()
+        self._backlog: asyncio.Queue = asyncio.Queue()
+        # Keyed jobs: messages not started yet, per ordering key (a key stays
+        # here while any of its messages is unfinished), and the keys whose
+        # next message may start because none of theirs is running
+        self._key_queues: Dict[Any, deque] = {}
+        self._ready_keys: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # With adaptive concurrency the limit moves between the configured bounds;
+        # `concurrency` is then only the starting point
+        self._controller: Optional[AdaptiveConcurrencyController] = None
+        if job_factory.adaptive_concurrency:
+            self._controller = AdaptiveConcurrencyController(
+                initial_limit=self.concurrency,
+                min_limit=job_factory.min_concurrency,
+                max_limit=job_factory.max_concurrency,
             )
+        self._limiter = ConcurrencyLimiter(
+            self._controller.limit if self._controller else self.concurrency
+        )
+        # Reserved slots so high-priority messages never wait behind the main backlog
+        self._fast_limiter: Optional[ConcurrencyLimiter] = None
+        if options.max_priority and options.fast_lane_concurrency > 0:
+            self._fast_limiter = ConcurrencyLimiter(options.fast_lane_concurrency)
 
-            exchange = await channel.get_exchange(self.job_factory.exchange_name)
+    async def schedule_task(self, data: Any, priority: Optional[int] = None) -> None:
+        """Schedule a task with the given data and optional priority."""
+        try:
+            started_at = time.monotonic()
+            exchange = await self._get_exchange()
             await exchange.publish(
-                message_body,
+                self._build_message(data, priority),
                 routing_key=self.options.name
             )
+            JOB_PUBLISH_LATENCY.labels(job=self.options.name).observe(time.monotonic() - started_at)
+            JOB_MESSAGES_PUBLISHED.labels(job=self.options.name).inc()
 
             self.logger.info(f"RabbitMQJobFactory - Scheduled task for job '{self.options.name}'")
 
@@ -202,6 +391,52 @@ class RabbitMQJob(Job):
             self.logger.error(f"Failed to send message to queue {self.options.name}: {e}")
             raise
 
+    async def _get_exchange(self) -> AbstractExchange:
+        """Get a cached handle to the main exchange on a publish channel."""
+        await self.job_factory._ensure_topology(self.options.name, self.options.max_priority)
+        return await self.job_factory._get_publish_exchange(self.job_factory.exchange_name)
+
+    def _build_message(self, data: Any, priority: Optional[int] = None) -> aio_pika.Message:
+        """Wrap task data into a persistent AMQP message."""
+        message = RabbitMQMessage(
+            msg_id=self.job_factory._generate_message_id(),
+            data=data,
+            attempts=0,
+            max_retries=self.job_factory.max_retries
+        )
+
+        return self._encode_message(message, priority)
+
+    def _resolve_codec(self, options: JobOptions, default_codec_name: str) -> MessageCodec:
+        """Pick the job codec; queues read by the connector always get JSON."""
+        codec = get_message_codec(options.codec or default_codec_name)
+        if not options.external_consumer or codec.json_compatible:
+            return codec
+
+        if options.codec:
+            raise ValueError(
+                f"Queue {options.name} is consumed outside the bot, which only reads JSON; "
+                f"codec {options.codec} is not allowed"
+            )
+
+        json_codec = fastest_json_codec()
+        self.logger.info(
+            f"Queue {options.name} is consumed outside the bot, "
+            f"using the {json_codec.name} codec instead of {codec.name}"
+        )
+        return json_codec
+
+    def _encode_message(
+        self, message_content: RabbitMQMessage, priority: Optional[int] = None
+    ) -> aio_pika.Message:
+        """Encode a message with the job codec, advertising it in content_type."""
+        return aio_pika.Message(
+            self.codec.encode(message_content.to_dict()),
+            content_type=self.codec.content_type,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            priority=priority
+        )
+
     async def turn_on(self) -> None:
         """Start the job worker."""
         if self.job_factory._workers.get(self.options.name, False):
@@ -211,102 +446,481 @@ class RabbitMQJob(Job):
         await self._create_worker()
 
     async def turn_off(self) -> None:
-        """Stop the job worker."""
+        """Stop consuming and let in-flight handlers finish before returning."""
+        if not self.job_factory._workers.get(self.options.name, False):
+            return
+
         self.logger.info(f"RabbitMQJobFactory - Turning off worker for job '{self.options.name}'")
         self.job_factory._workers[self.options.name] = False
+        deadline = time.monotonic() + self.job_factory.drain_timeout_in_seconds
 
-        # Cancel the worker task
-        if self.options.name in self.job_factory._worker_tasks:
-            task = self.job_factory._worker_tasks[self.options.name]
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-            del self.job_factory._worker_tasks[self.options.name]
+        # basic.cancel first, so nothing new is delivered while draining
+        await self._cancel_consumer()
+
+        # Messages no handler has started on go straight back to the broker
+        await self._stop_dispatching()
+
+        # Handlers that miss the deadline are cancelled, which requeues their message
+        if self._in_flight:
+            self.logger.info(
+                f"RabbitMQJobFactory - Draining {len(self._in_flight)} in-flight tasks for job '{self.options.name}'"
+            )
+            _, pending = await asyncio.wait(
+                set(self._in_flight), timeout=max(0.0, deadline - time.monotonic())
+            )
+            if pending:
+                self.logger.warning(
+                    f"RabbitMQJobFactory - {len(pending)} tasks of job '{self.options.name}' did not finish in time, requeueing"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # Publish in-process retries now instead of dropping them
+        for task in list(self._pending_retries):
+            task.cancel()
+        await asyncio.gather(*self._pending_retries, return_exceptions=True)
+
+        self.logger.info(f"RabbitMQJobFactory - Worker drained for job '{self.options.name}'")
 
     async def _create_worker(self) -> None:
         """Create and start the worker."""
-        if not self.options.handler:
+        if not self.options.handler and not self.options.batch_handler:
             self.logger.info(f"RabbitMQJobFactory - No handler for job '{self.options.name}'")
             return
 
         self.logger.info(f"RabbitMQJobFactory - Starting worker for job '{self.options.name}'. QueueName: {self.options.name}")
         
-        channel = await self.job_factory._get_channel(self.options.name)
+        # Keep prefetch in line with the number of handlers allowed in flight
+        channel = await self.job_factory._get_consumer_channel(
+            self.options.name,
+            prefetch_count=self._prefetch_count(self._limiter.limit),
+            max_priority=self.options.max_priority,
+        )
+        self._channel = channel
+        JOB_CONCURRENCY_LIMIT.labels(job=self.options.name).set(self._limiter.limit)
         
         # Set this worker as active
         self.job_factory._workers[self.options.name] = True
 
-        # Create worker task
-        worker_task = asyncio.create_task(self._worker_loop(channel))
-        self.job_factory._worker_tasks[self.options.name] = worker_task
+        self._start_dispatching()
+
+        # Start consuming; keep the consumer tag so shutdown can basic.cancel it
+        self._queue = await channel.get_queue(self.options.name, ensure=False)
+        self._consumer_tag = await self._queue.consume(self._on_message)
+
+        self.logger.info(
+            f"RabbitMQJobFactory - Worker started for queue: {self.options.name} (concurrency: {self._limiter.limit})"
+        )
+
+    async def _on_message(self, message: aio_pika.IncomingMessage) -> None:
+        """Route a delivery without waiting for a handler slot.
+
+        Keyed messages queue up behind the unfinished messages of their key.
+        Other high-priority messages go straight to the fast lane, the rest
+        queue up in the backlog for the dispatcher.
+        """
+        if not self.job_factory._workers.get(self.options.name, False):
+            # Delivered while the consumer was being cancelled
+            await self._requeue(message)
+            return
+
+        JOB_MESSAGES_CONSUMED.labels(job=self.options.name).inc()
+
+        message_content = await self._decode_message(message)
+        if message_content is None:
+            return
+
+        if self.options.partition_key:
+            self._enqueue_keyed(message, message_content)
+            return
 
-        self.logger.info(f"RabbitMQJobFactory - Worker started for queue: {self.options.name}")
+        if self._is_high_priority(message, message_content) and self._fast_limiter.try_acquire():
+            self._start_handler([(message, message_content)], self._fast_limiter)
+            return
 
-    async def _worker_loop(self, channel: AbstractChannel) -> None:
-        """Worker loop that processes messages."""
+        self._backlog.put_nowait((message, message_content))
+
+    def _start_dispatching(self) -> None:
+        """Start the dispatcher handing queued messages to handlers."""
+        if self.options.partition_key:
+            self._dispatcher = asyncio.create_task(self._dispatch_keyed_loop())
+        else:
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self) -> None:
+        """Hand backlog messages to handlers as slots of the main limiter free up."""
+        while True:
+            message, message_content = await self._backlog.get()
+
+            # Backpressure: wait for a free slot before taking on more work
+            try:
+                await self._limiter.acquire()
+            except asyncio.CancelledError:
+                await self._requeue(message)
+                raise
+
+            batch = [(message, message_content)]
+            if self.options.batch_handler:
+                await self._collect_batch(batch, self._backlog)
+
+            self._start_handler(batch, self._limiter)
+
+    def _enqueue_keyed(self, message: aio_pika.IncomingMessage, message_content: RabbitMQMessage) -> None:
+        """Queue a message behind the unfinished messages of its key."""
+        key = self._partition_key_for(message_content)
+        queue = self._key_queues.get(key)
+        if queue is None:
+            # Nothing of this key is queued or running: it can start right away
+            self._key_queues[key] = deque([(message, message_content)])
+            self._start_key(key)
+        else:
+            queue.append((message, message_content))
+
+    def _start_key(self, key: Any) -> None:
+        """Start a key's next message on the fast lane if it's high priority, else mark the key ready.
+
+        The fast lane only ever gets a message once every earlier message of
+        its key has finished, so it never overtakes them (e.g. a message sent
+        right after a registration password waits for the registration).
+        """
+        message, message_content = self._key_queues[key][0]
+        if self._is_high_priority(message, message_content) and self._fast_limiter.try_acquire():
+            self._start_handler([self._key_queues[key].popleft()], self._fast_limiter, keys=[key])
+        else:
+            self._ready_keys.put_nowait(key)
+
+    async def _dispatch_keyed_loop(self) -> None:
+        """Start the next message of each ready key as slots of the main limiter free up.
+
+        A slot is taken only when a message starts, so messages waiting behind
+        a busy key hold none and never keep other keys from running. Keys take
+        turns: a key is ready again only after its running message finished,
+        behind every key that became ready meanwhile.
+        """
+        while True:
+            key = await self._ready_keys.get()
+            # Unstarted messages stay in their key's queue, which shutdown requeues
+            await self._limiter.acquire()
+
+            batch = [self._key_queues[key].popleft()]
+            keys = [key]
+            if self.options.batch_handler:
+                # One message from each of several ready keys: the batch mixes
+                # users while every key still runs one message at a time
+                await self._collect_batch(batch, self._ready_keys, keys)
+
+            self._start_handler(batch, self._limiter, keys=keys)
+
+    def _finish_key(self, key: Any) -> None:
+        """Make a key ready once its running message finished, or forget it if it has no more."""
+        queue = self._key_queues.get(key)
+        if queue is None:
+            # Dispatching stopped; its messages were requeued
+            return
+        if queue:
+            self._start_key(key)
+        else:
+            del self._key_queues[key]
+
+    async def _collect_batch(
+        self, batch: list, queue: asyncio.Queue, keys: Optional[list] = None
+    ) -> None:
+        """Add queued messages to `batch` until it is full or the batch window closes.
+
+        Each added message takes a slot of the main limiter, and collection
+        stops when none is free. With `keys`, `queue` holds ready keys: each
+        one taken adds its next message and is appended to `keys`.
+        """
+        deadline = time.monotonic() + self.options.batch_window_ms / 1000
         try:
-            queue = await channel.get_queue(self.options.name)
-            
-            async with queue.iterator() as queue_iter:
-                async for message in queue_iter:
-                    if not self.job_factory._workers.get(self.options.name, False):
-                        break
-
-                    try:
-                        message_content = RabbitMQMessage.from_dict(
-                            json.loads(message.body.decode())
-                        )
-                        
-                        self.logger.debug(
-                            f"RabbitMQJobFactory - Processing job '{self.options.name}' with id {message_content.msg_id}"
-                        )
-
-                        result = await self.options.handler(
-                            TaskHandlerArgs(data=message_content.data)
-                        )
-
-                        # Handle result based on status
-                        if result.status == "error":
-                            self.logger.error(
-                                f"RabbitMQJobFactory - Job failed '{self.options.name}' with id {message_content.msg_id}: {result.result_message}"
-                            )
-                            await self._handle_failed_message(channel, message, message_content)
-                        elif result.status == "cancelled":
-                            self.logger.info(
-                                f"RabbitMQJobFactory - Job cancelled '{self.options.name}' with id {message_content.msg_id}"
-                            )
-                            await message.ack()
-                        else:
-                            # Success
-                            await message.ack()
-                            self.logger.info(
-                                f"RabbitMQJobFactory - Job completed '{self.options.name}' with id {message_content.msg_id}"
-                            )
-
-                    except Exception as error:
-                        self.logger.error(f"RabbitMQJobFactory - Error processing job '{self.options.name}': {error}")
-                        
-                        try:
-                            message_content = RabbitMQMessage.from_dict(
-                                json.loads(message.body.decode())
-                            )
-                            await self._handle_failed_message(channel, message, message_content)
-                        except Exception:
-                            # If we can't parse the message, just nack it
-                            message.nack(requeue=False)
+            while len(batch) < self.options.batch_max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if not self._limiter.try_acquire():
+                    return
 
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    self._limiter.release()
+                    return
+
+                if keys is not None:
+                    keys.append(item)
+                    item = self._key_queues[item].popleft()
+                batch.append(item)
         except asyncio.CancelledError:
-            self.logger.info(f"Worker for {self.options.name} was cancelled")
+            # Only reached while shutting down: nothing in the batch has started yet
+            for message, _ in batch:
+                self._limiter.release()
+                await self._requeue(message)
             raise
+
+    async def _cancel_consumer(self) -> None:
+        """Stop deliveries to this worker (basic.cancel)."""
+        async with self._consumer_lock:
+            if self._queue is None or self._consumer_tag is None:
+                return
+
+            try:
+                await self._queue.cancel(self._consumer_tag)
+            except Exception as error:
+                self.logger.warning(f"Failed to cancel consumer for {self.options.name}: {error}")
+            self._consumer_tag = None
+
+    async def _stop_dispatching(self) -> None:
+        """Stop the dispatcher and requeue every message that hasn't started."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+
+        while not self._backlog.empty():
+            message, _ = self._backlog.get_nowait()
+            await self._requeue(message)
+
+        # Running messages finish on their own; the rest go back to the broker
+        key_queues = list(self._key_queues.values())
+        self._key_queues.clear()
+        self._ready_keys = asyncio.Queue()
+        for queue in key_queues:
+            for message, _ in queue:
+                await self._requeue(message)
+
+    async def _requeue(self, message: aio_pika.IncomingMessage) -> None:
+        """Hand a message back to the broker untouched."""
+        try:
+            await message.nack(requeue=True)
+        except Exception as error:
+            self.logger.warning(f"Failed to requeue message for {self.options.name}: {error}")
+
+    def _start_handler(
+        self, batch: list, limiter: ConcurrencyLimiter, keys: Sequence[Any] = ()
+    ) -> None:
+        """Process messages in their own task, releasing their slots of `limiter`
+        and their ordering `keys` when done."""
+
+        def _on_task_done(task: asyncio.Task) -> None:
+            self._in_flight.discard(task)
+            for _ in batch:
+                limiter.release()
+            for key in keys:
+                self._finish_key(key)
+
+        task = asyncio.create_task(self._process_messages(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(_on_task_done)
+
+    def _prefetch_count(self, limit: int) -> int:
+        """Prefetch for a handler limit, leaving room for the fast lane.
+
+        Keyed jobs get as much again for messages waiting behind their key,
+        which hold no handler slot: a user with a long backlog then doesn't use
+        up the prefetch and stall other users' deliveries at the broker.
+        """
+        prefetch = limit * 2 if self.options.partition_key else limit
+        if self._fast_limiter is not None:
+            prefetch += self._fast_limiter.limit
+        return prefetch
+
+    def _is_high_priority(
+        self, message: aio_pika.IncomingMessage, message_content: RabbitMQMessage
+    ) -> bool:
+        """Whether a delivery may take the fast lane."""
+        return (
+            self._fast_limiter is not None
+            and self._priority_for(message, message_content) >= PRIORITY_HIGH
+        )
+
+    def _priority_for(
+        self, message: aio_pika.IncomingMessage, message_content: RabbitMQMessage
+    ) -> int:
+        """Priority of a delivery: the published one, else the job's resolver."""
+        if message.priority is not None:
+            return message.priority
+        if self.options.priority is None:
+            return PRIORITY_NORMAL
+        try:
+            return self.options.priority(message_content.data)
         except Exception as error:
-            self.logger.error(f"Error in worker loop for {self.options.name}: {error}")
+            self.logger.warning(
+                f"RabbitMQJobFactory - Could not resolve priority for job '{self.options.name}' with id {message_content.msg_id}: {error}"
+            )
+            return PRIORITY_NORMAL
+
+    def _partition_key_for(self, message_content: RabbitMQMessage) -> Any:
+        """Extract the ordering key of a message, or None if it has none."""
+        try:
+            return self.options.partition_key(message_content.data)
+        except Exception:
+            self.logger.warning(
+                f"RabbitMQJobFactory - No partition key for job '{self.options.name}' with id {message_content.msg_id}"
+            )
+            return None
+
+    async def _decode_message(
+        self, message: aio_pika.IncomingMessage
+    ) -> Optional[RabbitMQMessage]:
+        """Decode a delivery, dead-lettering it if it can't be parsed."""
+        try:
+            codec = get_decoder_for_content_type(message.content_type)
+            return RabbitMQMessage.from_dict(codec.decode(message.body))
+        except Exception as error:
+            self.logger.error(f"RabbitMQJobFactory - Unparseable message for job '{self.options.name}': {error}")
+            # If we can't parse the message, just nack it
+            await message.nack(requeue=False)
+            return None
+
+    async def _process_messages(self, batch: list) -> None:
+        """Run the handler for one message, or the batch handler for several,
+        then ack/retry each message independently."""
+        started_at = time.monotonic()
+        in_flight = JOB_IN_FLIGHT.labels(job=self.options.name)
+        in_flight.inc(len(batch))
+        try:
+            for _, message_content in batch:
+                self.logger.debug(
+                    f"RabbitMQJobFactory - Processing job '{self.options.name}' with id {message_content.msg_id}"
+                )
+
+            results = await self._run_handler([message_content for _, message_content in batch])
+
+        except asyncio.CancelledError:
+            # Worker is shutting down: hand the messages back to the broker
+            in_flight.dec(len(batch))
+            for message, _ in batch:
+                await message.nack(requeue=True)
+            raise
+        except Exception as error:
+            self.logger.error(f"RabbitMQJobFactory - Error processing job '{self.options.name}': {error}")
+            results = [None] * len(batch)
+
+        latency = time.monotonic() - started_at
+        in_flight.dec(len(batch))
+
+        for (message, message_content), result in zip(batch, results):
+            status = await self._resolve_result(message, message_content, result)
+            JOB_HANDLER_LATENCY.labels(job=self.options.name).observe(latency)
+            JOB_RESULTS.labels(job=self.options.name, status=status).inc()
+            await self._record_outcome(latency, status in ("success", "cancelled"))
+
+    async def _run_handler(
+        self, message_contents: list[RabbitMQMessage]
+    ) -> list[TaskHandlerResult]:
+        """Call the job's handler, or its batch handler, returning one result per message."""
+        if not self.options.batch_handler:
+            return [await self.options.handler(TaskHandlerArgs(data=message_contents[0].data))]
+
+        JOB_BATCH_SIZE.labels(job=self.options.name).observe(len(message_contents))
+        results = await self.options.batch_handler(
+            [TaskHandlerArgs(data=message_content.data) for message_content in message_contents]
+        )
+        if len(results) != len(message_contents):
+            raise ValueError(
+                f"Batch handler returned {len(results)} results for {len(message_contents)} messages"
+            )
+        return results
+
+    async def _resolve_result(
+        self,
+        message: aio_pika.IncomingMessage,
+        message_content: RabbitMQMessage,
+        result: Optional[TaskHandlerResult],
+    ) -> str:
+        """Ack or retry a message from its handler result; None means the handler raised."""
+        try:
+            # Handle result based on status
+            if result is None or result.status == "error":
+                if result is not None:
+                    self.logger.error(
+                        f"RabbitMQJobFactory - Job failed '{self.options.name}' with id {message_content.msg_id}: {result.result_message}"
+                    )
+                await self._handle_failed_message(message, message_content)
+                return "error"
+
+            if result.status == "cancelled":
+                self.logger.info(
+                    f"RabbitMQJobFactory - Job cancelled '{self.options.name}' with id {message_content.msg_id}"
+                )
+                await message.ack()
+                return "cancelled"
+
+            if result.status == "delayed":
+                # Parked, e.g. while an upstream is down: doesn't use up an attempt
+                delay_ms = await self._schedule_retry(
+                    message, message_content, result.retry_after_ms or 0
+                )
+                await message.ack()
+                JOB_DELAYED.labels(job=self.options.name).inc()
+                self.logger.info(
+                    f"RabbitMQJobFactory - Job delayed '{self.options.name}' with id {message_content.msg_id} for {delay_ms / 1000}s: {result.result_message}"
+                )
+                return "delayed"
+
+            # Success
+            await message.ack()
+            self.logger.info(
+                f"RabbitMQJobFactory - Job completed '{self.options.name}' with id {message_content.msg_id}"
+            )
+            return "success"
+
+        except Exception as error:
+            self.logger.error(
+                f"RabbitMQJobFactory - Error resolving job '{self.options.name}' with id {message_content.msg_id}: {error}"
+            )
+            try:
+                await message.nack(requeue=False)
+            except Exception as nack_error:
+                self.logger.warning(f"Failed to nack message for {self.options.name}: {nack_error}")
+            return "error"
+
+    async def _record_outcome(self, latency_in_seconds: float, succeeded: bool) -> None:
+        """Feed a handler outcome to the adaptive controller and apply its decision."""
+        if self._controller is None:
+            return
+
+        new_limit = self._controller.record(latency_in_seconds, succeeded)
+        if new_limit is None:
+            return
+
+        self.logger.info(
+            f"RabbitMQJobFactory - Adjusting concurrency for job '{self.options.name}' to {new_limit}"
+        )
+        self._limiter.set_limit(new_limit)
+        JOB_CONCURRENCY_LIMIT.labels(job=self.options.name).set(new_limit)
+        await self._update_prefetch(new_limit)
+
+    async def _update_prefetch(self, limit: int) -> None:
+        """Apply the prefetch for a new handler limit by re-consuming the queue.
+
+        basic.qos only applies to consumers started after it, so a consumer
+        with the new prefetch is started before the old one is cancelled.
+        Messages the old consumer delivered stay on the channel and are acked
+        as usual.
+        """
+        async with self._consumer_lock:
+            if self._queue is None or self._consumer_tag is None:
+                return
+            if self._channel is None or self._channel.is_closed:
+                return
+
+            try:
+                await self._channel.set_qos(prefetch_count=self._prefetch_count(limit))
+                consumer_tag = await self._queue.consume(self._on_message)
+            except Exception as error:
+                self.logger.warning(f"Failed to update prefetch for {self.options.name}: {error}")
+                return
+
+            previous_consumer_tag, self._consumer_tag = self._consumer_tag, consumer_tag
+            try:
+                await self._queue.cancel(previous_consumer_tag)
+            except Exception as error:
+                self.logger.warning(f"Failed to cancel previous consumer for {self.options.name}: {error}")
 
     async def _handle_failed_message(
         self, 
-        channel: AbstractChannel, 
         message: aio_pika.IncomingMessage, 
         message_content: RabbitMQMessage
     ) -> None:
@@ -316,46 +930,74 @@ class RabbitMQJob(Job):
         if message_content.attempts >= message_content.max_retries:
             # Send to dead letter queue
             dlq_name = f"{self.options.name}.dlq"
-            dlx_exchange = await channel.get_exchange(self.job_factory.dlx_exchange_name)
+            dlx_exchange = await self.job_factory._get_publish_exchange(self.job_factory.dlx_exchange_name)
             
-            dlq_message = aio_pika.Message(
-                json.dumps(message_content.to_dict()).encode(),
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-            )
+            dlq_message = self._encode_message(message_content, message.priority)
             
             await dlx_exchange.publish(dlq_message, routing_key=dlq_name)
+            JOB_DEAD_LETTERED.labels(job=self.options.name).inc()
             
             self.logger.warning(
                 f"Message sent to DLQ after {message_content.attempts} attempts: {message_content.msg_id}"
             )
             await message.ack()
         else:
-            # Retry: republish the message with updated attempt count
-            exchange = await channel.get_exchange(self.job_factory.exchange_name)
-            
-            # Add delay before retry (exponential backoff)
-            delay = min(1000 * (2 ** (message_content.attempts - 1)), 30000) / 1000
-            
-            # Schedule retry
-            asyncio.create_task(self._retry_message(exchange, message_content, delay))
+            # Retry: republish the message with updated attempt count, with full
+            # jitter so messages that failed together don't retry together
+            delay_ms = await self._schedule_retry(
+                message,
+                message_content,
+                apply_full_jitter(calculate_retry_delay_ms(message_content.attempts))
+            )
             
             await message.ack()
+            JOB_RETRIES.labels(job=self.options.name).inc()
             self.logger.info(
-                f"Message will be retried in {delay}s (attempt {message_content.attempts}/{message_content.max_retries}): {message_content.msg_id}"
+                f"Message will be retried in {delay_ms / 1000}s (attempt {message_content.attempts}/{message_content.max_retries}): {message_content.msg_id}"
+            )
+
+    async def _schedule_retry(
+        self,
+        message: aio_pika.IncomingMessage,
+        message_content: RabbitMQMessage,
+        delay_ms: int
+    ) -> int:
+        """Republish a message after `delay_ms`; returns the delay actually used."""
+        if self.job_factory.retry_mode == "broker":
+            delay_ms = self.job_factory._retry_delay_tier(delay_ms)
+            retry_exchange = await self.job_factory._get_publish_exchange(self.job_factory.retry_exchange_name)
+
+            # Retry queues dead-letter back with the message's properties, priority included
+            retry_message = self._encode_message(message_content, message.priority)
+
+            await retry_exchange.publish(
+                retry_message,
+                routing_key=self.job_factory._retry_queue_name(self.options.name, delay_ms)
+            )
+        else:
+            # Schedule retry
+            retry_task = asyncio.create_task(
+                self._retry_message(message_content, delay_ms / 1000, message.priority)
             )
+            self._pending_retries.add(retry_task)
+            retry_task.add_done_callback(self._pending_retries.discard)
+
+        return delay_ms
 
     async def _retry_message(
         self, 
-        exchange: aio_pika.Exchange, 
         message_content: RabbitMQMessage, 
-        delay: float
+        delay: float,
+        priority: Optional[int] = None
     ) -> None:
         """Retry a message after a delay."""
-        await asyncio.sleep(delay)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Cancelled by a drain: publish right away rather than lose the retry
+            pass
         
-        retry_message = aio_pika.Message(
-            json.dumps(message_content.to_dict()).encode(),
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-        )
+        retry_message = self._encode_message(message_content, priority)
+        exchange = await self.job_factory._get_publish_exchange(self.job_factory.exchange_name)
         
         await exchange.publish(retry_message, routing_key=self.options.name)
@@ -0,0 +1,217 @@
+"""
+Rule-based expense parser that records terse expense entries without the LLM.
+"""
+
+import logging
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from domain.entities.expense import Expense
+from domain.entities.message import ParsedExpense, ProcessingResult
+from domain.interfaces.expense_parser import IExpenseParser, PartialResponseCallback
+from domain.interfaces.expense_repository import IExpenseRepository
+from infrastructure.metrics.llm_metrics import EXPENSE_FAST_PATH
+from infrastructure.repositories.fixed_expense_categories_repository import FIXED_EXPENSE_CATEGORIES
+
+# Words that point at one category; category names themselves are added below
+CATEGORY_KEYWORDS = {
+    # Food
+    "coffee": "Food", "latte": "Food", "tea": "Food", "breakfast": "Food", "lunch": "Food",
+    "dinner": "Food", "brunch": "Food", "snack": "Food", "snacks": "Food", "pizza": "Food",
+    "burger": "Food", "sushi": "Food", "groceries": "Food", "grocery": "Food",
+    "restaurant": "Food", "takeout": "Food", "bakery": "Food", "food": "Food",
+    # Transportation
+    "uber": "Transportation", "lyft": "Transportation", "taxi": "Transportation",
+    "cab": "Transportation", "gas": "Transportation", "fuel": "Transportation",
+    "petrol": "Transportation", "parking": "Transportation", "bus": "Transportation",
+    "train": "Transportation", "metro": "Transportation", "subway": "Transportation",
+    "toll": "Transportation", "flight": "Transportation",
+    # Housing
+    "rent": "Housing", "mortgage": "Housing",
+    # Utilities
+    "electricity": "Utilities", "internet": "Utilities", "wifi": "Utilities",
+    # Insurance
+    "insurance": "Insurance",
+    # Medical/Healthcare
+    "medical": "Medical/Healthcare", "healthcare": "Medical/Healthcare",
+    "doctor": "Medical/Healthcare", "dentist": "Medical/Healthcare",
+    "pharmacy": "Medical/Healthcare", "medicine": "Medical/Healthcare",
+    # Debt
+    "loan": "Debt",
+    # Education
+    "tuition": "Education", "books": "Education", "course": "Education",
+    # Entertainment
+    "movie": "Entertainment", "movies": "Entertainment", "cinema": "Entertainment",
+    "concert": "Entertainment", "netflix": "Entertainment", "spotify": "Entertainment",
+    "games": "Entertainment", "bar": "Entertainment", "drinks": "Entertainment",
+}
+
+# Words that don't settle the category on their own ("gas" is fuel or a utility
+# bill, "bar" a pub or a chocolate bar); entries with them go to the agent
+# unless they name the category explicitly
+AMBIGUOUS_KEYWORDS = {
+    "gas", "bill", "bills", "bar", "fee", "fees", "payment", "subscription",
+    "charge", "deposit", "tip", "card",
+}
+
+# Parses below this confidence are handed to the agent instead of recorded
+FAST_PATH_MIN_CONFIDENCE = 0.9
+# Confidence of a keyword guess made uncertain by an ambiguous word or several keywords
+_AMBIGUOUS_CONFIDENCE = 0.5
+
+# Words that turn an entry into a question or command the agent should handle
+_QUERY_WORDS = {
+    "how", "what", "when", "where", "why", "show", "list", "total", "last", "much", "many",
+    "summary", "delete", "remove", "cancel", "undo", "edit", "change", "budget", "not", "no",
+}
+
+_AMOUNT = r"\$?(?P<amount>\d{1,7}(?:\.\d{1,2})?)\s*(?:\$|dollars?|bucks?|usd)?"
+_WORD = r"[a-z][a-z'\-]*"
+
+# "<description> <amount> [category]", e.g. "coffee $5", "lunch 12.50 food",
+# optionally led by an expense verb: "paid uber 23"
+_ENTRY_PATTERN = re.compile(
+    rf"^(?:(?:spent|paid|bought)\s+(?:(?:on|for)\s+)?)?"
+    rf"(?P<description>{_WORD}(?:\s+{_WORD}){{0,2}})\s+{_AMOUNT}"
+    rf"(?:\s+(?P<category>[a-z/]+))?[\s!.]*$",
+    re.IGNORECASE,
+)
+
+
+class RuleBasedExpenseParser(IExpenseParser):
+    """
+    Records unambiguous "<item> <amount> [category]" entries directly and
+    hands every other message, including parses below `min_confidence`, to
+    the LLM-based parser.
+    """
+
+    def __init__(
+        self,
+        expense_repository: IExpenseRepository,
+        fallback_parser: IExpenseParser,
+        category_keywords: dict[str, str] | None = None,
+        min_confidence: float = FAST_PATH_MIN_CONFIDENCE,
+    ):
+        self.expense_repository = expense_repository
+        self.fallback_parser = fallback_parser
+        self.category_keywords = self._build_keyword_map(category_keywords or CATEGORY_KEYWORDS)
+        self.min_confidence = min_confidence
+        self.logger = logging.getLogger(__name__)
+
+    async def process_message(
+        self,
+        message_text: str,
+        user_id: int,
+        on_partial_response: PartialResponseCallback | None = None
+    ) -> ProcessingResult:
+        """Record the expense if the message is a confident match, else ask the fallback parser."""
+        parsed_expense = self.parse(message_text)
+        if parsed_expense is None or parsed_expense.confidence_score < self.min_confidence:
+            EXPENSE_FAST_PATH.labels(outcome="miss" if parsed_expense is None else "uncertain").inc()
+            return await self.fallback_parser.process_message(
+                message_text, user_id, on_partial_response
+            )
+
+        EXPENSE_FAST_PATH.labels(outcome="hit").inc()
+        self.logger.info(
+            "Fast path matched for user %s: %s %s (%s)",
+            user_id, parsed_expense.description, parsed_expense.amount, parsed_expense.category
+        )
+
+        try:
+            saved_expense = await self.expense_repository.create(
+                Expense(
+                    id=None,
+                    user_id=user_id,
+                    description=parsed_expense.description,
+                    amount=parsed_expense.amount,
+                    category=parsed_expense.category,
+                    added_at=datetime.utcnow(),
+                )
+            )
+        except Exception as e:
+            self.logger.error("Error adding expense: %s", e, exc_info=True)
+            return ProcessingResult(
+                success=False,
+                response_text="Sorry, I encountered an error processing your message. Please try again.",
+                summary_data=None,
+            )
+
+        return ProcessingResult(
+            success=True,
+            response_text=(
+                f"✅ Added {saved_expense.category} expense: "
+                f"{saved_expense.description} - ${saved_expense.amount}"
+            ),
+            summary_data=None,
+        )
+
+    async def warm_up(self) -> None:
+        """Warm up the fallback parser."""
+        await self.fallback_parser.warm_up()
+
+    def parse(self, message_text: str) -> ParsedExpense | None:
+        """
+        Parse a terse expense entry; returns None unless it has that shape and a
+        single category. Keyword guesses involving ambiguous words or several
+        keywords come back with a low confidence.
+        """
+        match = _ENTRY_PATTERN.match(message_text.strip())
+        if not match:
+            return None
+
+        description = " ".join(match.group("description").split())
+        words = description.lower().split()
+        if any(word in _QUERY_WORDS for word in words):
+            return None
+
+        try:
+            amount = Decimal(match.group("amount"))
+        except InvalidOperation:
+            return None
+        if amount <= 0:
+            return None
+
+        keyword_hits = [self.category_keywords[word] for word in words if word in self.category_keywords]
+
+        explicit_category = match.group("category")
+        confidence = 1.0
+        if explicit_category:
+            # A trailing word must name a category, otherwise the grammar guess is off
+            category = self.category_keywords.get(explicit_category.lower())
+            if category is None:
+                return None
+        elif len(set(keyword_hits)) == 1:
+            category = keyword_hits[0]
+            if len(keyword_hits) > 1 or any(word in AMBIGUOUS_KEYWORDS for word in words):
+                confidence = _AMBIGUOUS_CONFIDENCE
+        else:
+            # No keyword, or keywords from different categories
+            return None
+
+        return ParsedExpense(
+            description=description,
+            amount=amount,
+            category=category,
+            confidence_score=confidence,
+        )
+
+    @staticmethod
+    def _build_keyword_map(category_keywords: dict[str, str]) -> dict[str, str]:
+        """Lower-case the keywords, add the category names and check every target category exists."""
+        unknown_categories = set(category_keywords.values()) - set(FIXED_EXPENSE_CATEGORIES)
+        if unknown_categories:
+            raise ValueError(
+                f"Keywords map to unknown categories: {', '.join(sorted(unknown_categories))}"
+            )
+
+        keyword_map = {}
+        for category in FIXED_EXPENSE_CATEGORIES:
+            keyword_map[category.lower()] = category
+            for part in category.lower().split("/"):
+                keyword_map[part] = category
+        keyword_map.update(
+            (keyword.lower(), category) for keyword, category in category_keywords.items()
+        )
+        return keyword_map
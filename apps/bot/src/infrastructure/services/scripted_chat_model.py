@@ -0,0 +1,155 @@
+"""
+Scripted chat model that stands in for OpenAI in load tests and benchmarks.
+
+It answers without any network call, but speaks the same protocol as the
+real model: with functions bound (the agent) it emits OpenAI function calls
+derived from the message ("coffee $5" -> add_expense), then turns the tool
+result into the final answer; without functions (the classifier) it answers
+YES or NO. Latency is log-normal around a configurable median and a
+configurable share of calls fails with an OpenAI timeout error, all drawn
+from a seeded RNG so runs are reproducible.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from typing import Any
+
+import httpx
+import openai
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, FunctionMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from infrastructure.services.rule_based_expense_parser import CATEGORY_KEYWORDS
+from infrastructure.tools.add_expense_tool import ADD_EXPENSE_TOOL_NAME
+from infrastructure.tools.get_expenses_by_category_tool import GET_EXPENSES_BY_CATEGORY_TOOL_NAME
+from infrastructure.tools.get_recent_expenses_tool import GET_RECENT_EXPENSES_TOOL_NAME
+from infrastructure.tools.ignore_message_tool import IGNORE_MESSAGE_TOOL_NAME
+
+_AMOUNT_PATTERN = re.compile(r"\$?(\d+(?:\.\d{1,2})?)")
+_QUERY_PATTERN = re.compile(
+    r"\b(spent|spending|spend|expenses?|show|how much|summary|total|report)\b", re.IGNORECASE
+)
+_FAKE_REQUEST = httpx.Request("POST", "https://fake-llm.invalid/v1/chat/completions")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic offline chat model with configurable latency and errors."""
+
+    # Median latency of one call; the spread is the sigma of the log-normal distribution
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    # Share of calls that fail with openai.APITimeoutError
+    error_rate: float = 0.0
+    seed: int | None = None
+
+    _random: random.Random = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._next_latency())
+        return self._respond(messages, kwargs.get("functions"))
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._next_latency())
+        return self._respond(messages, kwargs.get("functions"))
+
+    def _next_latency(self) -> float:
+        """Draw this call's latency, or raise the drawn error."""
+        latency = self.latency_ms / 1000
+        if self.latency_sigma > 0:
+            latency *= math.exp(self._random.gauss(0, self.latency_sigma))
+        if self._random.random() < self.error_rate:
+            raise openai.APITimeoutError(request=_FAKE_REQUEST)
+        return latency
+
+    def _respond(self, messages: list[BaseMessage], functions: list[dict] | None) -> ChatResult:
+        last_message = messages[-1]
+        if isinstance(last_message, (FunctionMessage, ToolMessage)):
+            # A tool ran: its output is the answer
+            message = AIMessage(content=str(last_message.content))
+        else:
+            text = next(
+                (str(m.content) for m in reversed(messages) if isinstance(m, HumanMessage)), ""
+            )
+            if not functions:
+                message = AIMessage(content=self._classify(text))
+            else:
+                message = self._plan(text, {function["name"] for function in functions})
+
+        message.usage_metadata = self._usage(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _classify(text: str) -> str:
+        return "YES" if _AMOUNT_PATTERN.search(text) or _QUERY_PATTERN.search(text) else "NO"
+
+    @staticmethod
+    def _plan(text: str, function_names: set[str]) -> AIMessage:
+        """Pick the function call the real model would most likely make."""
+        lowered = text.lower()
+        words = re.findall(r"[a-z]+", lowered)
+        category = next((CATEGORY_KEYWORDS[word] for word in words if word in CATEGORY_KEYWORDS), None)
+        days = 1 if "today" in words else 7 if "week" in words else 30
+
+        name, arguments = None, {}
+        if _QUERY_PATTERN.search(text) and not re.search(r"\b(spent|paid|bought)\b.*\d", lowered):
+            if category and GET_EXPENSES_BY_CATEGORY_TOOL_NAME in function_names:
+                name, arguments = GET_EXPENSES_BY_CATEGORY_TOOL_NAME, {"category": category, "days": days}
+            elif GET_RECENT_EXPENSES_TOOL_NAME in function_names:
+                name, arguments = GET_RECENT_EXPENSES_TOOL_NAME, {"days": days}
+        elif (amount := _AMOUNT_PATTERN.search(text)) and ADD_EXPENSE_TOOL_NAME in function_names:
+            description = " ".join(
+                word for word in _AMOUNT_PATTERN.sub(" ", text).split()
+                if word.lower() not in ("spent", "paid", "bought", "on", "for", "dollars", "bucks")
+            ) or "expense"
+            name, arguments = ADD_EXPENSE_TOOL_NAME, {
+                "description": description,
+                "amount": float(amount.group(1)),
+                "category": category or "Other",
+            }
+        elif IGNORE_MESSAGE_TOOL_NAME in function_names:
+            name, arguments = IGNORE_MESSAGE_TOOL_NAME, {"reason": "not about expenses"}
+
+        if name is None:
+            return AIMessage(content="I can help you track expenses. Try something like 'coffee $5'.")
+        return AIMessage(
+            content="",
+            additional_kwargs={"function_call": {"name": name, "arguments": json.dumps(arguments)}},
+        )
+
+    @staticmethod
+    def _usage(messages: list[BaseMessage], message: AIMessage) -> dict[str, int]:
+        """Rough token counts (4 characters per token), so usage metrics stay meaningful."""
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = max(1, (len(str(message.content)) + len(json.dumps(message.additional_kwargs))) // 4)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
@@ -5,9 +5,11 @@ LangChain tools for expense processing.
 from .add_expense_tool import AddExpenseTool
 from .get_recent_expenses_tool import GetRecentExpensesTool
 from .get_expenses_by_category_tool import GetExpensesByCategoryTool
+from .ignore_message_tool import IgnoreMessageTool
 
 __all__ = [
     "AddExpenseTool",
     "GetRecentExpensesTool", 
     "GetExpensesByCategoryTool",
+    "IgnoreMessageTool",
 ]
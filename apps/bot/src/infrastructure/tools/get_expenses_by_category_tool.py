@@ -10,19 +10,13 @@ from pydantic import BaseModel, Field
 from domain.interfaces.expense_categories_repository import IExpenseCategoriesRepository
 from domain.interfaces.expense_repository import IExpenseRepository
 from domain.interfaces.expense_tool import IExpenseTool
+from infrastructure.tools.tool_context import get_current_user_id
+from infrastructure.utils.expense_query_cache import ExpenseQueryCache
 
 
-class GetExpensesByCategoryInput(BaseModel):
-    """Input schema for get_expenses_by_category tool."""
-    category: str = Field(description="Expense category to filter by")
-    days: int = Field(description="Number of days to look back", default=30)
-
+GET_EXPENSES_BY_CATEGORY_TOOL_NAME = "get_expenses_by_category"
 
-class GetExpensesByCategoryToolImpl(BaseTool):
-    """LangChain BaseTool implementation for getting expenses by category."""
-    
-    name: str = "get_expenses_by_category"
-    description: str = """Get expenses filtered by a specific category.
+GET_EXPENSES_BY_CATEGORY_TOOL_DESCRIPTION = """Get expenses filtered by a specific category.
 
 Use this tool when users ask about spending in a specific category:
 - Category-specific queries: 'how much on food?', 'transportation costs', 'housing expenses'
@@ -37,6 +31,19 @@ Examples:
 - 'how much on food this month?' → get_expenses_by_category(category='Food', days=30)
 - 'transportation costs last week' → get_expenses_by_category(category='Transportation', days=7)
 - 'entertainment spending' → get_expenses_by_category(category='Entertainment', days=30)"""
+
+
+class GetExpensesByCategoryInput(BaseModel):
+    """Input schema for get_expenses_by_category tool."""
+    category: str = Field(description="Expense category to filter by")
+    days: int = Field(description="Number of days to look back", default=30)
+
+
+class GetExpensesByCategoryToolImpl(BaseTool):
+    """LangChain BaseTool implementation for getting expenses by category."""
+    
+    name: str = GET_EXPENSES_BY_CATEGORY_TOOL_NAME
+    description: str = GET_EXPENSES_BY_CATEGORY_TOOL_DESCRIPTION
     
     args_schema: type[BaseModel] = GetExpensesByCategoryInput
     
@@ -44,13 +51,13 @@ Examples:
         self, 
         expense_repository: IExpenseRepository, 
         categories_repository: IExpenseCategoriesRepository,
-        user_id: int
+        query_cache: ExpenseQueryCache | None = None
     ):
         super().__init__()
         # Use object.__setattr__ to bypass Pydantic's field validation
         object.__setattr__(self, 'expense_repository', expense_repository)
         object.__setattr__(self, 'categories_repository', categories_repository)
-        object.__setattr__(self, 'user_id', user_id)
+        object.__setattr__(self, 'query_cache', query_cache)
     
     def _run(self, category: str, days: int = 30) -> str:
         """Synchronous run method (not used in async context)."""
@@ -64,38 +71,49 @@ Examples:
                 categories = await self.categories_repository.get_all_categories()
                 return f"Invalid category '{category}'. Must be one of: {', '.join(categories)}"
             
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=days)
-            
-            all_expenses = await self.expense_repository.find_by_user_id_and_date_range(
-                self.user_id, start_date, end_date
+            user_id = get_current_user_id()
+            if self.query_cache is None:
+                return await self._summarize_expenses(user_id, category, days)
+            return await self.query_cache.get_or_load(
+                user_id,
+                (self.name, category, days),
+                lambda: self._summarize_expenses(user_id, category, days)
             )
             
-            # Filter by category
-            expenses = [e for e in all_expenses if e.category == category]
-            
-            if not expenses:
-                period = "today" if days == 1 else f"last {days} days"
-                return f"No {category} expenses found for {period}."
-            
-            total = sum(expense.amount for expense in expenses)
-            period = "today" if days == 1 else f"last {days} days"
-            
-            response = f"💳 Your {category} expenses for {period}:\n\n"
-            response += f"**Total: ${total}**\n\n"
-            response += "**Expenses:**\n"
-            
-            for expense in expenses[:20]:  # Show up to 20
-                response += f"• {expense.description} - ${expense.amount}\n"
-            
-            if len(expenses) > 20:
-                response += f"\n... and {len(expenses) - 20} more"
-            
-            return response
-            
         except Exception as e:
             return f"❌ Error retrieving {category} expenses: {str(e)}"
 
+    async def _summarize_expenses(self, user_id: int, category: str, days: int) -> str:
+        """Query the user's expenses in a category and format the summary."""
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
+        
+        all_expenses = await self.expense_repository.find_by_user_id_and_date_range(
+            user_id, start_date, end_date
+        )
+        
+        # Filter by category
+        expenses = [e for e in all_expenses if e.category == category]
+        
+        if not expenses:
+            period = "today" if days == 1 else f"last {days} days"
+            return f"No {category} expenses found for {period}."
+        
+        total = sum(expense.amount for expense in expenses)
+        period = "today" if days == 1 else f"last {days} days"
+        
+        response = f"💳 Your {category} expenses for {period}:\n\n"
+        response += f"**Total: ${total}**\n\n"
+        response += "**Expenses:**\n"
+        
+        for expense in expenses[:20]:  # Show up to 20
+            response += f"• {expense.description} - ${expense.amount}\n"
+        
+        if len(expenses) > 20:
+            response += f"\n... and {len(expenses) - 20} more"
+        
+        return response
+
 
 class GetExpensesByCategoryTool(IExpenseTool):
     """Get expenses by category tool implementation."""
@@ -104,40 +122,26 @@ class GetExpensesByCategoryTool(IExpenseTool):
         self, 
         expense_repository: IExpenseRepository, 
         categories_repository: IExpenseCategoriesRepository,
-        user_id: int
+        query_cache: ExpenseQueryCache | None = None
     ):
         self.expense_repository = expense_repository
         self.categories_repository = categories_repository
-        self.user_id = user_id
+        self.query_cache = query_cache
 
     @property
     def name(self) -> str:
         """Get the tool name."""
-        return "get_expenses_by_category"
+        return GET_EXPENSES_BY_CATEGORY_TOOL_NAME
 
     @property 
     def description(self) -> str:
         """Get the tool description with usage guidelines."""
-        return """Get expenses filtered by a specific category.
-
-Use this tool when users ask about spending in a specific category:
-- Category-specific queries: 'how much on food?', 'transportation costs', 'housing expenses'
-- Category spending patterns: 'food spending this month', 'entertainment budget', 'medical costs'
-- Category comparisons: 'food vs entertainment', 'utilities this month'
-- Category analysis: 'biggest food expenses', 'transportation breakdown'
-
-Available categories: Food, Transportation, Housing, Utilities, Insurance, Medical/Healthcare, 
-Savings, Debt, Education, Entertainment, Other
-
-Examples:
-- 'how much on food this month?' → get_expenses_by_category(category='Food', days=30)
-- 'transportation costs last week' → get_expenses_by_category(category='Transportation', days=7)
-- 'entertainment spending' → get_expenses_by_category(category='Entertainment', days=30)"""
+        return GET_EXPENSES_BY_CATEGORY_TOOL_DESCRIPTION
 
     def get_langchain_tool(self) -> BaseTool:
         """Get the LangChain BaseTool instance."""
         return GetExpensesByCategoryToolImpl(
             self.expense_repository,
             self.categories_repository,
-            self.user_id
+            self.query_cache
         )
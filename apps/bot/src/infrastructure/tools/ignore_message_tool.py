@@ -0,0 +1,63 @@
+"""
+Ignore message tool for LangChain.
+"""
+
+from langchain.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from domain.interfaces.expense_tool import IExpenseTool
+
+# Agent output when the message was ignored; the tool returns directly, so it is never rephrased
+IGNORED_MESSAGE_OUTPUT = "__ignored_message__"
+
+IGNORE_MESSAGE_TOOL_NAME = "ignore_message"
+
+IGNORE_MESSAGE_TOOL_DESCRIPTION = """Ignore a message that is not about expenses; the user gets no reply.
+
+Use this tool when the message:
+- Is a greeting or small talk: 'hi', 'how are you?', 'good night'
+- Asks about something unrelated to money or expenses: 'what's the weather?', 'tell me a joke'
+- Is a reaction with nothing to act on: 'haha', 'sure', 'see you'
+
+Never use it for messages that mention spending, purchases, amounts or expense questions."""
+
+
+class IgnoreMessageInput(BaseModel):
+    """Input schema for ignore_message tool."""
+    reason: str = Field(description="Short reason why the message is not about expenses", default="")
+
+
+class IgnoreMessageToolImpl(BaseTool):
+    """LangChain BaseTool implementation for ignoring non-expense messages."""
+    
+    name: str = IGNORE_MESSAGE_TOOL_NAME
+    description: str = IGNORE_MESSAGE_TOOL_DESCRIPTION
+    
+    args_schema: type[BaseModel] = IgnoreMessageInput
+    return_direct: bool = True
+    
+    def _run(self, reason: str = "") -> str:
+        """Synchronous run method (not used in async context)."""
+        raise NotImplementedError("Use arun instead")
+    
+    async def _arun(self, reason: str = "") -> str:
+        """Mark the message as ignored."""
+        return IGNORED_MESSAGE_OUTPUT
+
+
+class IgnoreMessageTool(IExpenseTool):
+    """Ignore message tool implementation."""
+
+    @property
+    def name(self) -> str:
+        """Get the tool name."""
+        return IGNORE_MESSAGE_TOOL_NAME
+
+    @property
+    def description(self) -> str:
+        """Get the tool description with usage guidelines."""
+        return IGNORE_MESSAGE_TOOL_DESCRIPTION
+
+    def get_langchain_tool(self) -> BaseTool:
+        """Get the LangChain BaseTool instance."""
+        return IgnoreMessageToolImpl()
@@ -0,0 +1,37 @@
+"""
+Per-run context for expense tools.
+
+The agent and its tools are built once per process and shared by all
+messages, so the user a tool acts for is taken from a context variable set
+around each agent run instead of from tool state. Every asyncio task gets
+its own copy of the context, so concurrent runs never see each other's user.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_current_user_id: ContextVar[int | None] = ContextVar("current_user_id", default=None)
+
+
+@contextmanager
+def user_context(user_id: int) -> Iterator[None]:
+    """Run the enclosed block (e.g. an agent run) on behalf of `user_id`."""
+    token = _current_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        _current_user_id.reset(token)
+
+
+def get_current_user_id() -> int:
+    """Get the user of the current run."""
+    user_id = _current_user_id.get()
+    if user_id is None:
+        raise RuntimeError("Expense tool used outside of a user context")
+    return user_id
+
+
+def find_current_user_id() -> int | None:
+    """Get the user of the current run, or None outside of one."""
+    return _current_user_id.get()
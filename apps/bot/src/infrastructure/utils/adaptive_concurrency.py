@@ -0,0 +1,158 @@
+"""
+Adaptive concurrency control for job workers.
+
+An AIMD controller (additive increase, multiplicative decrease) adjusts how
+many handlers may run at once from observed handler latency and error rate,
+and a resizable limiter enforces that number.
+"""
+
+import asyncio
+from collections import deque
+from typing import Optional
+
+
+class ConcurrencyLimiter:
+    """Semaphore-like limiter whose limit can be changed while in use."""
+
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._in_use = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        while self._in_use >= self._limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # Pass on a wake-up we received but can no longer use
+                self._wake_waiters()
+                raise
+        self._in_use += 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now."""
+        if self._in_use >= self._limit or self._waiters:
+            return False
+        self._in_use += 1
+        return True
+
+    def release(self) -> None:
+        """Give a slot back."""
+        self._in_use = max(0, self._in_use - 1)
+        self._wake_waiters()
+
+    def set_limit(self, limit: int) -> None:
+        """Change the limit; slots already taken are never revoked."""
+        self._limit = max(1, limit)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        free_slots = self._limit - self._in_use
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free_slots -= 1
+
+
+class AdaptiveConcurrencyController:
+    """AIMD controller driven by handler latency and error rate.
+
+    Outcomes are evaluated in windows of `window_size` handler runs. The
+    baseline is an exponentially weighted moving average (EWMA) of window
+    latencies, so it reflects the long-run mix of the workload (e.g. 5 ms
+    rule rejects next to multi-second agent runs) rather than the luckiest
+    window seen. A healthy window raises the limit by one; a window much
+    slower than the baseline, or with too many errors, halves it.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float = 2.0,
+        max_error_rate: float = 0.2,
+        window_size: int = 20,
+        baseline_smoothing: float = 0.1,
+        warm_up_windows: int = 5,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.window_size = max(1, window_size)
+        # EWMA weight of each new window in the baseline
+        self.baseline_smoothing = baseline_smoothing
+        # Windows averaged into the baseline before latency is judged against it
+        self.warm_up_windows = max(1, warm_up_windows)
+
+        self._baseline_latency: Optional[float] = None
+        self._baseline_windows = 0
+        self._window_latency_total = 0.0
+        self._window_count = 0
+        self._window_errors = 0
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        return self._baseline_latency
+
+    def record(self, latency_in_seconds: float, success: bool) -> Optional[int]:
+        """Record one handler outcome; returns the new limit when it changes."""
+        self._window_latency_total += latency_in_seconds
+        self._window_count += 1
+        if not success:
+            self._window_errors += 1
+
+        # Full windows even at small limits: averages of a few runs of a
+        # bimodal workload swing far more than the tolerance
+        if self._window_count < self.window_size:
+            return None
+
+        average_latency = self._window_latency_total / self._window_count
+        error_rate = self._window_errors / self._window_count
+        self._window_latency_total = 0.0
+        self._window_count = 0
+        self._window_errors = 0
+
+        latency_degraded = (
+            self._baseline_windows >= self.warm_up_windows
+            and average_latency > self._baseline_latency * self.latency_tolerance
+        )
+        degraded = latency_degraded or error_rate > self.max_error_rate
+
+        # Every window feeds the baseline, so a permanently slower model
+        # becomes the new normal instead of being treated as degraded forever
+        self._update_baseline(average_latency)
+
+        new_limit = max(self.min_limit, self.limit // 2) if degraded else min(self.max_limit, self.limit + 1)
+
+        if new_limit == self.limit:
+            return None
+
+        self.limit = new_limit
+        return new_limit
+
+    def _update_baseline(self, average_latency: float) -> None:
+        # Plain mean of the first windows, so one unrepresentative window does
+        # not anchor the baseline; EWMA afterwards
+        self._baseline_windows += 1
+        weight = max(self.baseline_smoothing, 1 / self._baseline_windows)
+        if self._baseline_latency is None:
+            self._baseline_latency = average_latency
+        else:
+            self._baseline_latency += weight * (average_latency - self._baseline_latency)
@@ -0,0 +1,127 @@
+"""
+Circuit breaker for calls to flaky upstream services (e.g. the OpenAI API).
+
+After `failure_threshold` consecutive failures the circuit opens and calls
+fail fast with CircuitOpenError for `recovery_timeout_in_seconds`. Then a
+single trial call is let through (half-open): success closes the circuit,
+failure opens it again. Only exceptions of `failure_types` count as
+failures; anything else (e.g. a bad request, a tool's database error) says
+nothing about the upstream's health and leaves the state unchanged.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Tuple, Type, TypeVar
+
+from infrastructure.metrics.llm_metrics import CIRCUIT_BREAKER_REJECTED, CIRCUIT_BREAKER_STATE
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+    def __init__(self, name: str, retry_after_in_seconds: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after_in_seconds:.1f}s")
+        self.name = name
+        self.retry_after_in_seconds = retry_after_in_seconds
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by all callers of one upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout_in_seconds: float = 30.0,
+        failure_types: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout_in_seconds = recovery_timeout_in_seconds
+        self.failure_types = failure_types
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        CIRCUIT_BREAKER_STATE.labels(breaker=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run `func` through the breaker, raising CircuitOpenError while open."""
+        is_trial = self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            if is_trial:
+                self._trial_in_flight = False
+            raise
+        except Exception as error:
+            if isinstance(error, self.failure_types):
+                self._on_failure(is_trial)
+            elif is_trial:
+                # Inconclusive trial: let the next call try again
+                self._trial_in_flight = False
+            raise
+
+        self._on_success(is_trial)
+        return result
+
+    def _before_call(self) -> bool:
+        """Check whether a call may go through; returns True for a half-open trial call."""
+        if self._state == OPEN:
+            remaining = self._opened_at + self.recovery_timeout_in_seconds - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+            self._set_state(HALF_OPEN)
+
+        if self._state == HALF_OPEN:
+            if self._trial_in_flight:
+                self._reject(self.recovery_timeout_in_seconds)
+            self._trial_in_flight = True
+            return True
+
+        return False
+
+    def _reject(self, retry_after_in_seconds: float) -> None:
+        CIRCUIT_BREAKER_REJECTED.labels(breaker=self.name).inc()
+        raise CircuitOpenError(self.name, retry_after_in_seconds)
+
+    def _on_success(self, is_trial: bool) -> None:
+        self._consecutive_failures = 0
+        if is_trial:
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def _on_failure(self, is_trial: bool) -> None:
+        self._consecutive_failures += 1
+        if is_trial:
+            self._trial_in_flight = False
+            self._open()
+        elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        if state == self._state:
+            return
+        self.logger.warning(f"Circuit '{self.name}' is now {state}")
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(breaker=self.name).set(_STATE_VALUES[state])
+
@@ -0,0 +1,72 @@
+"""
+Per-user cache for expense read queries (tool results and agent answers).
+
+Every user has a version counter that is bumped on each write to their
+expenses. Entries remember the version they were computed at and are only
+served while it is still current, so a cached read never outlives a write
+made through this process. Versions are not shared between processes, so the
+cache is only used while a single process consumes messages. The TTL bounds
+how far rolling date ranges ("last 7 days") move on while cached.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from infrastructure.metrics.llm_metrics import EXPENSE_QUERY_CACHE
+
+
+class ExpenseQueryCache:
+    """Versioned LRU cache with a TTL, keyed by user and normalized query."""
+
+    def __init__(self, ttl_in_seconds: float = 60.0, max_size: int = 10000):
+        self.ttl_in_seconds = ttl_in_seconds
+        self.max_size = max(1, max_size)
+        self._versions: dict[int, int] = {}
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[int, float, Any]] = OrderedDict()
+
+    def version(self, user_id: int) -> int:
+        """Current version of a user's expenses; capture it before reading them."""
+        return self._versions.get(user_id, 0)
+
+    def invalidate(self, user_id: int) -> None:
+        """Bump the user's version, so everything cached for them is stale."""
+        self._versions[user_id] = self.version(user_id) + 1
+
+    def get(self, user_id: int, key: Hashable, kind: str = "tool") -> Any | None:
+        """Get a cached value that is still current, or None."""
+        entry_key = (user_id, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            version, expires_at, value = entry
+            if version == self.version(user_id) and expires_at > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                EXPENSE_QUERY_CACHE.labels(kind=kind, outcome="hit").inc()
+                return value
+            del self._entries[entry_key]
+
+        EXPENSE_QUERY_CACHE.labels(kind=kind, outcome="miss").inc()
+        return None
+
+    def set(self, user_id: int, key: Hashable, value: Any, version: int) -> None:
+        """Cache a value computed from the user's expenses at `version`."""
+        if version != self.version(user_id):
+            # A write landed while the value was computed
+            return
+
+        entry_key = (user_id, key)
+        self._entries[entry_key] = (version, time.monotonic() + self.ttl_in_seconds, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self, user_id: int, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Get a cached value, or load and cache it; failed loads aren't cached."""
+        version = self.version(user_id)
+        value = self.get(user_id, key)
+        if value is None:
+            value = await loader()
+            self.set(user_id, key, value, version)
+        return value
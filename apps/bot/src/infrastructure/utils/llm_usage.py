@@ -0,0 +1,147 @@
+"""
+Per-message accounting of LLM token usage and latency.
+
+A fresh LLMUsageTracker is passed as a LangChain callback to each run (one
+agent run or one classification). It records every LLM and tool call in the
+Prometheus metrics as it finishes, and `finish()` records the per-message
+totals and returns them for logging. With a token budget, it refuses to start
+another LLM call once the message's calls have used it up.
+"""
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from infrastructure.metrics.llm_metrics import (
+    LLM_CALL_LATENCY,
+    LLM_MESSAGE_CALLS,
+    LLM_MESSAGE_TOKENS,
+    LLM_TOKEN_BUDGET_EXCEEDED,
+    LLM_TOKENS,
+    LLM_TOOL_LATENCY,
+)
+
+
+class TokenBudgetExceededError(Exception):
+    """Raised instead of starting an LLM call once a message used up its token budget."""
+
+
+class LLMUsageTracker(AsyncCallbackHandler):
+    """Collects the tokens and latencies of one message's LLM and tool calls."""
+
+    def __init__(self, component: str, token_budget: int | None = None):
+        self.component = component
+        # Prompt plus completion tokens the message may use; None for no limit
+        self.token_budget = token_budget
+        # LangChain only lets callback errors through (and so stops the run) with this set
+        self.raise_error = token_budget is not None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # Prompt tokens served from the provider's prompt cache (a subset of prompt_tokens)
+        self.cached_prompt_tokens = 0
+        self.llm_latencies: list[float] = []
+        self.tool_latencies: list[tuple[str, float]] = []
+        self._started_at: dict[UUID, float] = {}
+        self._tool_names: dict[UUID, str] = {}
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    async def on_chat_model_start(self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._check_budget()
+        self._started_at[run_id] = time.monotonic()
+
+    async def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._check_budget()
+        self._started_at[run_id] = time.monotonic()
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        latency = self._elapsed(run_id)
+        prompt_tokens, completion_tokens, cached_prompt_tokens = _token_usage(response)
+
+        self.llm_latencies.append(latency)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_prompt_tokens += cached_prompt_tokens
+
+        LLM_CALL_LATENCY.labels(component=self.component).observe(latency)
+        LLM_TOKENS.labels(component=self.component, kind="prompt").inc(prompt_tokens)
+        LLM_TOKENS.labels(component=self.component, kind="completion").inc(completion_tokens)
+        LLM_TOKENS.labels(component=self.component, kind="cached_prompt").inc(cached_prompt_tokens)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started_at.pop(run_id, None)
+
+    async def on_tool_start(self, serialized: dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started_at[run_id] = time.monotonic()
+        self._tool_names[run_id] = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._record_tool(run_id, "success")
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._record_tool(run_id, "error")
+
+    def finish(self) -> dict[str, Any]:
+        """Record the per-message totals; returns them for logging."""
+        if self.llm_latencies:
+            LLM_MESSAGE_TOKENS.labels(component=self.component).observe(self.total_tokens)
+            LLM_MESSAGE_CALLS.labels(component=self.component).observe(len(self.llm_latencies))
+
+        return {
+            "llm_calls": len(self.llm_latencies),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "llm_latencies_ms": [round(latency * 1000) for latency in self.llm_latencies],
+            "tool_latencies_ms": [
+                (name, round(latency * 1000)) for name, latency in self.tool_latencies
+            ],
+        }
+
+    def _check_budget(self) -> None:
+        """Refuse another LLM call (e.g. the next agent step) once the budget is used up."""
+        if self.token_budget is None or self.total_tokens < self.token_budget:
+            return
+
+        LLM_TOKEN_BUDGET_EXCEEDED.labels(component=self.component).inc()
+        raise TokenBudgetExceededError(
+            f"{self.component} used {self.total_tokens} tokens, its budget is {self.token_budget}"
+        )
+
+    def _record_tool(self, run_id: UUID, status: str) -> None:
+        latency = self._elapsed(run_id)
+        name = self._tool_names.pop(run_id, "unknown")
+        self.tool_latencies.append((name, latency))
+        LLM_TOOL_LATENCY.labels(tool=name, status=status).observe(latency)
+
+    def _elapsed(self, run_id: UUID) -> float:
+        started_at = self._started_at.pop(run_id, None)
+        return 0.0 if started_at is None else time.monotonic() - started_at
+
+
+def _token_usage(response: LLMResult) -> tuple[int, int, int]:
+    """Get (prompt, completion, cached prompt) tokens from a chat model result."""
+    # Chat models put usage on the message; streamed runs only have it there
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_token_details = usage.get("input_token_details") or {}
+                return (
+                    usage.get("input_tokens", 0),
+                    usage.get("output_tokens", 0),
+                    input_token_details.get("cache_read", 0) or 0,
+                )
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    prompt_tokens_details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        token_usage.get("completion_tokens", 0),
+        prompt_tokens_details.get("cached_tokens", 0) or 0,
+    )
@@ -0,0 +1,131 @@
+"""
+Wire codecs for queue messages.
+
+The codec used to encode a message is advertised in the AMQP content_type
+header, and incoming messages are decoded with the codec matching that header.
+Messages without a content type (e.g. from the TypeScript connector) are JSON.
+The connector only reads JSON, so non-JSON codecs are limited to queues whose
+producers and consumers are all bot processes.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency
+    msgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+logger = logging.getLogger(__name__)
+
+
+class MessageCodec(ABC):
+    """Encodes and decodes queue message payloads."""
+
+    name: str
+    content_type: str
+    # Whether the encoded bytes are plain JSON, readable by the connector
+    json_compatible: bool = True
+
+    @abstractmethod
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """Encode a payload into message body bytes."""
+        pass
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        """Decode message body bytes into a payload."""
+        pass
+
+
+class JsonMessageCodec(MessageCodec):
+    """Standard library JSON codec."""
+
+    name = "json"
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        # json.loads accepts bytes directly, no intermediate str copy needed
+        return json.loads(body)
+
+
+class OrjsonMessageCodec(MessageCodec):
+    """orjson codec; produces plain JSON so it stays compatible with the connector."""
+
+    name = "orjson"
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps(payload)
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        return orjson.loads(body)
+
+
+class MsgpackMessageCodec(MessageCodec):
+    """MessagePack codec; only for queues that are produced and consumed by the bot."""
+
+    name = "msgpack"
+    content_type = MSGPACK_CONTENT_TYPE
+    json_compatible = False
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(body, raw=False)
+
+
+def fastest_json_codec() -> MessageCodec:
+    """Get orjson if installed, else the standard library JSON codec."""
+    return OrjsonMessageCodec() if orjson is not None else JsonMessageCodec()
+
+
+def get_message_codec(name: str) -> MessageCodec:
+    """Get the codec used to encode outgoing messages; raises ValueError for unknown names."""
+    if name == "json":
+        return JsonMessageCodec()
+
+    if name == "orjson":
+        if orjson is None:
+            logger.warning("orjson is not installed, falling back to the json codec")
+            return JsonMessageCodec()
+        return OrjsonMessageCodec()
+
+    if name == "msgpack":
+        if msgpack is None:
+            logger.warning("msgpack is not installed, falling back to the json codec")
+            return JsonMessageCodec()
+        return MsgpackMessageCodec()
+
+    raise ValueError(f"Unknown message codec: {name}")
+
+
+_JSON_DECODER = fastest_json_codec()
+_MSGPACK_DECODER = MsgpackMessageCodec() if msgpack is not None else None
+
+
+def get_decoder_for_content_type(content_type: Optional[str]) -> MessageCodec:
+    """Get the codec able to decode a message with the given content type."""
+    if not content_type or content_type == JSON_CONTENT_TYPE:
+        return _JSON_DECODER
+
+    if content_type == MSGPACK_CONTENT_TYPE:
+        if _MSGPACK_DECODER is None:
+            raise ValueError("Received a msgpack message but msgpack is not installed")
+        return _MSGPACK_DECODER
+
+    raise ValueError(f"Unsupported message content type: {content_type}")
@@ -0,0 +1,238 @@
+"""
+Client-side rate limiting for OpenAI requests.
+
+OpenAIRateLimiter keeps two token buckets, one for requests and one for
+(estimated) tokens per minute, and hands out capacity round-robin across
+users so one chatty user can't starve the rest. The limits start from
+settings and follow the `x-ratelimit-*` headers of every response, and a
+429 pauses all requests until the reset the response announces. It sits
+under every OpenAI client as an httpx transport (RateLimitedTransport), so
+requests wait for quota in this process instead of bouncing off the API.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Hashable, Mapping
+
+import httpx
+
+from infrastructure.metrics.llm_metrics import OPENAI_RATE_LIMITED, OPENAI_RATE_LIMIT_WAIT
+from infrastructure.tools.tool_context import find_current_user_id
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Pause after a 429 that doesn't say how long to wait
+DEFAULT_RETRY_AFTER_IN_SECONDS = 1.0
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `capacity` per minute."""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = max(1.0, capacity_per_minute)
+        self.level = self.capacity
+        self._updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated_at) * self.capacity / 60)
+        self._updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` can be taken; oversized amounts only need a full bucket."""
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing * 60 / self.capacity
+
+    def take(self, amount: float) -> None:
+        # May go negative for oversized amounts; the debt delays later requests
+        self.level -= amount
+
+    def set_capacity(self, capacity_per_minute: float) -> None:
+        self.capacity = max(1.0, capacity_per_minute)
+        self.level = min(self.level, self.capacity)
+
+    def set_remaining(self, remaining: float) -> None:
+        """Trust the server when it reports less capacity left than we think."""
+        self.level = min(self.level, remaining)
+
+
+class OpenAIRateLimiter:
+    """Shared RPM/TPM scheduler with fair queueing across users."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, share: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        # Part of the organization's quota this limiter may use (e.g. 1/N of N processes)
+        self.share = share
+        self.requests = TokenBucket(requests_per_minute * share)
+        self.tokens = TokenBucket(tokens_per_minute * share)
+        self._queues: OrderedDict[Hashable, deque[tuple[int, asyncio.Future]]] = OrderedDict()
+        self._paused_until = 0.0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    async def acquire(self, key: Hashable, tokens: int) -> None:
+        """Wait for quota for one request of about `tokens` tokens, queued under `key`."""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append((tokens, future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation: give the quota back
+                self.requests.level += 1
+                self.tokens.level += tokens
+            else:
+                self._remove_waiter(key, future)
+            self._dispatch()
+            raise
+
+    def update_from_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the limits to the rate-limit headers of an OpenAI response."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = _parse_number(headers.get(f"x-ratelimit-limit-{kind}"))
+            if limit is not None:
+                bucket.set_capacity(limit * self.share)
+            remaining = _parse_number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is not None:
+                bucket.set_remaining(remaining)
+
+        if status_code == 429:
+            retry_after = _retry_after(headers)
+            self.logger.warning("OpenAI rate limit hit, pausing requests for %.2fs", retry_after)
+            OPENAI_RATE_LIMITED.inc()
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant queued requests while quota lasts, then sleep until the next one fits."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            tokens, future = queue[0]
+            if future.cancelled():
+                self._pop_head(key, queue)
+                continue
+
+            wait = max(
+                self._paused_until - now,
+                self.requests.time_until(1),
+                self.tokens.time_until(tokens),
+            )
+            if wait > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            self._pop_head(key, queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            future.set_result(None)
+
+    def _pop_head(self, key: Hashable, queue: deque) -> None:
+        queue.popleft()
+        if queue:
+            # Round-robin: the user's next request waits behind everyone else's
+            self._queues.move_to_end(key)
+        else:
+            del self._queues[key]
+
+    def _remove_waiter(self, key: Hashable, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        for waiter in queue:
+            if waiter[1] is future:
+                queue.remove(waiter)
+                break
+        if not queue:
+            del self._queues[key]
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that takes quota from the limiter before every request."""
+
+    def __init__(self, limiter: OpenAIRateLimiter, transport: httpx.AsyncBaseTransport | None = None):
+        self.limiter = limiter
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tokens = estimate_request_tokens(await request.aread())
+
+        started_at = time.monotonic()
+        # Requests outside an agent run (e.g. classification) share one queue
+        await self.limiter.acquire(find_current_user_id(), tokens)
+        OPENAI_RATE_LIMIT_WAIT.observe(time.monotonic() - started_at)
+
+        response = await self._transport.handle_async_request(request)
+        self.limiter.update_from_response(response.status_code, response.headers)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """Estimate the tokens a request counts against the TPM limit: prompt plus max output."""
+    if not body:
+        return 0
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return len(body) // 4
+
+    # About 4 characters per token; the JSON overhead roughly covers the message framing
+    prompt_tokens = len(body) // 4
+    max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens") or 0
+    return prompt_tokens + int(max_tokens)
+
+
+def _parse_number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Parse OpenAI reset durations such as '1s', '6m0s' or '20ms'."""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return _parse_number(value)
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    retry_after_ms = _parse_number(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+
+    retry_after = _parse_number(headers.get("retry-after"))
+    if retry_after is not None:
+        return retry_after
+
+    # Resets say when a bucket is full again; the sooner one frees some quota, and
+    # another 429 just pauses again
+    resets = [
+        reset for reset in (
+            _parse_duration(headers.get("x-ratelimit-reset-requests")),
+            _parse_duration(headers.get("x-ratelimit-reset-tokens")),
+        )
+        if reset is not None
+    ]
+    return min(resets) if resets else DEFAULT_RETRY_AFTER_IN_SECONDS
@@ -1,7 +1,11 @@
 """
-Queue utility functions for creating task handler results.
+Queue utility functions for creating task handler results, retry delays and partitions.
 """
 
+import random
+import zlib
+from typing import Any
+
 from domain.interfaces.job_factory import TaskHandlerResult
 
 
@@ -26,4 +30,28 @@ def create_cancelled_result(message: str = "Task was cancelled") -> TaskHandlerR
     return TaskHandlerResult(
         status="cancelled",
         result_message=message
-    )
\ No newline at end of file
+    )
+
+
+def create_delayed_result(message: str, retry_after_ms: int) -> TaskHandlerResult:
+    """Create a delayed result: the message is parked and retried without using up an attempt."""
+    return TaskHandlerResult(
+        status="delayed",
+        result_message=message,
+        retry_after_ms=retry_after_ms
+    )
+
+
+def calculate_retry_delay_ms(attempts: int, base_delay_ms: int = 1000, max_delay_ms: int = 30000) -> int:
+    """Exponential backoff delay (in milliseconds) before retry number `attempts`."""
+    return min(base_delay_ms * (2 ** (max(attempts, 1) - 1)), max_delay_ms)
+
+
+def apply_full_jitter(delay_ms: int) -> int:
+    """Pick a uniformly random delay in [0, delay_ms] so retries don't land together."""
+    return random.randint(0, max(delay_ms, 0))
+
+
+def select_partition(key: Any, partition_count: int) -> int:
+    """Map an ordering key onto one of `partition_count` partitions (stable across processes)."""
+    return zlib.crc32(str(key).encode()) % partition_count
@@ -12,21 +12,11 @@ from fastapi import FastAPI
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from application.jobs.message_processing_job import MessageProcessingJob
-from application.jobs.response_sending_job import ResponseSendingJob
-from application.services.message_processor import MessageProcessorService
-from application.services.user_service import UserService
-from application.services.worker_processor import WorkerProcessorService
+from bootstrap import create_services, start_services, stop_services
 from config.settings import settings
-from infrastructure.providers.rabbitmq_provider import RabbitMQProvider
-from infrastructure.repositories.expense_repository import PostgreSQLExpenseRepository
-from infrastructure.repositories.fixed_expense_categories_repository import FixedExpenseCategoriesRepository
-from infrastructure.repositories.user_repository import PostgreSQLUserRepository
-from infrastructure.services.expense_tool_factory import ExpenseToolFactory
-from infrastructure.services.hybrid_message_classifier import HybridMessageClassifier
-from infrastructure.services.openai_expense_parser import OpenAIExpenseParser
-from infrastructure.services.rabbitmq_job_factory import RabbitMQJobFactory
 from presentation.routers.health import router as health_router
+from presentation.routers.metrics import router as metrics_router
+from supervisor import WorkerSupervisor
 
 # Configure logging
 logging.basicConfig(
@@ -37,84 +27,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Global instances
-message_processor_service = None
-job_factory = None
-worker_processor_service = None
+services = None
+worker_supervisor = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global message_processor_service, job_factory, worker_processor_service
+    global services, worker_supervisor
 
     try:
-        # Initialize repositories
-        user_repository = PostgreSQLUserRepository(settings.database_url)
-        expense_repository = PostgreSQLExpenseRepository(settings.database_url)
-        categories_repository = FixedExpenseCategoriesRepository()
-
-        # Initialize tool factory (tools will be created per user per message)
-        tool_factory = ExpenseToolFactory(
-            expense_repository=expense_repository,
-            categories_repository=categories_repository
-        )
-
-        # Initialize OpenAI expense parser with tool factory
-        openai_expense_parser = OpenAIExpenseParser(
-            openai_api_key=settings.openai_api_key,
-            tool_factory=tool_factory,
-            model=settings.openai_model
-        )
-
-        # Initialize message classifier
-        message_classifier = HybridMessageClassifier(
-            openai_api_key=settings.openai_api_key,
-            model=settings.openai_model
-        )
-
-        # Initialize RabbitMQ job factory
-        job_factory = RabbitMQJobFactory(batch_size=settings.job_batch_size)
-
-        # Initialize jobs first
-        response_sending_job = ResponseSendingJob(job_factory)
-
-        # Initialize user service
-        user_service = UserService(
-            user_repository=user_repository,
-            registration_password=settings.registration_password,
-        )
-
-        # Initialize message processor service with user service
-        message_processor_service = MessageProcessorService(
-            user_service=user_service,
-            expense_parser=openai_expense_parser,
-            message_classifier=message_classifier,
-            response_sending_job=response_sending_job,
-        )
-
-        # Initialize message processing job
-        message_processing_job = MessageProcessingJob(
-            job_factory, message_processor_service
-        )
-
-        # Initialize worker processor service
-        worker_processor_service = WorkerProcessorService(
-            jobs=[message_processing_job.job]
-        )
-
-        # Start all workers
-        await worker_processor_service.start_workers()
+        if settings.bot_worker_processes > 1:
+            # Consumers run in supervised child processes; this one only serves HTTP
+            worker_supervisor = WorkerSupervisor(
+                process_count=settings.bot_worker_processes,
+                heartbeat_timeout_in_seconds=settings.bot_worker_heartbeat_timeout,
+            )
+            app.state.worker_supervisor = worker_supervisor
+            await worker_supervisor.start()
+        else:
+            services = create_services()
+
+            # Start all workers
+            await start_services(services)
 
         logger.info("Bot service started successfully")
 
         yield
 
         # Cleanup
-        await worker_processor_service.stop_workers()
-        await job_factory.close()
-        await RabbitMQProvider.close_connection()
-        await user_repository.close()
-        await expense_repository.close()
+        if worker_supervisor:
+            # Leave the workers their full drain window before killing them
+            await worker_supervisor.stop(
+                timeout_in_seconds=settings.job_drain_timeout_seconds + 5
+            )
+        else:
+            await stop_services(services)
 
         logger.info("Bot service stopped")
 
@@ -132,6 +80,7 @@ app = FastAPI(
 
 # Register routers
 app.include_router(health_router, prefix="/health", tags=["health"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -4,16 +4,26 @@ Health check router for the Bot Service.
 
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 router = APIRouter()
 
 
 @router.get("")
-async def get_health():
+async def get_health(request: Request):
     """Health check endpoint."""
-    return {
+    health = {
         "status": "ok",
         "service": "bot",
         "timestamp": datetime.utcnow().isoformat(),
     }
+
+    # In multi-process mode, report the aggregated state of the worker processes
+    worker_supervisor = getattr(request.app.state, "worker_supervisor", None)
+    if worker_supervisor:
+        workers_health = worker_supervisor.get_health()
+        health["workers"] = workers_health["workers"]
+        if not workers_health["healthy"]:
+            health["status"] = "degraded"
+
+    return health
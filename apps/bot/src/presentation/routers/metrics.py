@@ -0,0 +1,16 @@
+"""
+Prometheus metrics router for the Bot Service.
+"""
+
+from fastapi import APIRouter, Response
+
+from infrastructure.metrics.job_metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics():
+    """Prometheus metrics endpoint."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
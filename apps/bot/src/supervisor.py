@@ -0,0 +1,215 @@
+"""
+Multi-process worker mode for the Bot Service.
+
+The supervisor forks consumer processes, each with its own RabbitMQ connection
+and database pools, restarts the ones that crash or stop sending heartbeats
+(with exponential backoff, so a crash loop does not respawn every second) and
+reports their health.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.process import BaseProcess
+from multiprocessing.sharedctypes import SynchronizedArray
+from typing import Optional
+
+from config.settings import settings
+from infrastructure.metrics.job_metrics import mark_process_dead
+
+
+class WorkerSupervisor:
+    """Starts, watches and restarts consumer worker processes."""
+
+    def __init__(
+        self,
+        process_count: int,
+        heartbeat_timeout_in_seconds: float = 30.0,
+        restart_delay_in_seconds: float = 1.0,
+        max_restart_delay_in_seconds: float = 60.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.process_count = process_count
+        self.heartbeat_timeout_in_seconds = heartbeat_timeout_in_seconds
+        # The restart delay doubles with every crash in a row, up to the max; a
+        # worker that stayed up for the max delay counts as recovered
+        self.restart_delay_in_seconds = restart_delay_in_seconds
+        self.max_restart_delay_in_seconds = max_restart_delay_in_seconds
+
+        # Spawn (not fork) so children never inherit the parent's event loop or sockets
+        self._context = multiprocessing.get_context("spawn")
+        self._heartbeats: SynchronizedArray = self._context.Array("d", process_count)
+        self._processes: list[Optional[BaseProcess]] = [None] * process_count
+        self._restart_counts: list[int] = [0] * process_count
+        self._consecutive_failures: list[int] = [0] * process_count
+        self._started_at: list[float] = [0.0] * process_count
+        # Monotonic time a dead worker is due to restart, None while it is running
+        self._restart_at: list[Optional[float]] = [None] * process_count
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Start all worker processes and the monitor loop."""
+        self.logger.info(f"Starting {self.process_count} worker processes")
+        for index in range(self.process_count):
+            self._start_process(index)
+
+        self._monitor_task = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self, timeout_in_seconds: float = 30.0) -> None:
+        """Ask every worker to shut down, killing those that don't exit in time."""
+        self._stopping = True
+
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+
+        for process in self._processes:
+            if process and process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + timeout_in_seconds
+        for index, process in enumerate(self._processes):
+            if not process:
+                continue
+            remaining = max(0.0, deadline - time.monotonic())
+            await asyncio.to_thread(process.join, remaining)
+            if process.is_alive():
+                self.logger.warning(f"Worker process {index} did not stop in time, killing it")
+                process.kill()
+                await asyncio.to_thread(process.join)
+
+        self.logger.info("All worker processes stopped")
+
+    def get_health(self) -> dict:
+        """Aggregate liveness and heartbeat status of all workers."""
+        now = time.time()
+        workers = []
+        for index, process in enumerate(self._processes):
+            last_heartbeat = self._heartbeats[index]
+            alive = bool(process and process.is_alive())
+            healthy = alive and now - last_heartbeat <= self.heartbeat_timeout_in_seconds
+            workers.append(
+                {
+                    "index": index,
+                    "pid": process.pid if process else None,
+                    "alive": alive,
+                    "healthy": healthy,
+                    "restarts": self._restart_counts[index],
+                    "last_heartbeat": last_heartbeat or None,
+                }
+            )
+
+        return {
+            "healthy": all(worker["healthy"] for worker in workers),
+            "workers": workers,
+        }
+
+    def _start_process(self, index: int) -> None:
+        """Spawn the worker process for the given slot."""
+        self._heartbeats[index] = 0.0
+        self._started_at[index] = time.monotonic()
+        self._restart_at[index] = None
+        process = self._context.Process(
+            target=run_worker_process,
+            args=(index, self._heartbeats),
+            name=f"bot-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        self.logger.info(f"Started worker process {index} (pid {process.pid})")
+
+    async def _monitor_loop(self) -> None:
+        """Restart workers that exit unexpectedly or stop sending heartbeats."""
+        while not self._stopping:
+            for index, process in enumerate(self._processes):
+                if process is None or self._stopping:
+                    continue
+
+                if process.is_alive():
+                    if self._is_stalled(index):
+                        self.logger.error(
+                            f"Worker process {index} (pid {process.pid}) sent no heartbeat for "
+                            f"{self.heartbeat_timeout_in_seconds}s, killing it"
+                        )
+                        process.kill()
+                        await asyncio.to_thread(process.join)
+                    else:
+                        continue
+
+                if self._restart_at[index] is None:
+                    self._schedule_restart(index, process)
+                elif time.monotonic() >= self._restart_at[index]:
+                    self._start_process(index)
+
+            await asyncio.sleep(1.0)
+
+    def _is_stalled(self, index: int) -> bool:
+        """Whether a running worker missed its heartbeats (counted from its start until the first one)."""
+        last_heartbeat_at = self._heartbeats[index]
+        if last_heartbeat_at:
+            return time.time() - last_heartbeat_at > self.heartbeat_timeout_in_seconds
+        return time.monotonic() - self._started_at[index] > self.heartbeat_timeout_in_seconds
+
+    def _schedule_restart(self, index: int, process: BaseProcess) -> None:
+        """Record a dead worker and pick its restart time, backing off on repeated crashes."""
+        if time.monotonic() - self._started_at[index] >= self.max_restart_delay_in_seconds:
+            self._consecutive_failures[index] = 0
+        self._consecutive_failures[index] += 1
+        self._restart_counts[index] += 1
+        mark_process_dead(process.pid)
+
+        delay = self.restart_delay(self._consecutive_failures[index])
+        self._restart_at[index] = time.monotonic() + delay
+        self.logger.error(
+            f"Worker process {index} (pid {process.pid}) exited with code {process.exitcode}, "
+            f"restarting in {delay:.1f}s"
+        )
+
+    def restart_delay(self, consecutive_failures: int) -> float:
+        """Seconds to wait before restarting a worker that crashed this many times in a row."""
+        exponent = min(max(0, consecutive_failures - 1), 16)
+        return min(self.max_restart_delay_in_seconds, self.restart_delay_in_seconds * 2 ** exponent)
+
+
+def run_worker_process(index: int, heartbeats: SynchronizedArray) -> None:
+    """Entry point of a worker process."""
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format=f"%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(_serve_worker(index, heartbeats))
+
+
+async def _serve_worker(index: int, heartbeats: SynchronizedArray) -> None:
+    """Run the consumers of one worker process until it is asked to stop."""
+    # Imported here so the supervisor process never builds consumer services
+    from bootstrap import create_services, start_services, stop_services
+
+    logger = logging.getLogger(__name__)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    services = create_services()
+    await start_services(services)
+    logger.info(f"Worker process {index} started")
+
+    try:
+        while not stop_event.is_set():
+            heartbeats[index] = time.time()
+            try:
+                await asyncio.wait_for(
+                    stop_event.wait(), timeout=settings.bot_worker_heartbeat_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await stop_services(services)
+        logger.info(f"Worker process {index} stopped")
@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the bot service tests.
+"""
+
+import sys
+from pathlib import Path
+
+# Modules import each other from the src root (e.g. `from domain...`)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
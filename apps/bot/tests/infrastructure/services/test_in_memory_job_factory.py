@@ -0,0 +1,112 @@
+"""
+Tests for the broker-free in-memory job factory.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from application.jobs.message_processing_job import MessageProcessingJob  # noqa: E402
+from application.jobs.response_sending_job import ResponseSendingJob  # noqa: E402
+from domain.interfaces.job_factory import PRIORITY_NORMAL  # noqa: E402
+from infrastructure.services.in_memory_job_factory import InMemoryJobFactory  # noqa: E402
+
+
+class RespondingProcessor:
+    """Stands in for MessageProcessorService: answers every message with one response."""
+
+    def __init__(self):
+        self.response_job: ResponseSendingJob | None = None
+        self.processed = []
+
+    async def process_message(self, message, user=None):
+        await asyncio.sleep(0.001)
+        self.processed.append((message.telegram_user_id, message.message_text))
+        await self.response_job.schedule_response_sending(
+            chat_id=message.chat_id,
+            text=f"Saved: {message.message_text}",
+            reply_to_message_id=message.message_id,
+        )
+
+    def resolve_priority(self, message_text):
+        return PRIORITY_NORMAL
+
+
+def message(user_id, message_id, text):
+    return {
+        "chatId": user_id,
+        "messageText": text,
+        "telegramUserId": user_id,
+        "timestamp": "2025-08-22T10:00:00Z",
+        "messageId": message_id,
+    }
+
+
+def test_join_returns_once_messages_are_handled_and_responses_scheduled():
+    async def scenario():
+        factory = InMemoryJobFactory(batch_size=4)
+        processor = RespondingProcessor()
+        processing_job = MessageProcessingJob(factory, processor, queue_name="messages")
+        # Created last so join() reaches its queue after responses were scheduled
+        response_job = ResponseSendingJob(factory)
+        processor.response_job = response_job
+
+        await response_job.job.turn_on()
+        await processing_job.job.turn_on()
+        for index in range(20):
+            await processing_job.job.schedule_task(message(index % 5 + 1, index, f"coffee {index}"))
+
+        # The responses queue has no consumer in the bot; join() must not wait on it
+        await asyncio.wait_for(factory.join(), timeout=5)
+        await factory.close()
+        return processor, response_job
+
+    processor, response_job = asyncio.run(scenario())
+
+    assert len(processor.processed) == 20
+    # Each user's messages were handled in the order they were scheduled
+    for user_id in range(1, 6):
+        texts = [text for user, text in processor.processed if user == user_id]
+        assert texts == [f"coffee {index}" for index in range(user_id - 1, 20, 5)]
+    assert not response_job.job.has_consumer
+    assert response_job.job._queue.qsize() == 20
+
+
+def test_batches_mix_keys_and_keep_each_key_in_order():
+    batches = []
+
+    async def scenario():
+        class BatchingProcessor(RespondingProcessor):
+            async def process_messages(self, messages):
+                batches.append([message.message_text for message in messages])
+                for message in messages:
+                    await self.process_message(message)
+                return [None] * len(messages)
+
+        factory = InMemoryJobFactory(batch_size=2)
+        processor = BatchingProcessor()
+        processing_job = MessageProcessingJob(
+            factory, processor, queue_name="messages", batching_enabled=True
+        )
+        processor.response_job = ResponseSendingJob(factory)
+
+        for index in range(2):
+            for user_id in range(1, 5):
+                await processing_job.job.schedule_task(message(user_id, index, f"{user_id}-{index}"))
+        await processing_job.job.turn_on()
+        await asyncio.wait_for(factory.join(), timeout=5)
+        await factory.close()
+
+    asyncio.run(scenario())
+
+    assert sorted(text for batch in batches for text in batch) == sorted(
+        f"{user_id}-{index}" for user_id in range(1, 5) for index in range(2)
+    )
+    # A batch takes one message per user, from several users
+    assert all(len({text.split("-")[0] for text in batch}) == len(batch) for batch in batches)
+    assert max(len(batch) for batch in batches) > 1
+    for user_id in range(1, 5):
+        texts = [text for batch in batches for text in batch if text.startswith(f"{user_id}-")]
+        assert texts == [f"{user_id}-0", f"{user_id}-1"]
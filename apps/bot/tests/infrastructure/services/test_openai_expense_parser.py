@@ -0,0 +1,76 @@
+"""
+Tests for the agent-based expense parser.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+agents = pytest.importorskip("langchain.agents")
+if not hasattr(agents, "AgentExecutor"):
+    pytest.skip("needs a langchain version with AgentExecutor", allow_module_level=True)
+pytest.importorskip("prometheus_client")
+
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langchain_core.tools import StructuredTool  # noqa: E402
+
+from infrastructure.services.openai_expense_parser import OpenAIExpenseParser  # noqa: E402
+from infrastructure.tools.get_recent_expenses_tool import GET_RECENT_EXPENSES_TOOL_NAME  # noqa: E402
+
+
+class ToolLoopingChatModel(BaseChatModel):
+    """Calls the same tool on every step, each call costing 1000 tokens."""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-looping"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        message = AIMessage(
+            content="",
+            additional_kwargs={"function_call": {
+                "name": GET_RECENT_EXPENSES_TOOL_NAME, "arguments": json.dumps({"days": 7}),
+            }},
+        )
+        message.usage_metadata = {"input_tokens": 900, "output_tokens": 100, "total_tokens": 1000}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class RecentExpensesTool:
+    def get_langchain_tool(self):
+        async def get_recent_expenses(days: int) -> str:
+            return "No expenses"
+
+        return StructuredTool.from_function(
+            coroutine=get_recent_expenses,
+            name=GET_RECENT_EXPENSES_TOOL_NAME,
+            description="Get recent expenses",
+        )
+
+
+class ToolFactory:
+    def create_tools(self):
+        return [RecentExpensesTool()]
+
+
+def test_agent_stops_once_the_message_token_budget_is_used_up():
+    llm = ToolLoopingChatModel()
+    parser = OpenAIExpenseParser(
+        llm=llm, tool_factory=ToolFactory(), max_iterations=10, max_tokens_per_message=2500
+    )
+
+    result = asyncio.run(parser.process_message("what did I spend?", user_id=1))
+
+    # 1000, 2000 and 3000 tokens after each step; the fourth step is refused
+    assert llm.calls == 3
+    assert not result.success
+    assert "simpler" in result.response_text
@@ -0,0 +1,285 @@
+"""
+Tests for RabbitMQJob's in-process scheduling, driven by fake deliveries (no broker).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("aio_pika")
+pytest.importorskip("prometheus_client")
+
+from domain.interfaces.job_factory import JobOptions  # noqa: E402
+from infrastructure.services.rabbitmq_job_factory import (  # noqa: E402
+    RabbitMQJobFactory,
+    RabbitMQMessage,
+)
+from infrastructure.utils.queue_utils import create_success_result  # noqa: E402
+
+
+class FakeDelivery:
+    """Stands in for aio_pika.IncomingMessage."""
+
+    content_type = "application/json"
+
+    def __init__(self, data, priority=None):
+        self.body = json.dumps(RabbitMQMessage(msg_id=str(id(self)), data=data).to_dict()).encode()
+        self.priority = priority
+        self.acked = False
+        self.requeued = False
+
+    async def ack(self):
+        self.acked = True
+
+    async def nack(self, requeue=True):
+        self.requeued = requeue
+
+
+def start_job(options: JobOptions):
+    """Create a job and start its dispatcher as if its consumer were running."""
+    factory = RabbitMQJobFactory(batch_size=options.concurrency or 2)
+    job = factory.create_job(options)
+    factory._workers[options.name] = True
+    job._start_dispatching()
+    return job
+
+
+async def deliver(job, *deliveries):
+    for delivery in deliveries:
+        await job._on_message(delivery)
+
+
+def test_hot_key_does_not_hold_the_slots_of_other_keys():
+    started = []
+
+    async def handler(args):
+        started.append(args.data["text"])
+        await asyncio.sleep(0.02)
+        return create_success_result()
+
+    async def scenario():
+        job = start_job(JobOptions(
+            name="messages", handler=handler, concurrency=2,
+            partition_key=lambda data: data["user"],
+        ))
+        hot = [FakeDelivery({"user": "hot", "text": f"hot-{index}"}) for index in range(6)]
+        cold = FakeDelivery({"user": "cold", "text": "cold-0"})
+        await deliver(job, *hot, cold)
+
+        await asyncio.sleep(0.01)
+        # The hot key runs one message at a time and the cold key takes the other slot
+        assert started == ["hot-0", "cold-0"]
+
+        while not all(delivery.acked for delivery in [*hot, cold]):
+            await asyncio.sleep(0.01)
+        await job.turn_off()
+
+    asyncio.run(scenario())
+
+    assert [text for text in started if text.startswith("hot")] == [f"hot-{index}" for index in range(6)]
+
+
+def test_messages_of_a_key_never_overlap():
+    running = set()
+    overlaps = []
+
+    async def handler(args):
+        user = args.data["user"]
+        if user in running:
+            overlaps.append(user)
+        running.add(user)
+        await asyncio.sleep(0.001)
+        running.discard(user)
+        return create_success_result()
+
+    async def scenario():
+        job = start_job(JobOptions(
+            name="messages", handler=handler, concurrency=4,
+            partition_key=lambda data: data["user"],
+        ))
+        deliveries = [FakeDelivery({"user": index % 3, "text": str(index)}) for index in range(30)]
+        await deliver(job, *deliveries)
+        while not all(delivery.acked for delivery in deliveries):
+            await asyncio.sleep(0.005)
+        await job.turn_off()
+        return job
+
+    job = asyncio.run(scenario())
+
+    assert overlaps == []
+    assert job._key_queues == {}
+    assert job._limiter.in_use == 0
+
+
+def test_turn_off_requeues_messages_that_have_not_started():
+    async def scenario():
+        unblock = asyncio.Event()
+
+        async def handler(args):
+            await unblock.wait()
+            return create_success_result()
+
+        job = start_job(JobOptions(
+            name="messages", handler=handler, concurrency=1,
+            partition_key=lambda data: data["user"],
+        ))
+        deliveries = [FakeDelivery({"user": index % 2, "text": str(index)}) for index in range(4)]
+        await deliver(job, *deliveries)
+        await asyncio.sleep(0.01)
+
+        stopping = asyncio.create_task(job.turn_off())
+        await asyncio.sleep(0.01)
+        unblock.set()
+        await stopping
+        return deliveries
+
+    deliveries = asyncio.run(scenario())
+
+    assert deliveries[0].acked
+    assert all(delivery.requeued and not delivery.acked for delivery in deliveries[1:])
+
+
+def priority_job(handler, concurrency=1):
+    return start_job(JobOptions(
+        name="messages", handler=handler, concurrency=concurrency,
+        partition_key=lambda data: data["user"],
+        max_priority=10, fast_lane_concurrency=1,
+    ))
+
+
+def test_high_priority_message_runs_before_the_next_message_of_its_key():
+    events = []
+
+    async def handler(args):
+        events.append(f"start {args.data['text']}")
+        await asyncio.sleep(0.01)
+        events.append(f"end {args.data['text']}")
+        return create_success_result()
+
+    async def scenario():
+        job = priority_job(handler, concurrency=2)
+        password = FakeDelivery({"user": 1, "text": "password"}, priority=5)
+        expense = FakeDelivery({"user": 1, "text": "coffee 5"}, priority=0)
+        await deliver(job, password, expense)
+        while not expense.acked:
+            await asyncio.sleep(0.005)
+        await job.turn_off()
+
+    asyncio.run(scenario())
+
+    # The registration finishes before the expense of the same user starts
+    assert events == ["start password", "end password", "start coffee 5", "end coffee 5"]
+
+
+def test_high_priority_message_does_not_overtake_earlier_messages_of_its_key():
+    started = []
+
+    async def handler(args):
+        started.append(args.data["text"])
+        await asyncio.sleep(0.01)
+        return create_success_result()
+
+    async def scenario():
+        job = priority_job(handler)
+        deliveries = [
+            FakeDelivery({"user": 1, "text": "coffee 5"}, priority=0),
+            FakeDelivery({"user": 1, "text": "thanks"}, priority=5),
+            FakeDelivery({"user": 2, "text": "hi"}, priority=5),
+        ]
+        await deliver(job, *deliveries)
+        while not all(delivery.acked for delivery in deliveries):
+            await asyncio.sleep(0.005)
+        await job.turn_off()
+
+    asyncio.run(scenario())
+
+    assert started.index("coffee 5") < started.index("thanks")
+    # An idle key's high-priority message skips the busy main slot
+    assert sorted(started[:2]) == ["coffee 5", "hi"]
+
+
+def test_batches_mix_keys_and_keep_each_key_in_order():
+    batches = []
+
+    async def batch_handler(args_batch):
+        batches.append([args.data["text"] for args in args_batch])
+        await asyncio.sleep(0.005)
+        return [create_success_result() for _ in args_batch]
+
+    async def scenario():
+        job = start_job(JobOptions(
+            name="messages", batch_handler=batch_handler, concurrency=8,
+            batch_max_size=8, batch_window_ms=20,
+            partition_key=lambda data: data["user"],
+        ))
+        deliveries = [
+            FakeDelivery({"user": user, "text": f"{user}-{index}"})
+            for index in range(2) for user in "abcd"
+        ]
+        await deliver(job, *deliveries)
+        while not all(delivery.acked for delivery in deliveries):
+            await asyncio.sleep(0.005)
+        await job.turn_off()
+
+    asyncio.run(scenario())
+
+    # Every user's first message shares one batch, their second messages the next
+    assert batches == [["a-0", "b-0", "c-0", "d-0"], ["a-1", "b-1", "c-1", "d-1"]]
+
+
+class FakeConsumerChannel:
+    """Channel whose basic.qos, like RabbitMQ's, only applies to consumers started after it."""
+
+    is_closed = False
+
+    def __init__(self):
+        self.prefetch_count = None
+
+    async def set_qos(self, prefetch_count, **kwargs):
+        self.prefetch_count = prefetch_count
+
+
+class FakeQueue:
+    """Queue recording the prefetch each consumer started with."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.consumers = {}
+        self.consumed = 0
+
+    async def consume(self, callback):
+        self.consumed += 1
+        consumer_tag = f"consumer-{self.consumed}"
+        self.consumers[consumer_tag] = self.channel.prefetch_count
+        return consumer_tag
+
+    async def cancel(self, consumer_tag):
+        del self.consumers[consumer_tag]
+
+
+def test_prefetch_of_the_live_consumer_follows_the_concurrency_limit():
+    async def handler(args):
+        return create_success_result()
+
+    async def scenario():
+        factory = RabbitMQJobFactory(batch_size=8)
+        factory.adaptive_concurrency = True
+        factory.min_concurrency, factory.max_concurrency = 1, 50
+        job = factory.create_job(JobOptions(name="messages", handler=handler))
+
+        # What _create_worker sets up, on fakes
+        job._channel = FakeConsumerChannel()
+        await job._channel.set_qos(prefetch_count=job._prefetch_count(job._limiter.limit))
+        job._queue = FakeQueue(job._channel)
+        job._consumer_tag = await job._queue.consume(job._on_message)
+        effective_prefetch = []
+
+        for succeeded in (False, True):
+            for _ in range(job._controller.window_size):
+                await job._record_outcome(0.01, succeeded)
+            effective_prefetch.append((job._limiter.limit, list(job._queue.consumers.values())))
+        return effective_prefetch
+
+    # Halved on errors, then one more after a healthy window; a single consumer each time
+    assert asyncio.run(scenario()) == [(4, [4]), (5, [5])]
@@ -0,0 +1,126 @@
+"""
+Tests for the rule-based expense fast path.
+"""
+
+import asyncio
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from domain.entities.message import ProcessingResult  # noqa: E402
+from infrastructure.services.rule_based_expense_parser import (  # noqa: E402
+    RuleBasedExpenseParser,
+)
+
+
+class RecordingExpenseRepository:
+    """Keeps created expenses in memory."""
+
+    def __init__(self):
+        self.expenses = []
+
+    async def create(self, expense):
+        saved = replace(expense, id=len(self.expenses) + 1)
+        self.expenses.append(saved)
+        return saved
+
+
+class RecordingFallbackParser:
+    """Stands in for the LLM agent and records what reached it."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def process_message(self, message_text, user_id, on_partial_response=None):
+        self.messages.append(message_text)
+        return ProcessingResult(success=True, response_text="agent")
+
+
+@pytest.fixture
+def parser():
+    return RuleBasedExpenseParser(RecordingExpenseRepository(), RecordingFallbackParser())
+
+
+@pytest.mark.parametrize(
+    "message_text, description, amount, category",
+    [
+        ("coffee $5", "coffee", Decimal("5"), "Food"),
+        ("lunch 12.50 food", "lunch", Decimal("12.50"), "Food"),
+        ("paid uber 23", "uber", Decimal("23"), "Transportation"),
+        ("netflix 15.99 dollars", "netflix", Decimal("15.99"), "Entertainment"),
+        ("gas 40 transportation", "gas", Decimal("40"), "Transportation"),
+    ],
+)
+def test_confident_entries(parser, message_text, description, amount, category):
+    parsed = parser.parse(message_text)
+
+    assert parsed is not None
+    assert (parsed.description, parsed.amount, parsed.category) == (description, amount, category)
+    assert parsed.confidence_score >= parser.min_confidence
+
+
+@pytest.mark.parametrize(
+    "message_text",
+    [
+        # Fuel or a utility bill
+        "gas bill 80",
+        "gas 40",
+        # Several keywords
+        "pizza snacks 20",
+    ],
+)
+def test_ambiguous_entries_get_a_low_confidence(parser, message_text):
+    parsed = parser.parse(message_text)
+
+    assert parsed is not None
+    assert parsed.confidence_score < parser.min_confidence
+
+
+@pytest.mark.parametrize(
+    "message_text",
+    [
+        # Keywords from different categories
+        "coffee uber 10",
+        # No keyword
+        "stuff 10",
+        # Questions and commands
+        "how much coffee 5",
+        "delete coffee 5",
+        # Trailing word that is not a category
+        "coffee 5 yesterday",
+        "coffee 0",
+        "I spent a lot on coffee this week",
+    ],
+)
+def test_non_entries_are_not_parsed(parser, message_text):
+    assert parser.parse(message_text) is None
+
+
+def test_confident_entry_is_recorded_without_the_agent(parser):
+    result = asyncio.run(parser.process_message("coffee $5", user_id=7))
+
+    assert result.success
+    assert parser.fallback_parser.messages == []
+    [expense] = parser.expense_repository.expenses
+    assert (expense.user_id, expense.amount, expense.category) == (7, Decimal("5"), "Food")
+
+
+@pytest.mark.parametrize("message_text", ["gas bill 80", "what did I spend today?"])
+def test_ambiguous_and_other_messages_go_to_the_agent(parser, message_text):
+    result = asyncio.run(parser.process_message(message_text, user_id=7))
+
+    assert result.response_text == "agent"
+    assert parser.fallback_parser.messages == [message_text]
+    assert parser.expense_repository.expenses == []
+
+
+def test_keywords_must_map_to_known_categories():
+    with pytest.raises(ValueError):
+        RuleBasedExpenseParser(
+            RecordingExpenseRepository(),
+            RecordingFallbackParser(),
+            category_keywords={"coffee": "Beverages"},
+        )
@@ -0,0 +1,115 @@
+"""
+Tests for the adaptive concurrency controller and the resizable limiter.
+"""
+
+import asyncio
+import random
+
+from infrastructure.utils.adaptive_concurrency import (
+    AdaptiveConcurrencyController,
+    ConcurrencyLimiter,
+)
+
+
+def feed(controller, latencies, success=True):
+    """Record every latency, returning the limit after each one."""
+    limits = []
+    for latency in latencies:
+        controller.record(latency, success)
+        limits.append(controller.limit)
+    return limits
+
+
+def test_bimodal_latency_does_not_collapse_the_limit():
+    # Half 5 ms rule rejects, half agent runs of a few seconds, no errors
+    rng = random.Random(7)
+    latencies = [
+        0.005 if rng.random() < 0.5 else rng.lognormvariate(0.7, 0.5)
+        for _ in range(5000)
+    ]
+    controller = AdaptiveConcurrencyController(initial_limit=10, min_limit=1, max_limit=50)
+
+    limits = feed(controller, latencies)
+
+    assert min(limits) >= 10
+    assert limits[-1] == 50
+
+
+def test_latency_regression_halves_the_limit():
+    controller = AdaptiveConcurrencyController(initial_limit=10, min_limit=1, max_limit=10)
+    feed(controller, [1.0] * 200)
+
+    limits = feed(controller, [5.0] * 20)
+
+    assert limits[-1] == 5
+
+
+def test_permanently_slower_handlers_become_the_new_baseline():
+    controller = AdaptiveConcurrencyController(initial_limit=10, min_limit=1, max_limit=10)
+    feed(controller, [1.0] * 200)
+
+    limits = feed(controller, [3.0] * 2000)
+
+    assert min(limits) < 10
+    assert limits[-1] == 10
+    assert controller.baseline_latency > 2.5
+
+
+def test_errors_halve_the_limit_down_to_the_minimum():
+    controller = AdaptiveConcurrencyController(initial_limit=8, min_limit=2, max_limit=16)
+
+    limits = feed(controller, [0.1] * 100, success=False)
+
+    assert limits[19] == 4
+    assert limits[-1] == 2
+
+
+def test_limit_changes_only_once_per_window():
+    controller = AdaptiveConcurrencyController(
+        initial_limit=1, min_limit=1, max_limit=10, window_size=20
+    )
+
+    changes = [controller.record(0.1, True) for _ in range(40)]
+
+    assert [change for change in changes if change is not None] == [2, 3]
+
+
+def test_limiter_blocks_at_the_limit_and_resizes_while_in_use():
+    async def scenario():
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        assert not limiter.try_acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.set_limit(2)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_use == 2
+
+        # Lowering the limit never revokes slots already taken
+        limiter.set_limit(1)
+        assert limiter.in_use == 2
+        limiter.release()
+        assert not limiter.try_acquire()
+        limiter.release()
+        assert limiter.try_acquire()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_passes_its_wake_up_on():
+    async def scenario():
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        limiter.release()
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, timeout=1)
+        assert limiter.in_use == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+"""
+Tests for per-message LLM usage accounting and the token budget.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+# The scripted model takes its tool names from the tools, which need langchain
+pytest.importorskip("langchain")
+pytest.importorskip("prometheus_client")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from infrastructure.services.scripted_chat_model import ScriptedChatModel  # noqa: E402
+from infrastructure.utils.llm_usage import (  # noqa: E402
+    LLMUsageTracker,
+    TokenBudgetExceededError,
+)
+
+# About 100 prompt tokens per call with the scripted model's 4-characters-per-token count
+PROMPT = [HumanMessage(content="x" * 400)]
+
+
+async def call_until_refused(usage: LLMUsageTracker, calls: int) -> int:
+    """Call the model up to `calls` times; returns how many calls were made."""
+    model = ScriptedChatModel()
+    for made in range(calls):
+        try:
+            await model.ainvoke(PROMPT, config={"callbacks": [usage]})
+        except TokenBudgetExceededError:
+            return made
+    return calls
+
+
+def test_usage_is_summed_over_calls():
+    usage = LLMUsageTracker("classifier")
+
+    assert asyncio.run(call_until_refused(usage, 3)) == 3
+
+    totals = usage.finish()
+    assert totals["llm_calls"] == 3
+    assert totals["prompt_tokens"] == 300
+    assert usage.total_tokens == 300 + totals["completion_tokens"]
+
+
+def test_calls_stop_once_the_token_budget_is_used_up():
+    usage = LLMUsageTracker("agent", token_budget=250)
+
+    # 101 and 202 tokens are under the budget; at 303 the next call is refused
+    assert asyncio.run(call_until_refused(usage, 10)) == 3
+    assert usage.finish()["llm_calls"] == 3
+
+
+def test_no_budget_never_refuses_calls():
+    usage = LLMUsageTracker("agent")
+
+    assert asyncio.run(call_until_refused(usage, 10)) == 10
@@ -0,0 +1,71 @@
+"""
+Tests for the queue message wire codecs.
+"""
+
+import json
+
+import pytest
+
+from infrastructure.utils import message_codecs
+from infrastructure.utils.message_codecs import (
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    JsonMessageCodec,
+    get_decoder_for_content_type,
+    get_message_codec,
+)
+
+PAYLOAD = {
+    "msgId": "abc",
+    "data": {"chatId": 1, "messageText": "coffee $5 ☕"},
+    "attempts": 0,
+    "maxRetries": 3,
+}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_json_codecs_round_trip_as_plain_json(name):
+    codec = get_message_codec(name)
+
+    body = codec.encode(PAYLOAD)
+
+    assert codec.json_compatible
+    assert codec.content_type == JSON_CONTENT_TYPE
+    # The connector decodes with JSON.parse
+    assert json.loads(body) == PAYLOAD
+    assert codec.decode(body) == PAYLOAD
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        get_message_codec("yaml")
+
+
+def test_missing_optional_codec_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(message_codecs, "msgpack", None)
+
+    codec = get_message_codec("msgpack")
+
+    assert isinstance(codec, JsonMessageCodec)
+
+
+def test_msgpack_codec_is_not_json_compatible():
+    pytest.importorskip("msgpack")
+
+    codec = get_message_codec("msgpack")
+
+    assert not codec.json_compatible
+    assert codec.content_type == MSGPACK_CONTENT_TYPE
+    assert codec.decode(codec.encode(PAYLOAD)) == PAYLOAD
+
+
+@pytest.mark.parametrize("content_type", [None, "", JSON_CONTENT_TYPE])
+def test_messages_without_content_type_decode_as_json(content_type):
+    body = json.dumps(PAYLOAD).encode()
+
+    assert get_decoder_for_content_type(content_type).decode(body) == PAYLOAD
+
+
+def test_unsupported_content_type_is_rejected():
+    with pytest.raises(ValueError):
+        get_decoder_for_content_type("text/plain")
@@ -0,0 +1,163 @@
+"""
+Tests for the OpenAI token buckets and the fair-queueing rate limiter.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+# Imported through infrastructure.tools for the current user id
+pytest.importorskip("langchain")
+pytest.importorskip("prometheus_client")
+
+from infrastructure.utils.openai_rate_limiter import (  # noqa: E402
+    DEFAULT_RETRY_AFTER_IN_SECONDS,
+    OpenAIRateLimiter,
+    TokenBucket,
+    _parse_duration,
+    _retry_after,
+    estimate_request_tokens,
+)
+
+
+def test_bucket_refills_at_capacity_per_minute():
+    bucket = TokenBucket(60)
+    bucket.take(60)
+    now = bucket._updated_at
+
+    bucket.refill(now + 10)
+
+    assert bucket.level == pytest.approx(10)
+    bucket.refill(now + 600)
+    assert bucket.level == 60
+
+
+def test_bucket_time_until_amount_is_available():
+    bucket = TokenBucket(60)
+    bucket.take(60)
+
+    assert bucket.time_until(30) == pytest.approx(30)
+    # More than the capacity only needs a full bucket, then goes into debt
+    assert bucket.time_until(600) == pytest.approx(60)
+
+
+def test_bucket_follows_server_capacity_and_remaining():
+    bucket = TokenBucket(100)
+
+    bucket.set_remaining(40)
+    assert bucket.level == 40
+    bucket.set_remaining(90)
+    assert bucket.level == 40
+
+    bucket.set_capacity(20)
+    assert bucket.capacity == 20
+    assert bucket.level == 20
+
+
+def test_limiter_takes_its_share_of_the_quota():
+    limiter = OpenAIRateLimiter(requests_per_minute=600, tokens_per_minute=90000, share=1 / 3)
+
+    assert limiter.requests.capacity == pytest.approx(200)
+    assert limiter.tokens.capacity == pytest.approx(30000)
+
+
+def test_requests_are_granted_round_robin_across_users():
+    async def scenario():
+        # 6000 RPM: one request every 10ms once the bucket is empty
+        limiter = OpenAIRateLimiter(requests_per_minute=6000, tokens_per_minute=1_000_000)
+        limiter.requests.level = 0
+        granted = []
+
+        async def request(key, name):
+            await limiter.acquire(key, 10)
+            granted.append(name)
+
+        tasks = [asyncio.create_task(request("chatty", f"chatty-{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("quiet", "quiet-0")))
+        await asyncio.gather(*tasks)
+        return granted
+
+    assert asyncio.run(scenario()) == ["chatty-0", "quiet-0", "chatty-1", "chatty-2"]
+
+
+def test_rate_limited_response_pauses_requests():
+    async def scenario():
+        limiter = OpenAIRateLimiter(requests_per_minute=6000, tokens_per_minute=1_000_000)
+        limiter.update_from_response(429, {"retry-after-ms": "100"})
+
+        started_at = time.monotonic()
+        await limiter.acquire("user", 10)
+        return time.monotonic() - started_at
+
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_response_headers_update_the_limits():
+    async def scenario():
+        limiter = OpenAIRateLimiter(requests_per_minute=100, tokens_per_minute=1000, share=0.5)
+        limiter.update_from_response(200, {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "7",
+            "x-ratelimit-limit-tokens": "20000",
+        })
+        return limiter
+
+    limiter = asyncio.run(scenario())
+
+    assert limiter.requests.capacity == pytest.approx(250)
+    assert limiter.requests.level == pytest.approx(7, abs=0.1)
+    assert limiter.tokens.capacity == pytest.approx(10000)
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = OpenAIRateLimiter(requests_per_minute=6000, tokens_per_minute=1_000_000)
+        limiter.requests.level = 0
+
+        waiting = asyncio.create_task(limiter.acquire("user", 10))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        await asyncio.wait_for(limiter.acquire("other", 10), timeout=1)
+        return limiter
+
+    limiter = asyncio.run(scenario())
+
+    assert not limiter._queues
+
+
+def test_request_tokens_count_prompt_and_max_output():
+    body = json.dumps({"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 300}).encode()
+
+    assert estimate_request_tokens(body) == len(body) // 4 + 300
+    assert estimate_request_tokens(b"") == 0
+    assert estimate_request_tokens(b"not json at all!") == 4
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m", 3720.0), ("2.5", 2.5)],
+)
+def test_reset_durations_are_parsed(value, expected):
+    assert _parse_duration(value) == pytest.approx(expected)
+
+
+def test_missing_reset_duration_is_none():
+    assert _parse_duration("") is None
+    assert _parse_duration(None) is None
+
+
+def test_retry_after_prefers_explicit_headers_then_the_sooner_reset():
+    assert _retry_after({"retry-after-ms": "250", "retry-after": "9"}) == pytest.approx(0.25)
+    assert _retry_after({"retry-after": "3"}) == 3
+    assert _retry_after({
+        "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-reset-tokens": "500ms",
+    }) == pytest.approx(0.5)
+    assert _retry_after({}) == DEFAULT_RETRY_AFTER_IN_SECONDS
@@ -0,0 +1,63 @@
+"""
+Tests for the queue retry delays, jitter and partitioning helpers.
+"""
+
+import pytest
+
+from infrastructure.utils.queue_utils import (
+    apply_full_jitter,
+    calculate_retry_delay_ms,
+    create_delayed_result,
+    select_partition,
+)
+
+
+@pytest.mark.parametrize(
+    "attempts, expected",
+    [(0, 1000), (1, 1000), (2, 2000), (3, 4000), (5, 16000), (6, 30000), (50, 30000)],
+)
+def test_retry_delay_doubles_up_to_the_cap(attempts, expected):
+    assert calculate_retry_delay_ms(attempts) == expected
+
+
+def test_retry_delay_uses_custom_base_and_cap():
+    assert calculate_retry_delay_ms(3, base_delay_ms=100, max_delay_ms=250) == 250
+    assert calculate_retry_delay_ms(2, base_delay_ms=100, max_delay_ms=250) == 200
+
+
+def test_full_jitter_stays_within_the_delay():
+    delays = [apply_full_jitter(1000) for _ in range(500)]
+
+    assert all(0 <= delay <= 1000 for delay in delays)
+    # Spread out rather than all landing on the same value
+    assert len(set(delays)) > 50
+
+
+def test_full_jitter_of_non_positive_delay_is_zero():
+    assert apply_full_jitter(0) == 0
+    assert apply_full_jitter(-5) == 0
+
+
+def test_partition_is_stable_and_in_range():
+    partitions = [select_partition(chat_id, 8) for chat_id in range(1000)]
+
+    assert all(0 <= partition < 8 for partition in partitions)
+    assert partitions == [select_partition(chat_id, 8) for chat_id in range(1000)]
+    # crc32 is fixed across processes, unlike hash() of a str
+    assert select_partition("12345", 8) == select_partition(12345, 8)
+
+
+def test_partitions_spread_keys_evenly():
+    counts = [0] * 8
+    for chat_id in range(8000):
+        counts[select_partition(chat_id, 8)] += 1
+
+    assert min(counts) > 800
+    assert max(counts) < 1200
+
+
+def test_delayed_result_carries_the_retry_delay():
+    result = create_delayed_result("rate limited", retry_after_ms=1500)
+
+    assert result.status == "delayed"
+    assert result.retry_after_ms == 1500
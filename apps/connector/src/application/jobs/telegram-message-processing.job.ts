@@ -1,5 +1,7 @@
 import { Inject, Injectable } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
 import type { Job, JobFactory } from '../../domain/interfaces/job-factory.interface.js';
+import { MAX_MESSAGE_PRIORITY, resolveMessagePriority } from '../../infrastructure/utils/message-priority.js';
 
 export interface TelegramMessageJobData {
   chatId: number;
@@ -12,20 +14,27 @@ export interface TelegramMessageJobData {
 @Injectable()
 export class TelegramMessageProcessingJob {
   public readonly job: Job;
+  private readonly registrationPassword?: string;
 
-  constructor(@Inject('JobFactory') jobFactory: JobFactory) {
+  constructor(@Inject('JobFactory') jobFactory: JobFactory, configService: ConfigService) {
+    this.registrationPassword = configService.get<string>('registration.password') || undefined;
     this.job = jobFactory.createJob({
-      name: 'telegram_received_messages'
+      name: configService.get<string>('queue.telegramMessageQueue')!,
+      maxPriority: MAX_MESSAGE_PRIORITY
     });
   }
 
   async scheduleMessageProcessing(chatId: number, messageText: string, telegramUserId: number, timestamp: string, messageId: number) {
-    await this.job.scheduleTask({
-      chatId,
-      messageText,
-      telegramUserId,
-      timestamp,
-      messageId
-    });
+    // Prioritised at publish time, so the broker itself delivers cheap messages first
+    await this.job.scheduleTask(
+      {
+        chatId,
+        messageText,
+        telegramUserId,
+        timestamp,
+        messageId
+      },
+      resolveMessagePriority(messageText, this.registrationPassword)
+    );
   }
 }
@@ -6,12 +6,31 @@ import { createSuccessResult, createErrorResult } from '../../infrastructure/uti
 export interface TelegramResponseJobData {
   chatId: number;
   text: string;
+  replyToMessageId?: number | null;
+  // Set on streamed responses: every part of one response edits the same Telegram message
+  responseId?: string;
+  sequence?: number;
+  final?: boolean;
 }
 
+interface ResponseStream {
+  messageId?: number;
+  sequence: number;
+  text: string;
+  updatedAt: number;
+  // Parts of one response are applied one at a time, in arrival order
+  pending: Promise<void>;
+}
+
+// Streams are forgotten this long after their last part (including finished ones,
+// so a late redelivered part can't open a second Telegram message)
+const RESPONSE_STREAM_TTL_MS = 10 * 60 * 1000;
+
 @Injectable()
 export class TelegramResponseSendingJob {
   public readonly job: Job;
   private readonly logger = new Logger(TelegramResponseSendingJob.name);
+  private readonly streams = new Map<string, ResponseStream>();
 
   constructor(
     @Inject('JobFactory') jobFactory: JobFactory,
@@ -25,11 +44,21 @@ export class TelegramResponseSendingJob {
         const responseData = data as TelegramResponseJobData;
         
         try {
+          if (responseData.responseId) {
+            await this.sendStreamedResponse(responseData);
+            return createSuccessResult(`Response part sent to chat ${responseData.chatId}`);
+          }
+
           this.logger.log({data}, `Sending response to chat ${responseData.chatId}: ${responseData.text}`);
           await this.telegramService.sendMessage(responseData.chatId, responseData.text);
           
           return createSuccessResult(`Response sent to chat ${responseData.chatId}`);
         } catch (error: any) {
+          if (responseData.responseId && !responseData.final) {
+            // A later part supersedes this one, so retrying it is pointless
+            this.logger.warn(`Dropped partial response for chat ${responseData.chatId}: ${error.message}`);
+            return createSuccessResult(`Partial response dropped for chat ${responseData.chatId}`);
+          }
           return createErrorResult(`Failed to send response: ${error.message}`);
         }
       },
@@ -42,4 +71,48 @@ export class TelegramResponseSendingJob {
       text
     });
   }
+
+  private async sendStreamedResponse(data: TelegramResponseJobData): Promise<void> {
+    this.pruneStreams();
+
+    const responseId = data.responseId as string;
+    let stream = this.streams.get(responseId);
+    if (!stream) {
+      stream = { sequence: 0, text: '', updatedAt: Date.now(), pending: Promise.resolve() };
+      this.streams.set(responseId, stream);
+    }
+
+    const current = stream;
+    const update = current.pending.then(() => this.applyStreamedResponse(current, data));
+    current.pending = update.catch(() => undefined);
+    await update;
+  }
+
+  private async applyStreamedResponse(stream: ResponseStream, data: TelegramResponseJobData): Promise<void> {
+    const sequence = data.sequence ?? 0;
+    if (sequence <= stream.sequence) {
+      // Overtaken by a later part of the same response
+      return;
+    }
+
+    if (stream.messageId === undefined) {
+      stream.messageId = await this.telegramService.sendMessage(data.chatId, data.text);
+    } else if (data.text !== stream.text) {
+      // Telegram rejects edits that don't change the text
+      await this.telegramService.editMessageText(data.chatId, stream.messageId, data.text);
+    }
+
+    stream.sequence = sequence;
+    stream.text = data.text;
+    stream.updatedAt = Date.now();
+  }
+
+  private pruneStreams(): void {
+    const expiredBefore = Date.now() - RESPONSE_STREAM_TTL_MS;
+    for (const [responseId, stream] of this.streams) {
+      if (stream.updatedAt < expiredBefore) {
+        this.streams.delete(responseId);
+      }
+    }
+  }
 }
@@ -12,6 +12,10 @@ export interface AppConfig {
     connectionRetries: number;
     connectionRetryDelay: number;
   };
+  registration: {
+    // The bot's registration password; lets registration attempts skip the agent backlog
+    password: string;
+  };
   queue: {
     telegramMessageQueue: string;
     botResponseQueue: string;
@@ -34,8 +38,12 @@ export default (): AppConfig => ({
     connectionRetries: parseInt(process.env.RABBITMQ_CONNECTION_RETRIES || '5', 10),
     connectionRetryDelay: parseInt(process.env.RABBITMQ_CONNECTION_RETRY_DELAY || '5000', 10),
   },
+  registration: {
+    password: process.env.REGISTRATION_PASSWORD || '',
+  },
   queue: {
-    telegramMessageQueue: process.env.TELEGRAM_MESSAGE_QUEUE || 'telegram_received_messages',
+    // Declared with x-max-priority; see "Message priorities" in the README before renaming
+    telegramMessageQueue: process.env.TELEGRAM_MESSAGE_QUEUE || 'telegram_received_messages_prioritized',
     botResponseQueue: process.env.BOT_RESPONSE_QUEUE || 'telegram_bot_responses',
     maxRetries: parseInt(process.env.QUEUE_MAX_RETRIES || '3', 10),
     prefetchCount: parseInt(process.env.QUEUE_PREFETCH_COUNT || '10', 10),
@@ -12,10 +12,12 @@ export interface JobOptions {
   handler?: (args: TaskHandlerArgs) => Promise<TaskHandlerResult>;
   pollIntervalInMillis?: number;
   visibilityTimeoutInSeconds?: number;
+  // Highest priority the queue honours (x-max-priority); must match the bot's declaration
+  maxPriority?: number;
 }
 
 export interface Job {
-  scheduleTask(data: any): Promise<void>;
+  scheduleTask(data: any, priority?: number): Promise<void>;
   turnOn(): Promise<void>;
   turnOff(): Promise<void>;
 }
@@ -1,5 +1,7 @@
 export interface ITelegramService {
-  sendMessage(chatId: number, text: string): Promise<void>;
+  /** Sends a message and returns its Telegram message id. */
+  sendMessage(chatId: number, text: string): Promise<number>;
+  editMessageText(chatId: number, messageId: number, text: string): Promise<void>;
   setWebhook(url: string): Promise<void>;
   deleteWebhook(): Promise<void>;
 }
@@ -49,9 +49,9 @@ export class RabbitMQJobFactory implements JobFactory, OnModuleDestroy {
   createJob(options: JobOptions): Job {
     this.logger.log(`RabbitMQJobFactory - Creating job '${options.name}'`);
 
-    const scheduleTask = async (data: any) => {
+    const scheduleTask = async (data: any, priority?: number) => {
       try {
-        const channel = await this.getChannel(options.name);
+        const channel = await this.getChannel(options.name, options.maxPriority);
         const exchange = this.configService.get<string>('rabbitmq.exchange')!;
         const maxRetries = this.configService.get<number>('queue.maxRetries', 3);
         
@@ -66,7 +66,7 @@ export class RabbitMQJobFactory implements JobFactory, OnModuleDestroy {
           exchange,
           options.name,
           Buffer.from(JSON.stringify(message)),
-          { persistent: true }
+          { persistent: true, priority }
         );
 
         if (!published) {
@@ -101,7 +101,7 @@ export class RabbitMQJobFactory implements JobFactory, OnModuleDestroy {
 
     this.logger.log(`RabbitMQJobFactory - Starting worker for job '${options.name}'. QueueName: ${options.name}`);
     
-    const channel = await this.getChannel(options.name);
+    const channel = await this.getChannel(options.name, options.maxPriority);
     const prefetchCount = this.configService.get<number>('queue.prefetchCount', 10);
     
     // Set QoS to control how many messages are delivered to this consumer
@@ -198,7 +198,7 @@ export class RabbitMQJobFactory implements JobFactory, OnModuleDestroy {
     }
   }
 
-  private async getChannel(queueName: string): Promise<amqp.Channel> {
+  private async getChannel(queueName: string, maxPriority?: number): Promise<amqp.Channel> {
     if (this.channels.has(queueName)) {
       return this.channels.get(queueName)!;
     }
@@ -215,7 +215,8 @@ export class RabbitMQJobFactory implements JobFactory, OnModuleDestroy {
     await channel.assertQueue(queueName, { 
       durable: true,
       deadLetterExchange: dlxExchange,
-      deadLetterRoutingKey: `${queueName}.dlq`
+      deadLetterRoutingKey: `${queueName}.dlq`,
+      ...(maxPriority ? { maxPriority } : {})
     });
 
     // Declare dead letter queue
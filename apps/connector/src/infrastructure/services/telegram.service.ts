@@ -11,20 +11,36 @@ export class TelegramService implements ITelegramService {
     @Inject(TELEGRAM_HTTP_CLIENT) private httpClient: HttpClient,
   ) {}
 
-  async sendMessage(chatId: number, text: string): Promise<void> {
+  async sendMessage(chatId: number, text: string): Promise<number> {
     try {
-      await this.httpClient.post('/sendMessage', {
+      const response = await this.httpClient.post('/sendMessage', {
         chat_id: chatId,
         text: text,
       });
 
       this.logger.log(`Message sent to chat ${chatId}`);
+      return response.data.result.message_id;
     } catch (error) {
       this.logger.error('Error sending Telegram message', error);
       throw error;
     }
   }
 
+  async editMessageText(chatId: number, messageId: number, text: string): Promise<void> {
+    try {
+      await this.httpClient.post('/editMessageText', {
+        chat_id: chatId,
+        message_id: messageId,
+        text: text,
+      });
+
+      this.logger.log(`Message ${messageId} edited in chat ${chatId}`);
+    } catch (error) {
+      this.logger.error('Error editing Telegram message', error);
+      throw error;
+    }
+  }
+
   async setWebhook(url: string): Promise<void> {
     try {
       await this.httpClient.post('/setWebhook', {
@@ -0,0 +1,34 @@
+// Priorities of incoming Telegram messages; mirror the bot's PRIORITY_* constants.
+// Messages at PRIORITY_HIGH or above take the bot's consumer fast lane
+export const PRIORITY_NORMAL = 0;
+export const PRIORITY_HIGH = 5;
+
+// Highest priority the message queue honours (x-max-priority); must match the bot
+export const MAX_MESSAGE_PRIORITY = 10;
+
+// Messages the bot answers or drops without the LLM agent; keep in sync with
+// the non-expense rules of the bot's HybridMessageClassifier
+const NON_EXPENSE_PATTERNS = [
+  // Greetings, thanks and acknowledgements
+  /^(hi|hello|hey|hola|yo|good (morning|afternoon|evening|night)|bye|goodbye|thanks?( you)?|thx|ty|ok(ay)?|cool|nice|great|lol)[\s!.?]*$/i,
+  // No letters or digits at all (emoji, stickers, punctuation)
+  /^[^\p{L}\p{N}_]+$/u,
+];
+
+/**
+ * Priority to publish an incoming message with, so the broker delivers cheap
+ * messages (registration attempts, greetings) ahead of the agent backlog.
+ */
+export function resolveMessagePriority(messageText: string, registrationPassword?: string): number {
+  const text = messageText.trim();
+
+  if (registrationPassword && text === registrationPassword) {
+    return PRIORITY_HIGH;
+  }
+
+  if (NON_EXPENSE_PATTERNS.some((pattern) => pattern.test(text))) {
+    return PRIORITY_HIGH;
+  }
+
+  return PRIORITY_NORMAL;
+}
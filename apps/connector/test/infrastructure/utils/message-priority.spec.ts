@@ -0,0 +1,26 @@
+import {
+  PRIORITY_HIGH,
+  PRIORITY_NORMAL,
+  resolveMessagePriority,
+} from '../../../src/infrastructure/utils/message-priority.js';
+
+describe('resolveMessagePriority', () => {
+  it.each(['hi', 'Hello!', 'good morning', 'thanks', 'thank you', 'ok', '👍', '...'])(
+    'should prioritise the cheap message %p',
+    (messageText) => {
+      expect(resolveMessagePriority(messageText)).toBe(PRIORITY_HIGH);
+    }
+  );
+
+  it.each(['coffee $5', 'thanks, lunch was 12', 'how much did I spend this week?', 'hi 5'])(
+    'should keep %p at normal priority',
+    (messageText) => {
+      expect(resolveMessagePriority(messageText)).toBe(PRIORITY_NORMAL);
+    }
+  );
+
+  it('should prioritise the registration password', () => {
+    expect(resolveMessagePriority(' s3cret ', 's3cret')).toBe(PRIORITY_HIGH);
+    expect(resolveMessagePriority('s3cret')).toBe(PRIORITY_NORMAL);
+  });
+});